@@ -88,6 +88,58 @@ REST_FRAMEWORK = {
     "DATETIME_FORMAT": "%Y-%m-%dT%H:%M:%S.%fZ",
 }
 
+# Keyset pagination, used when a list request sends cursor or pageSize
+PAGINATION_PAGE_SIZE = int(os.environ.get("PAGINATION_PAGE_SIZE", 50))
+
+# Maximum number of orders accepted by POST /api/orders/batch
+ORDER_BATCH_MAX_SIZE = int(os.environ.get("ORDER_BATCH_MAX_SIZE", 500))
+
+# Orders held in memory at a time by the streaming order export
+ORDER_EXPORT_CHUNK_SIZE = int(os.environ.get("ORDER_EXPORT_CHUNK_SIZE", 500))
+
+# Paid and cancelled orders older than this are moved by archiveOrders
+ORDER_ARCHIVE_AFTER_DAYS = int(os.environ.get("ORDER_ARCHIVE_AFTER_DAYS", 90))
+
+# Rows validated and written together by the bulk product import
+PRODUCT_IMPORT_BATCH_SIZE = int(
+    os.environ.get("PRODUCT_IMPORT_BATCH_SIZE", 500)
+)
+
+# Maximum number of ids accepted by the bulk retire endpoints
+BULK_RETIRE_MAX_SIZE = int(os.environ.get("BULK_RETIRE_MAX_SIZE", 500))
+
+# Idempotency-Key support for the create endpoints
+IDEMPOTENCY_STORE = os.environ.get(
+    "IDEMPOTENCY_STORE",
+    "answerking_app.utils.idempotency.DatabaseIdempotencyStore",
+)
+# The cache store needs an alias shared by every worker, not LocMemCache
+IDEMPOTENCY_CACHE_ALIAS = os.environ.get("IDEMPOTENCY_CACHE_ALIAS", "default")
+IDEMPOTENCY_KEY_TTL = int(os.environ.get("IDEMPOTENCY_KEY_TTL", 24 * 60 * 60))
+IDEMPOTENCY_LOCK_TIMEOUT = 10
+# Seconds a key stays locked by a request that has not finished. A retry
+# takes over after this, so it must be longer than the slowest create.
+IDEMPOTENCY_LOCK_LEASE = int(
+    os.environ.get("IDEMPOTENCY_LOCK_LEASE", 3 * IDEMPOTENCY_LOCK_TIMEOUT)
+)
+
+# Product search, blank picks MySQL FULLTEXT on MySQL and an in-process
+# inverted index elsewhere. The inverted index is rebuilt after the TTL.
+PRODUCT_SEARCH_BACKEND = os.environ.get("PRODUCT_SEARCH_BACKEND", "")
+PRODUCT_SEARCH_INDEX_TTL = int(os.environ.get("PRODUCT_SEARCH_INDEX_TTL", 300))
+
+# Cache for the product, category and tag GET endpoints. Entries are keyed
+# on a version kept in the database, so every worker sees each bump.
+CATALOGUE_CACHE = os.environ.get(
+    "CATALOGUE_CACHE",
+    "answerking_app.utils.catalogue_cache.LocalCatalogueCache",
+)
+CATALOGUE_CACHE_ALIAS = os.environ.get("CATALOGUE_CACHE_ALIAS", "default")
+CATALOGUE_CACHE_MAX_ENTRIES = int(
+    os.environ.get("CATALOGUE_CACHE_MAX_ENTRIES", 1000)
+)
+CATALOGUE_CACHE_TTL = int(os.environ.get("CATALOGUE_CACHE_TTL", 60 * 60))
+
 # Database
 # https://docs.djangoproject.com/en/4.0/ref/settings/#databases
 
@@ -0,0 +1,101 @@
+import time
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from answerking_app.models.models import (
+    ArchivedLineItem,
+    ArchivedOrder,
+    LineItem,
+    Order,
+)
+
+
+class Command(BaseCommand):
+    """Move old paid and cancelled orders into the archive tables"""
+
+    help = (
+        "Archive paid and cancelled orders not updated for --days days, "
+        "one chunk per transaction with a pause between chunks."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days", type=int, default=settings.ORDER_ARCHIVE_AFTER_DAYS
+        )
+        parser.add_argument("--chunk-size", type=int, default=500)
+        parser.add_argument(
+            "--pause",
+            type=float,
+            default=0.5,
+            help="Seconds to sleep between chunks.",
+        )
+        parser.add_argument("--dry-run", action="store_true")
+
+    def handle(self, *args, **options):
+        chunk_size: int = options["chunk_size"]
+        pause: float = options["pause"]
+        dry_run: bool = options["dry_run"]
+        cutoff: datetime = timezone.now() - timedelta(days=options["days"])
+
+        last_id = 0
+        num_archived = 0
+        while True:
+            order_ids: list[int] = list(
+                self.archivable_orders(cutoff)
+                .filter(id__gt=last_id)
+                .order_by("id")
+                .values_list("id", flat=True)[:chunk_size]
+            )
+            if not order_ids:
+                break
+            last_id = order_ids[-1]
+            num_archived += (
+                len(order_ids)
+                if dry_run
+                else self.archive_chunk(order_ids, cutoff)
+            )
+            if pause:
+                time.sleep(pause)
+
+        action = "Found" if dry_run else "Archived"
+        self.stdout.write(
+            self.style.SUCCESS(f"{action} {num_archived} archivable order(s)")
+        )
+
+    @staticmethod
+    def archivable_orders(cutoff: datetime):
+        return Order.objects.filter(
+            order_status__in=ArchivedOrder.ARCHIVABLE_STATUSES,
+            last_updated__lt=cutoff,
+        )
+
+    @classmethod
+    @transaction.atomic
+    def archive_chunk(cls, order_ids: list[int], cutoff: datetime) -> int:
+        # Orders locked by a request are skipped and picked up next run
+        orders: list[Order] = list(
+            cls.archivable_orders(cutoff)
+            .select_for_update(skip_locked=True)
+            .filter(id__in=order_ids)
+        )
+        if not orders:
+            return 0
+        locked_ids: list[int] = [order.id for order in orders]
+        line_items: list[LineItem] = list(
+            LineItem.objects.filter(order_id__in=locked_ids)
+        )
+        ArchivedOrder.objects.bulk_create(
+            [ArchivedOrder.from_order(order) for order in orders]
+        )
+        ArchivedLineItem.objects.bulk_create(
+            [
+                ArchivedLineItem.from_line_item(line_item)
+                for line_item in line_items
+            ]
+        )
+        Order.objects.filter(id__in=locked_ids).delete()
+        return len(orders)
@@ -0,0 +1,42 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from answerking_app.models.models import Order
+from answerking_app.utils.exports import stream_orders
+from answerking_app.utils.renderers import CSVRenderer, NDJSONRenderer
+
+
+class Command(BaseCommand):
+    """Stream every order with its line items as NDJSON or CSV"""
+
+    help = "Export orders without loading them all into memory."
+
+    renderers = {"ndjson": NDJSONRenderer, "csv": CSVRenderer}
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--format", choices=list(self.renderers), default="ndjson"
+        )
+        parser.add_argument(
+            "--chunk-size", type=int, default=settings.ORDER_EXPORT_CHUNK_SIZE
+        )
+        parser.add_argument(
+            "--output", help="File to write to, defaults to stdout."
+        )
+        parser.add_argument("--status", choices=Order.Status.values)
+
+    def handle(self, *args, **options):
+        queryset = Order.objects.all()
+        if options["status"]:
+            queryset = queryset.filter(order_status=options["status"])
+        chunks = stream_orders(
+            queryset,
+            self.renderers[options["format"]](),
+            options["chunk_size"],
+        )
+        if options["output"]:
+            with open(options["output"], "wb") as output:
+                output.writelines(chunks)
+        else:
+            for chunk in chunks:
+                self.stdout.write(chunk.decode(), ending="")
@@ -0,0 +1,71 @@
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from answerking_app.utils.imports import (
+    ImportResult,
+    import_products,
+    iter_csv_records,
+    iter_json_records,
+    iter_text,
+)
+
+
+class Command(BaseCommand):
+    """Create or update products from a CSV or JSON file"""
+
+    help = (
+        "Import products in batches, matching existing products by name. "
+        "JSON files hold an array or one object per line, CSV files list "
+        "tag ids separated by ;."
+    )
+
+    parsers = {"csv": iter_csv_records, "json": iter_json_records}
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="File to read, - for stdin.")
+        parser.add_argument(
+            "--format",
+            choices=list(self.parsers),
+            help="Defaults to csv for .csv files, otherwise json.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.PRODUCT_IMPORT_BATCH_SIZE,
+        )
+
+    def handle(self, *args, **options):
+        path: str = options["path"]
+        file_format: str = options["format"] or (
+            "csv" if path.lower().endswith(".csv") else "json"
+        )
+        try:
+            if path == "-":
+                result = self.import_file(
+                    sys.stdin.buffer, file_format, options["batch_size"]
+                )
+            else:
+                with open(path, "rb") as stream:
+                    result = self.import_file(
+                        stream, file_format, options["batch_size"]
+                    )
+        except (OSError, UnicodeDecodeError) as exc:
+            raise CommandError(str(exc)) from exc
+
+        for error in result.errors:
+            self.stderr.write(f"Row {error['row']}: {dict(error['errors'])}")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Created {result.created} and updated {result.updated} "
+                f"product(s), {len(result.errors)} row(s) rejected"
+            )
+        )
+
+    def import_file(
+        self, stream, file_format: str, batch_size: int
+    ) -> ImportResult:
+        return import_products(
+            self.parsers[file_format](iter_text(stream)), batch_size
+        )
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from answerking_app.utils.idempotency import DatabaseIdempotencyStore
+
+
+class Command(BaseCommand):
+    """Delete stored Idempotency-Key responses that have expired"""
+
+    def handle(self, *args, **options):
+        deleted = DatabaseIdempotencyStore.purge_expired()
+        self.stdout.write(
+            self.style.SUCCESS(f"Deleted {deleted} expired idempotency key(s)")
+        )
@@ -0,0 +1,72 @@
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDay, TruncHour
+
+from answerking_app.models.models import (
+    ArchivedLineItem,
+    LineItem,
+    SalesRollup,
+)
+
+
+class Command(BaseCommand):
+    """Recompute the sales rollups from live and archived line items"""
+
+    help = (
+        "Rebuild the sales rollup tables. Orders written while this runs "
+        "are not counted, so run it when no orders are being taken."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    @transaction.atomic
+    def handle(self, *args, **options):
+        rollups: dict[tuple, SalesRollup] = {}
+        for granularity, trunc in [
+            (SalesRollup.Granularity.HOUR, TruncHour),
+            (SalesRollup.Granularity.DAY, TruncDay),
+        ]:
+            for model in [LineItem, ArchivedLineItem]:
+                rows = model.objects.values(
+                    "product_id",
+                    "order__order_status",
+                    period_start=trunc("order__created_on"),
+                ).annotate(
+                    quantity=Sum("quantity"),
+                    revenue=Sum("sub_total"),
+                    line_count=Count("id"),
+                )
+                for row in rows:
+                    key = (
+                        granularity,
+                        row["period_start"],
+                        row["product_id"],
+                        row["order__order_status"],
+                    )
+                    rollup: SalesRollup = rollups.setdefault(
+                        key,
+                        SalesRollup(
+                            granularity=granularity,
+                            period_start=row["period_start"],
+                            product_id=row["product_id"],
+                            order_status=row["order__order_status"],
+                            quantity=0,
+                            revenue=Decimal(0.00),
+                            line_count=0,
+                        ),
+                    )
+                    rollup.quantity += row["quantity"]
+                    rollup.revenue += row["revenue"]
+                    rollup.line_count += row["line_count"]
+
+        SalesRollup.objects.all().delete()
+        SalesRollup.objects.bulk_create(
+            rollups.values(), batch_size=options["batch_size"]
+        )
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt {len(rollups)} sales rollup(s)")
+        )
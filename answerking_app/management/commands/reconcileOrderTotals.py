@@ -0,0 +1,78 @@
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import DecimalField, F, Sum, Value
+from django.db.models.functions import Coalesce
+
+from answerking_app.models.models import LineItem, Order
+
+
+class Command(BaseCommand):
+    """Find orders whose stored total has drifted from their line items"""
+
+    help = "Recalculate drifted order totals in chunks of orders."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=1000)
+        parser.add_argument("--dry-run", action="store_true")
+
+    def handle(self, *args, **options):
+        chunk_size: int = options["chunk_size"]
+        dry_run: bool = options["dry_run"]
+
+        last_id = 0
+        num_checked = 0
+        num_drifted = 0
+        while True:
+            orders: list[Order] = list(
+                Order.objects.filter(id__gt=last_id)
+                .order_by("id")
+                .annotate(
+                    line_items_total=Coalesce(
+                        Sum("lineitem__sub_total"),
+                        Value(Decimal(0.00)),
+                        output_field=DecimalField(
+                            max_digits=18, decimal_places=2
+                        ),
+                    )
+                )[:chunk_size]
+            )
+            if not orders:
+                break
+            last_id = orders[-1].id
+            num_checked += len(orders)
+
+            drifted_ids: list[int] = [
+                order.id
+                for order in orders
+                if order.order_total != order.line_items_total
+            ]
+            if drifted_ids and not dry_run:
+                self.fix_totals(drifted_ids)
+            num_drifted += len(drifted_ids)
+
+        action = "Found" if dry_run else "Fixed"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{action} {num_drifted} drifted order total(s). "
+                f"Orders checked: {num_checked}"
+            )
+        )
+
+    @staticmethod
+    @transaction.atomic
+    def fix_totals(order_ids: list[int]):
+        orders: list[Order] = list(
+            Order.objects.select_for_update().filter(id__in=order_ids)
+        )
+        totals: dict[int, Decimal] = dict(
+            LineItem.objects.filter(order_id__in=order_ids)
+            .values("order_id")
+            .annotate(total=Sum("sub_total"))
+            .values_list("order_id", "total")
+        )
+        for order in orders:
+            order.order_total = totals.get(order.id, Decimal(0.00))
+            order.version = F("version") + 1  # type: ignore[reportGeneralTypeIssues]
+        Order.objects.bulk_update(orders, ["order_total", "version"])
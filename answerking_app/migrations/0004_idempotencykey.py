@@ -0,0 +1,29 @@
+# Generated by Django 4.2.30 on 2026-10-18 08:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('answerking_app', '0003_order_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IdempotencyKey',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=255)),
+                ('scope', models.CharField(max_length=255)),
+                ('request_hash', models.CharField(max_length=64)),
+                ('status_code', models.PositiveSmallIntegerField(blank=True, null=True)),
+                ('response_body', models.TextField(blank=True, null=True)),
+                ('created_on', models.DateTimeField(auto_now_add=True)),
+                ('expires_on', models.DateTimeField(db_index=True)),
+            ],
+            options={
+                'unique_together': {('key', 'scope')},
+            },
+        ),
+    ]
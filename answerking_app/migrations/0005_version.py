@@ -0,0 +1,33 @@
+# Generated by Django 4.2.30 on 2026-10-18 09:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('answerking_app', '0004_idempotencykey'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='version',
+            field=models.PositiveIntegerField(default=1),
+        ),
+        migrations.AddField(
+            model_name='order',
+            name='version',
+            field=models.PositiveIntegerField(default=1),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='version',
+            field=models.PositiveIntegerField(default=1),
+        ),
+        migrations.AddField(
+            model_name='tag',
+            name='version',
+            field=models.PositiveIntegerField(default=1),
+        ),
+    ]
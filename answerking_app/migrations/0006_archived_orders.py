@@ -0,0 +1,43 @@
+# Generated by Django 4.2.30 on 2026-10-18 09:04
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('answerking_app', '0005_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedOrder',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('order_status', models.CharField(choices=[('Created', 'Created'), ('Paid', 'Paid'), ('Cancelled', 'Cancelled')], max_length=10)),
+                ('order_total', models.DecimalField(decimal_places=2, default=0.0, max_digits=18)),
+                ('created_on', models.DateTimeField()),
+                ('last_updated', models.DateTimeField()),
+                ('version', models.PositiveIntegerField(default=1)),
+                ('archived_on', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['created_on'], name='archivedorder_created_on_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='ArchivedLineItem',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('quantity', models.IntegerField()),
+                ('sub_total', models.DecimalField(decimal_places=2, default=0.0, max_digits=18)),
+                ('order', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='lineitem_set', to='answerking_app.archivedorder')),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='answerking_app.product')),
+            ],
+            options={
+                'unique_together': {('order', 'product')},
+            },
+        ),
+    ]
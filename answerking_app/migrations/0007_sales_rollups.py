@@ -0,0 +1,30 @@
+# Generated by Django 4.2.30 on 2026-10-18 09:07
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('answerking_app', '0006_archived_orders'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SalesRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('granularity', models.CharField(choices=[('hour', 'Hour'), ('day', 'Day')], max_length=4)),
+                ('period_start', models.DateTimeField()),
+                ('order_status', models.CharField(choices=[('Created', 'Created'), ('Paid', 'Paid'), ('Cancelled', 'Cancelled')], max_length=10)),
+                ('quantity', models.BigIntegerField(default=0)),
+                ('revenue', models.DecimalField(decimal_places=2, default=0.0, max_digits=18)),
+                ('line_count', models.IntegerField(default=0)),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='answerking_app.product')),
+            ],
+            options={
+                'unique_together': {('granularity', 'period_start', 'product', 'order_status')},
+            },
+        ),
+    ]
@@ -0,0 +1,63 @@
+# Generated by Django 4.2.30 on 2026-10-18 09:10
+
+from django.db import migrations, models
+from django.db.models import Case, F, OuterRef, Subquery, When
+
+
+def snapshot_products(apps, schema_editor):
+    Product = apps.get_model("answerking_app", "Product")
+    for model_name in ["LineItem", "ArchivedLineItem"]:
+        products = Product.objects.filter(pk=OuterRef("product_id"))
+        apps.get_model("answerking_app", model_name).objects.update(
+            product_name=Subquery(products.values("name")[:1]),
+            product_description=Subquery(products.values("description")[:1]),
+            # What was charged, falling back to today's price
+            unit_price=Case(
+                When(quantity__gt=0, then=F("sub_total") / F("quantity")),
+                default=Subquery(products.values("price")[:1]),
+                output_field=models.DecimalField(
+                    max_digits=18, decimal_places=2
+                ),
+            ),
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('answerking_app', '0007_sales_rollups'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='archivedlineitem',
+            name='product_description',
+            field=models.CharField(blank=True, max_length=200, null=True),
+        ),
+        migrations.AddField(
+            model_name='archivedlineitem',
+            name='product_name',
+            field=models.CharField(default='', max_length=50),
+        ),
+        migrations.AddField(
+            model_name='archivedlineitem',
+            name='unit_price',
+            field=models.DecimalField(decimal_places=2, default=0.0, max_digits=18),
+        ),
+        migrations.AddField(
+            model_name='lineitem',
+            name='product_description',
+            field=models.CharField(blank=True, max_length=200, null=True),
+        ),
+        migrations.AddField(
+            model_name='lineitem',
+            name='product_name',
+            field=models.CharField(default='', max_length=50),
+        ),
+        migrations.AddField(
+            model_name='lineitem',
+            name='unit_price',
+            field=models.DecimalField(decimal_places=2, default=0.0, max_digits=18),
+        ),
+        migrations.RunPython(snapshot_products, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,27 @@
+from django.db import migrations
+
+
+def create_fulltext_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "mysql":
+        schema_editor.execute(
+            "CREATE FULLTEXT INDEX product_search_idx "
+            "ON answerking_app_product (name, description)"
+        )
+
+
+def drop_fulltext_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "mysql":
+        schema_editor.execute(
+            "DROP INDEX product_search_idx ON answerking_app_product"
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('answerking_app', '0009_product_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_fulltext_index, drop_fulltext_index),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-18 09:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('answerking_app', '0011_product_tag_last_updated'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='lineitem',
+            index=models.Index(fields=['product', 'order'], name='lineitem_product_order_idx'),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 4.2.30 on 2026-10-18 09:35
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def record_current_prices(apps, schema_editor):
+    # Earlier prices are unknown, the current one has held at least since
+    # the product was last updated
+    ProductPrice = apps.get_model("answerking_app", "ProductPrice")
+    ProductPrice.objects.bulk_create(
+        ProductPrice(
+            product_id=product_id, price=price, valid_from=last_updated
+        )
+        for product_id, price, last_updated in apps.get_model(
+            "answerking_app", "Product"
+        ).objects.values_list("id", "price", "last_updated")
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('answerking_app', '0012_lineitem_product_order_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProductPrice',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('price', models.DecimalField(decimal_places=2, max_digits=18)),
+                ('valid_from', models.DateTimeField()),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='answerking_app.product')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['product', 'valid_from'], name='productprice_product_from_idx')],
+            },
+        ),
+        migrations.RunPython(
+            record_current_prices, migrations.RunPython.noop
+        ),
+    ]
@@ -1,12 +1,73 @@
+import time
+from datetime import datetime
 from decimal import Decimal
+from functools import reduce
+from operator import or_
+from typing import Iterable, NamedTuple
 
-from django.db import models
+from django.db import models, transaction
+from django.db.models import (
+    Case,
+    Expression,
+    F,
+    OuterRef,
+    Q,
+    QuerySet,
+    Subquery,
+    Sum,
+    Value,
+    When,
+)
+from django.utils import timezone
 
 
-class Product(models.Model):
+class VersionConflict(Exception):
+    pass
+
+
+class VersionedModel(models.Model):
+    version = models.PositiveIntegerField(default=1)
+
+    class Meta:
+        abstract = True
+
+    def _do_update(
+        self, base_qs, using, pk_val, values, update_fields, forced_update
+    ):
+        # Optimistic concurrency: UPDATE ... WHERE id=? AND version=?
+        version_field = self._meta.get_field("version")
+        values = [value for value in values if value[0] != version_field]
+        values.append((version_field, None, F("version") + 1))
+        updated: bool = super()._do_update(
+            base_qs.filter(version=self.version),
+            using,
+            pk_val,
+            values,
+            update_fields,
+            forced_update,
+        )
+        if updated:
+            self.version += 1
+        elif base_qs.filter(pk=pk_val).exists():
+            raise VersionConflict(
+                f"{self._meta.object_name} {pk_val} has been modified"
+            )
+        return updated
+
+    @classmethod
+    def touch(cls, pks: Iterable[int]) -> int:
+        # For rows whose representation changed through a related row, so
+        # their ETag and Last-Modified move on as well
+        return cls.objects.filter(pk__in=pks).update(
+            version=F("version") + 1, last_updated=timezone.now()
+        )
+
+
+class Product(VersionedModel):
     name = models.CharField(max_length=50, unique=True)
     description = models.CharField(max_length=200, blank=True, null=True)
     price = models.DecimalField(max_digits=18, decimal_places=2, default=0.00)
+    last_updated = models.DateTimeField(auto_now=True)
     retired = models.BooleanField(default=False, null=False)
     category = models.ForeignKey(
         "Category",
@@ -15,15 +76,35 @@ class Product(models.Model):
         null=True,
     )
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["retired"], name="product_retired_idx"),
+            models.Index(
+                fields=["category", "retired"],
+                name="product_category_retired_idx",
+            ),
+            models.Index(fields=["price"], name="product_price_idx"),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values) -> "Product":
+        product = super().from_db(db, field_names, values)
+        # Lets a save tell which category the product was moved out of
+        # and whether its price changed
+        product.loaded_category_id = product.__dict__.get("category_id")
+        product.loaded_price = product.__dict__.get("price")
+        return product
+
 
-class Tag(models.Model):
+class Tag(VersionedModel):
     name = models.CharField(max_length=50, unique=True)
     description = models.CharField(max_length=200, blank=True, null=True)
     products = models.ManyToManyField(Product)
+    last_updated = models.DateTimeField(auto_now=True)
     retired = models.BooleanField(default=False, null=False)
 
 
-class Category(models.Model):
+class Category(VersionedModel):
     name = models.CharField(max_length=50, unique=True)
     description = models.CharField(max_length=200, blank=True, null=True)
     created_on = models.DateTimeField(auto_now_add=True)
@@ -31,7 +112,57 @@ class Category(models.Model):
     retired = models.BooleanField(default=False, null=False)
 
 
-class Order(models.Model):
+class ProductPrice(models.Model):
+    # Append-only, a row is written whenever a product gets a new price
+    product = models.ForeignKey(Product, on_delete=models.CASCADE)
+    price = models.DecimalField(max_digits=18, decimal_places=2)
+    valid_from = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["product", "valid_from"],
+                name="productprice_product_from_idx",
+            ),
+        ]
+
+    @classmethod
+    def as_of(cls, product_id: int, moment: datetime) -> "ProductPrice | None":
+        return (
+            cls.objects.filter(product_id=product_id, valid_from__lte=moment)
+            .order_by("-valid_from", "-id")
+            .first()
+        )
+
+    @classmethod
+    def as_of_many(
+        cls, product_ids: Iterable[int], moment: datetime
+    ) -> QuerySet["ProductPrice"]:
+        # One index seek per product in a single query
+        latest = (
+            cls.objects.filter(product=OuterRef("pk"), valid_from__lte=moment)
+            .order_by("-valid_from", "-id")
+            .values("pk")[:1]
+        )
+        return cls.objects.filter(
+            pk__in=Product.objects.filter(id__in=product_ids).values(
+                price_id=Subquery(latest)
+            )
+        ).order_by("product_id")
+
+    @classmethod
+    def record(
+        cls, prices: Iterable[tuple[int, Decimal]], valid_from: datetime
+    ):
+        cls.objects.bulk_create(
+            [
+                cls(product_id=product_id, price=price, valid_from=valid_from)
+                for product_id, price in prices
+            ]
+        )
+
+
+class Order(VersionedModel):
     class Status(models.TextChoices):
         CREATED = "Created", "Created"
         PAID = "Paid", "Paid"
@@ -46,16 +177,65 @@ class Order(models.Model):
     created_on = models.DateTimeField(auto_now_add=True)
     last_updated = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["order_status", "created_on"],
+                name="order_status_created_idx",
+            ),
+            models.Index(fields=["created_on"], name="order_created_on_idx"),
+            models.Index(
+                fields=["last_updated"], name="order_last_updated_idx"
+            ),
+            models.Index(fields=["order_total"], name="order_total_idx"),
+        ]
+
     def calculate_total(self):
-        total = Decimal(0.00)
-        line_items = LineItem.objects.filter(order=self.pk).values()
+        total: Decimal | None = LineItem.objects.filter(
+            order=self.pk
+        ).aggregate(total=Sum("sub_total"))["total"]
+        self.order_total = total or Decimal(0.00)
+        self.save(update_fields=["order_total", "last_updated"])
 
-        if line_items:
-            for ol in line_items:
-                total += ol["sub_total"]
+    def apply_total_delta(
+        self, delta: Decimal, expected_version: int | None = None
+    ):
+        orders = Order.objects.filter(pk=self.pk)
+        if expected_version is not None:
+            orders = orders.filter(version=expected_version)
+        updated: int = orders.update(
+            order_total=F("order_total") + delta,
+            last_updated=timezone.now(),
+            version=F("version") + 1,
+        )
+        if not updated:
+            raise VersionConflict(f"Order {self.pk} has been modified")
+        self.refresh_from_db(fields=["order_total", "last_updated", "version"])
 
-        self.order_total = total
-        self.save()
+
+class LineItemChange(NamedTuple):
+    product_id: int
+    quantity: int
+    sub_total: Decimal
+    line_count: int
+
+    @classmethod
+    def added(cls, line_item: "LineItem") -> "LineItemChange":
+        return cls(
+            line_item.product_id,  # type: ignore[reportGeneralTypeIssues]
+            line_item.quantity,
+            line_item.sub_total,
+            1,
+        )
+
+    @classmethod
+    def removed(cls, line_item: "LineItem") -> "LineItemChange":
+        return cls(
+            line_item.product_id,  # type: ignore[reportGeneralTypeIssues]
+            -line_item.quantity,
+            -line_item.sub_total,
+            -1,
+        )
 
 
 class LineItem(models.Model):
@@ -65,10 +245,338 @@ class LineItem(models.Model):
     sub_total = models.DecimalField(
         max_digits=18, decimal_places=2, default=0.00
     )
+    # The product as sold, so order reads never need the product row
+    product_name = models.CharField(max_length=50, default="")
+    product_description = models.CharField(
+        max_length=200, blank=True, null=True
+    )
+    unit_price = models.DecimalField(
+        max_digits=18, decimal_places=2, default=0.00
+    )
+
+    def snapshot_product(self, product: Product):
+        self.product = product
+        self.product_name = product.name
+        self.product_description = product.description
+        self.unit_price = product.price
 
     def calculate_sub_total(self):
-        self.sub_total = self.quantity * self.product.price
+        self.snapshot_product(self.product)
+        self.sub_total = self.quantity * self.unit_price
         self.save()
 
+    def set_quantity(self, quantity: int) -> LineItemChange:
+        sub_total: Decimal = quantity * self.unit_price
+        change = LineItemChange(
+            self.product_id,  # type: ignore[reportGeneralTypeIssues]
+            quantity - self.quantity,
+            sub_total - self.sub_total,
+            0,
+        )
+        self.quantity = quantity
+        self.sub_total = sub_total
+        self.save(update_fields=["quantity", "sub_total"])
+        return change
+
+    @classmethod
+    def for_product(
+        cls, order: Order, product: Product, quantity: int
+    ) -> "LineItem":
+        line_item = cls(order=order, quantity=quantity)
+        line_item.snapshot_product(product)
+        line_item.sub_total = quantity * line_item.unit_price
+        return line_item
+
+    @classmethod
+    def build_for_order(
+        cls, order: Order, line_items_data: list[dict]
+    ) -> list["LineItem"]:
+        return [
+            cls.for_product(order, item["product"], item["quantity"])
+            for item in line_items_data
+        ]
+
+    @classmethod
+    def bulk_create_for_order(
+        cls, order: Order, line_items_data: list[dict]
+    ) -> list["LineItem"]:
+        line_items: list[LineItem] = cls.build_for_order(
+            order, line_items_data
+        )
+        with transaction.atomic():
+            return cls.objects.bulk_create(line_items)
+
+    @classmethod
+    def sync_for_order(
+        cls, order: Order, line_items_data: list[dict]
+    ) -> list[LineItemChange]:
+        existing: dict[int, LineItem] = {
+            line_item.product_id: line_item  # type: ignore[reportGeneralTypeIssues]
+            for line_item in cls.objects.select_for_update().filter(
+                order=order
+            )
+        }
+        incoming: dict[int, dict] = {
+            item["product"].id: item for item in line_items_data
+        }
+
+        changes: list[LineItemChange] = []
+        to_create: list[LineItem] = []
+        to_update: list[LineItem] = []
+        to_delete: list[LineItem] = [
+            line_item
+            for product_id, line_item in existing.items()
+            if product_id not in incoming
+        ]
+        for product_id, item in incoming.items():
+            line_item = existing.get(product_id)
+            if line_item is None:
+                line_item = cls.for_product(
+                    order, item["product"], item["quantity"]
+                )
+                to_create.append(line_item)
+                changes.append(LineItemChange.added(line_item))
+            elif line_item.quantity != item["quantity"]:
+                # Existing lines keep the price they were sold at
+                sub_total: Decimal = item["quantity"] * line_item.unit_price
+                changes.append(
+                    LineItemChange(
+                        product_id,
+                        item["quantity"] - line_item.quantity,
+                        sub_total - line_item.sub_total,
+                        0,
+                    )
+                )
+                line_item.quantity = item["quantity"]
+                line_item.sub_total = sub_total
+                to_update.append(line_item)
+        changes.extend(
+            LineItemChange.removed(line_item) for line_item in to_delete
+        )
+
+        if to_delete:
+            cls.objects.filter(
+                id__in=[line_item.id for line_item in to_delete]
+            ).delete()
+        if to_update:
+            cls.objects.bulk_update(to_update, ["quantity", "sub_total"])
+        if to_create:
+            cls.objects.bulk_create(to_create)
+        return changes
+
     class Meta:
         unique_together = [["order", "product"]]
+        indexes = [
+            # The unique index leads with order. This one answers "is the
+            # product in an open order" with the join to Order by primary key
+            models.Index(
+                fields=["product", "order"], name="lineitem_product_order_idx"
+            ),
+        ]
+
+
+class ArchivedOrder(models.Model):
+    """Paid or cancelled order moved out of the live tables by archiveOrders"""
+
+    ARCHIVABLE_STATUSES: list[str] = [
+        Order.Status.PAID,
+        Order.Status.CANCELLED,
+    ]
+
+    id = models.BigIntegerField(primary_key=True)
+    order_status = models.CharField(
+        max_length=10, choices=Order.Status.choices
+    )
+    order_total = models.DecimalField(
+        max_digits=18, decimal_places=2, default=0.00
+    )
+    created_on = models.DateTimeField()
+    last_updated = models.DateTimeField()
+    version = models.PositiveIntegerField(default=1)
+    archived_on = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["created_on"], name="archivedorder_created_on_idx"
+            ),
+        ]
+
+    @classmethod
+    def from_order(cls, order: Order) -> "ArchivedOrder":
+        return cls(
+            id=order.id,
+            order_status=order.order_status,
+            order_total=order.order_total,
+            created_on=order.created_on,
+            last_updated=order.last_updated,
+            version=order.version,
+        )
+
+
+class ArchivedLineItem(models.Model):
+    # Same reverse name as LineItem so OrderSerializer renders both
+    order = models.ForeignKey(
+        ArchivedOrder, on_delete=models.CASCADE, related_name="lineitem_set"
+    )
+    product = models.ForeignKey(Product, on_delete=models.CASCADE)
+    quantity = models.IntegerField()
+    sub_total = models.DecimalField(
+        max_digits=18, decimal_places=2, default=0.00
+    )
+    product_name = models.CharField(max_length=50, default="")
+    product_description = models.CharField(
+        max_length=200, blank=True, null=True
+    )
+    unit_price = models.DecimalField(
+        max_digits=18, decimal_places=2, default=0.00
+    )
+
+    class Meta:
+        unique_together = [["order", "product"]]
+
+    @classmethod
+    def from_line_item(cls, line_item: LineItem) -> "ArchivedLineItem":
+        return cls(
+            id=line_item.id,
+            order_id=line_item.order_id,  # type: ignore[reportGeneralTypeIssues]
+            product_id=line_item.product_id,  # type: ignore[reportGeneralTypeIssues]
+            quantity=line_item.quantity,
+            sub_total=line_item.sub_total,
+            product_name=line_item.product_name,
+            product_description=line_item.product_description,
+            unit_price=line_item.unit_price,
+        )
+
+
+class SalesRollup(models.Model):
+    """Line item totals per product and order status, by hour and by day"""
+
+    class Granularity(models.TextChoices):
+        HOUR = "hour", "Hour"
+        DAY = "day", "Day"
+
+    granularity = models.CharField(max_length=4, choices=Granularity.choices)
+    period_start = models.DateTimeField()
+    product = models.ForeignKey(Product, on_delete=models.CASCADE)
+    order_status = models.CharField(
+        max_length=10, choices=Order.Status.choices
+    )
+    quantity = models.BigIntegerField(default=0)
+    revenue = models.DecimalField(
+        max_digits=18, decimal_places=2, default=0.00
+    )
+    line_count = models.IntegerField(default=0)
+
+    class Meta:
+        unique_together = [
+            ["granularity", "period_start", "product", "order_status"]
+        ]
+
+    @classmethod
+    def periods(cls, moment: datetime) -> list[tuple[str, datetime]]:
+        hour: datetime = moment.replace(minute=0, second=0, microsecond=0)
+        return [
+            (cls.Granularity.HOUR, hour),
+            (cls.Granularity.DAY, hour.replace(hour=0)),
+        ]
+
+    @classmethod
+    def record(cls, entries: Iterable[tuple[Order, str, LineItemChange]]):
+        # Sum the changes per rollup row, then apply them with one
+        # INSERT IGNORE for missing rows and one UPDATE for all rows.
+        totals: dict[tuple, list] = {}
+        for order, order_status, change in entries:
+            for granularity, period_start in cls.periods(order.created_on):
+                key = (
+                    granularity,
+                    period_start,
+                    change.product_id,
+                    order_status,
+                )
+                total = totals.setdefault(key, [0, Decimal(0.00), 0])
+                total[0] += change.quantity
+                total[1] += change.sub_total
+                total[2] += change.line_count
+        totals = {key: total for key, total in totals.items() if any(total)}
+        if not totals:
+            return
+
+        keys: list[tuple] = sorted(totals)
+        cls.objects.bulk_create(
+            [
+                cls(
+                    granularity=granularity,
+                    period_start=period_start,
+                    product_id=product_id,
+                    order_status=order_status,
+                )
+                for granularity, period_start, product_id, order_status in keys
+            ],
+            ignore_conflicts=True,
+        )
+        matches: list[Q] = [
+            Q(
+                granularity=granularity,
+                period_start=period_start,
+                product_id=product_id,
+                order_status=order_status,
+            )
+            for granularity, period_start, product_id, order_status in keys
+        ]
+
+        def increment(field: str, index: int) -> Expression:
+            return F(field) + Case(
+                *[
+                    When(match, then=Value(totals[key][index]))
+                    for match, key in zip(matches, keys)
+                ],
+                default=Value(0),
+                output_field=cls._meta.get_field(field),
+            )
+
+        cls.objects.filter(reduce(or_, matches)).update(
+            quantity=increment("quantity", 0),
+            revenue=increment("revenue", 1),
+            line_count=increment("line_count", 2),
+        )
+
+
+class IdempotencyKey(models.Model):
+    key = models.CharField(max_length=255)
+    scope = models.CharField(max_length=255)
+    request_hash = models.CharField(max_length=64)
+    status_code = models.PositiveSmallIntegerField(blank=True, null=True)
+    response_body = models.TextField(blank=True, null=True)
+    created_on = models.DateTimeField(auto_now_add=True)
+    expires_on = models.DateTimeField(db_index=True)
+    # While the response is missing another request may take the key over
+    # after this
+    locked_until = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        unique_together = [["key", "scope"]]
+
+
+class CatalogueVersion(models.Model):
+    # One row shared by every worker. Catalogue cache entries are keyed on
+    # its version, so a bump in any process invalidates them everywhere.
+    ROW_ID = 1
+
+    version = models.BigIntegerField()
+
+    @classmethod
+    def current(cls) -> int:
+        # A fresh version never collides with entries cached before the
+        # row was lost
+        row, _ = cls.objects.get_or_create(
+            pk=cls.ROW_ID, defaults={"version": time.time_ns()}
+        )
+        return row.version
+
+    @classmethod
+    def bump(cls):
+        if not cls.objects.filter(pk=cls.ROW_ID).update(
+            version=F("version") + 1
+        ):
+            cls.current()
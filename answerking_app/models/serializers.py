@@ -1,17 +1,25 @@
+from collections.abc import Collection
+from decimal import Decimal
 from typing import OrderedDict
 
+from django.conf import settings
 from django.core.validators import (
     MaxValueValidator,
     MinValueValidator,
     RegexValidator,
 )
+from django.db import transaction
+from django.db.models import QuerySet
 from rest_framework import serializers, status
 
 from answerking_app.models.models import (
     Category,
     LineItem,
+    LineItemChange,
     Order,
     Product,
+    ProductPrice,
+    SalesRollup,
     Tag,
 )
 from answerking_app.utils.mixins.ApiExceptions import ProblemDetails
@@ -25,6 +33,26 @@ name_regex_str = "^[a-zA-Z0-9 !]+$"
 desc_regex_str = "^[a-zA-Z0-9 .!,#]+$"
 
 
+class LookupRelatedField(serializers.PrimaryKeyRelatedField):
+    """Resolves ids from ``{Model: {pk: obj}}`` in the context when given,
+    so many payloads can be validated against one prefetched lookup."""
+
+    def to_internal_value(self, data):
+        lookups: dict = self.context.get("related_lookups", {})
+        model = self.get_queryset().model
+        if model not in lookups:
+            return super().to_internal_value(data)
+        if isinstance(data, bool):
+            self.fail("incorrect_type", data_type=type(data).__name__)
+        try:
+            instance = lookups[model].get(int(data))
+        except (TypeError, ValueError):
+            self.fail("incorrect_type", data_type=type(data).__name__)
+        if instance is None:
+            self.fail("does_not_exist", pk_value=data)
+        return instance
+
+
 class CategoryDetailSerializer(serializers.ModelSerializer):
     name = serializers.CharField(
         max_length=50,
@@ -48,6 +76,7 @@ class CategoryDetailSerializer(serializers.ModelSerializer):
             name=validated_data["name"],
             description=validated_data["description"],
         )
+        self.touch_products(category, products)
         category.product_set.add(*products)
         return category
 
@@ -61,9 +90,25 @@ class CategoryDetailSerializer(serializers.ModelSerializer):
         category.name = validated_data["name"]
         category.description = validated_data["description"]
         category.save()
+        self.touch_products(category, products)
         category.product_set.set(objs=products)
         return category
 
+    @staticmethod
+    def touch_products(category: Category, products: list[Product]):
+        # Products render their category, and the categories they are
+        # moved out of list them
+        product_ids: set[int] = {product.id for product in products}
+        current_ids: set[int] = set(
+            category.product_set.values_list("id", flat=True)
+        )
+        Category.touch(
+            Product.objects.filter(id__in=product_ids - current_ids)
+            .exclude(category=None)
+            .values_list("category_id", flat=True)
+        )
+        Product.touch(product_ids | current_ids)
+
     class Meta:
         model = Category
         fields = ("id", "name", "description")
@@ -122,13 +167,13 @@ class ProductSerializer(serializers.ModelSerializer):
     )
     retired = serializers.BooleanField(required=False)
     category = CategoryDetailSerializer(read_only=True)
-    categoryId = serializers.PrimaryKeyRelatedField(
+    categoryId = LookupRelatedField(
         source="category",
         queryset=Category.objects.all(),
         required=False,
         write_only=True,
     )
-    tags = serializers.PrimaryKeyRelatedField(
+    tags = LookupRelatedField(
         source="tag_set",
         queryset=Tag.objects.all(),
         many=True,
@@ -149,6 +194,16 @@ class ProductSerializer(serializers.ModelSerializer):
         )
         depth = 1
 
+    @staticmethod
+    def setup_eager_loading(
+        queryset: QuerySet[Product], fields: Collection[str] | None = None
+    ) -> QuerySet[Product]:
+        if fields is None or "category" in fields:
+            queryset = queryset.select_related("category")
+        if fields is None or "tags" in fields:
+            queryset = queryset.prefetch_related("tag_set")
+        return queryset
+
     def validate_name(self, value: str) -> str:
         return compress_white_spaces(value)
 
@@ -196,21 +251,22 @@ class TagSerializer(serializers.ModelSerializer):
         return compress_white_spaces(value)
 
 
-class LineItemProductSerializer(serializers.ModelSerializer):
-    id = serializers.IntegerField()
+class LineItemSnapshotSerializer(serializers.Serializer):
+    """The ordered product, read from the line item's own snapshot"""
+
+    id = serializers.IntegerField(source="product_id")
     price = serializers.DecimalField(
-        max_digits=18, decimal_places=2, read_only=True
+        source="unit_price", max_digits=18, decimal_places=2
+    )
+    name = serializers.CharField(source="product_name")
+    description = serializers.CharField(
+        source="product_description", allow_null=True
     )
-
-    class Meta:
-        model = Product
-        read_only_fields = ["name", "description", "price"]
-        exclude = ["retired", "category"]
 
 
 class LineItemSerializer(serializers.ModelSerializer):
-    product = LineItemProductSerializer(read_only=True)
-    productId = serializers.PrimaryKeyRelatedField(
+    product = LineItemSnapshotSerializer(source="*", read_only=True)
+    productId = LookupRelatedField(
         source="product",
         queryset=Product.objects.all(),
         write_only=True,
@@ -247,26 +303,48 @@ class OrderSerializer(serializers.ModelSerializer):
         source="lineitem_set", many=True, required=False
     )
 
+    @staticmethod
+    def setup_eager_loading(
+        queryset: QuerySet[Order], fields: Collection[str] | None = None
+    ) -> QuerySet[Order]:
+        if fields is None or "lineItems" in fields:
+            queryset = queryset.prefetch_related("lineitem_set")
+        return queryset
+
+    @transaction.atomic
     def create(self, validated_data: dict) -> Order:
         order: Order = Order.objects.create()
         if "lineitem_set" in validated_data:
             line_items_data = validated_data["lineitem_set"]
-            self.create_order_line_items(
+            line_items: list[LineItem] = self.create_order_line_items(
                 order=order, line_items_data=line_items_data
             )
-        order.calculate_total()
+            if line_items:
+                order.apply_total_delta(
+                    sum(line_item.sub_total for line_item in line_items)
+                )
+                SalesRollup.record(
+                    (order, order.order_status, LineItemChange.added(item))
+                    for item in line_items
+                )
         return order
 
+    @transaction.atomic
     def update(self, order_to_update: Order, validated_data: dict) -> Order:
-        if "lineitem_set" in validated_data:
-            line_items_data: list[OrderedDict] = validated_data["lineitem_set"]
-            LineItem.objects.filter(order_id=order_to_update.id).delete()
-            self.create_order_line_items(
-                order=order_to_update, line_items_data=line_items_data
-            )
-        else:
-            LineItem.objects.filter(order_id=order_to_update.id).delete()
-        order_to_update.calculate_total()
+        line_items_data: list[OrderedDict] = validated_data.get(
+            "lineitem_set", []
+        )
+        changes: list[LineItemChange] = LineItem.sync_for_order(
+            order=order_to_update, line_items_data=line_items_data
+        )
+        order_to_update.apply_total_delta(
+            sum((change.sub_total for change in changes), Decimal(0.00)),
+            expected_version=order_to_update.version,
+        )
+        SalesRollup.record(
+            (order_to_update, order_to_update.order_status, change)
+            for change in changes
+        )
 
         return order_to_update
 
@@ -274,14 +352,32 @@ class OrderSerializer(serializers.ModelSerializer):
         self,
         order: Order,
         line_items_data: list[OrderedDict],
-    ):
-        for order_item in line_items_data:
-            new_line_item = LineItem.objects.create(
-                order=order,
-                product=order_item["product"],
-                quantity=order_item["quantity"],
+    ) -> list[LineItem]:
+        return LineItem.bulk_create_for_order(order, line_items_data)
+
+    @staticmethod
+    @transaction.atomic
+    def create_many(validated_data_list: list[dict]) -> list[Order]:
+        orders: list[Order] = []
+        line_items: list[LineItem] = []
+        for validated_data in validated_data_list:
+            order = Order()
+            order_line_items: list[LineItem] = LineItem.build_for_order(
+                order, validated_data.get("lineitem_set", [])
             )
-            new_line_item.calculate_sub_total()
+            order.order_total = sum(
+                (line_item.sub_total for line_item in order_line_items),
+                Decimal(0.00),
+            )
+            order.save()
+            orders.append(order)
+            line_items.extend(order_line_items)
+        LineItem.objects.bulk_create(line_items)
+        SalesRollup.record(
+            (item.order, item.order.order_status, LineItemChange.added(item))
+            for item in line_items
+        )
+        return orders
 
     def validate_lineItems(self, line_items_data):
         list_products = [p["product"] for p in line_items_data]
@@ -309,6 +405,111 @@ class OrderSerializer(serializers.ModelSerializer):
         depth = 3
 
 
+class OrderLineItemSerializer(serializers.ModelSerializer):
+    orderId = serializers.IntegerField(source="order_id", read_only=True)
+    orderTotal = serializers.DecimalField(
+        source="order.order_total",
+        read_only=True,
+        decimal_places=2,
+        max_digits=18,
+    )
+    product = LineItemSnapshotSerializer(source="*", read_only=True)
+    quantity = serializers.IntegerField(
+        validators=[MinValueValidator(1), MaxValueValidator(MAXNUMBERSIZE)],
+    )
+    subTotal = serializers.DecimalField(
+        source="sub_total",
+        read_only=True,
+        decimal_places=2,
+        max_digits=18,
+    )
+
+    class Meta:
+        model = LineItem
+        fields = ["orderId", "orderTotal", "product", "quantity", "subTotal"]
+
+    @transaction.atomic
+    def create(self, validated_data: dict) -> LineItem:
+        line_item: LineItem = LineItem.for_product(
+            validated_data["order"],
+            validated_data["product"],
+            validated_data["quantity"],
+        )
+        line_item.save()
+        self.apply_change(line_item.order, LineItemChange.added(line_item))
+        return line_item
+
+    @transaction.atomic
+    def update(self, line_item: LineItem, validated_data: dict) -> LineItem:
+        change: LineItemChange = line_item.set_quantity(
+            validated_data["quantity"]
+        )
+        self.apply_change(line_item.order, change)
+        return line_item
+
+    @staticmethod
+    def apply_change(order: Order, change: LineItemChange):
+        order.apply_total_delta(
+            change.sub_total, expected_version=order.version
+        )
+        SalesRollup.record([(order, order.order_status, change)])
+
+
+class OrderBatchResultSerializer(serializers.Serializer):
+    status = serializers.IntegerField()
+    order = OrderSerializer(required=False)
+    problem = serializers.DictField(required=False)
+
+
+class ProductImportErrorSerializer(serializers.Serializer):
+    row = serializers.IntegerField()
+    errors = serializers.DictField()
+
+
+class ProductImportResultSerializer(serializers.Serializer):
+    created = serializers.IntegerField()
+    updated = serializers.IntegerField()
+    errors = ProductImportErrorSerializer(many=True)
+
+
+class ProductPriceSerializer(serializers.ModelSerializer):
+    productId = serializers.IntegerField(source="product_id", read_only=True)
+    validFrom = serializers.DateTimeField(source="valid_from", read_only=True)
+
+    class Meta:
+        model = ProductPrice
+        fields = ("productId", "price", "validFrom")
+
+
+class BulkRetireSerializer(serializers.Serializer):
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=settings.BULK_RETIRE_MAX_SIZE,
+    )
+
+
+class SalesRollupSerializer(serializers.ModelSerializer):
+    periodStart = serializers.DateTimeField(source="period_start")
+    productId = serializers.IntegerField(source="product_id")
+    orderStatus = serializers.CharField(source="order_status")
+    revenue = serializers.DecimalField(max_digits=18, decimal_places=2)
+    lineCount = serializers.IntegerField(source="line_count")
+
+    class Meta:
+        model = SalesRollup
+        fields = [
+            "granularity",
+            "periodStart",
+            "productId",
+            "orderStatus",
+            "quantity",
+            "revenue",
+            "lineCount",
+        ]
+        read_only_fields = fields
+
+
 class ErrorDetailSerializer(serializers.Serializer):
     name = serializers.CharField()
 
@@ -0,0 +1,76 @@
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from answerking_app.models.models import Category, Product, ProductPrice, Tag
+from answerking_app.utils.catalogue_cache import get_catalogue_cache
+from answerking_app.utils.search import get_search_backend
+
+
+@receiver(post_save, sender=Product)
+def index_product(sender, instance: Product, **kwargs):
+    transaction.on_commit(lambda: get_search_backend().index(instance))
+
+
+@receiver(post_delete, sender=Product)
+def remove_product(sender, instance: Product, **kwargs):
+    product_id: int = instance.id
+    transaction.on_commit(lambda: get_search_backend().remove(product_id))
+
+
+@receiver(post_save, sender=Product)
+def touch_categories(sender, instance: Product, **kwargs):
+    # The categories it moved between list the product
+    loaded_category_id: int | None = getattr(
+        instance, "loaded_category_id", None
+    )
+    if instance.category_id != loaded_category_id:  # type: ignore[reportGeneralTypeIssues]
+        Category.touch(
+            {loaded_category_id, instance.category_id} - {None}  # type: ignore[reportGeneralTypeIssues]
+        )
+        instance.loaded_category_id = instance.category_id  # type: ignore[reportGeneralTypeIssues]
+
+
+@receiver(post_save, sender=Product)
+def record_price(sender, instance: Product, created: bool, **kwargs):
+    loaded_price = getattr(instance, "loaded_price", None)
+    if created or instance.price != loaded_price:
+        ProductPrice.record(
+            [(instance.id, instance.price)], instance.last_updated
+        )
+        instance.loaded_price = instance.price  # type: ignore[reportGeneralTypeIssues]
+
+
+@receiver(m2m_changed, sender=Tag.products.through)
+def touch_tagged(
+    sender,
+    instance: Product | Tag,
+    action: str,
+    reverse: bool,
+    model: type[Product] | type[Tag],
+    pk_set: set[int] | None,
+    **kwargs,
+):
+    # Products list their tags and tags list their products
+    if action == "pre_clear":
+        pk_set = set(
+            model.objects.filter(
+                **{"products" if reverse else "tag": instance}
+            ).values_list("pk", flat=True)
+        )
+    elif action not in ("post_add", "post_remove"):
+        return
+    if pk_set:
+        model.touch(pk_set)
+        type(instance).touch([instance.pk])
+        instance.refresh_from_db(fields=["version", "last_updated"])
+
+
+@receiver([post_save, post_delete], sender=Product)
+@receiver([post_save, post_delete], sender=Category)
+@receiver([post_save, post_delete], sender=Tag)
+@receiver(m2m_changed, sender=Tag.products.through)
+def bump_catalogue_version(sender, action: str = "post_save", **kwargs):
+    # m2m_changed is also sent before the change, with a pre_ action
+    if action.startswith("post_"):
+        transaction.on_commit(lambda: get_catalogue_cache().bump())
@@ -10,9 +10,14 @@ from answerking_app.models.models import (
     Product,
     Tag,
 )
+from answerking_app.utils.catalogue_cache import get_catalogue_cache
 
 
 class IntegrationTestBase(TransactionTestCase, TestCase):
+    def setUp(self):
+        # Tables are flushed between tests without sending any signals
+        get_catalogue_cache().bump()
+
     def preload_products(self, products_to_load: list[str]) -> None:
         for prod_json_file in products_to_load:
             self.seedFixture("products", prod_json_file)
@@ -37,12 +42,19 @@ class IntegrationTestBase(TransactionTestCase, TestCase):
 
     def create_order_lineItems(self, data):
         order = Order.objects.create(id=data["id"])
-        for lineItem in data["lineItems"]:
-            prod: Product = Product.objects.get(pk=lineItem["productId"])
-
-            LineItem.objects.create(
-                order=order, product=prod, quantity=lineItem["quantity"]
-            ).calculate_sub_total()
+        products: dict[int, Product] = Product.objects.in_bulk(
+            [lineItem["productId"] for lineItem in data["lineItems"]]
+        )
+        LineItem.bulk_create_for_order(
+            order,
+            [
+                {
+                    "product": products[lineItem["productId"]],
+                    "quantity": lineItem["quantity"],
+                }
+                for lineItem in data["lineItems"]
+            ],
+        )
 
         order.calculate_total()
 
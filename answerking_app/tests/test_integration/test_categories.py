@@ -1,6 +1,8 @@
 from assertpy import assert_that
 from ddt import data, ddt
+from django.db import connection
 from django.test import Client
+from django.test.utils import CaptureQueriesContext
 from freezegun import freeze_time
 
 from answerking_app.models.models import Category, Product
@@ -74,6 +76,53 @@ class GetTests(IntegrationTestBase):
         self.assertJSONErrorResponse(response.json())
         assert_that(response.status_code).is_equal_to(404)
 
+    def test_get_prods_in_empty_cat_returns_empty_list(self):
+        self.seedFixture("categories", "basic-1.json")
+        response = client.get("/api/categories/1/products")
+        assert_that(response.status_code).is_equal_to(200)
+        assert_that(response.json()).is_equal_to([])
+
+    def test_get_prods_in_cat_runs_constant_number_of_queries(self):
+        self.seedFixture("categories", "basic-1.json")
+        self.seedFixture("products", "extreme-5.json")
+        Product.objects.update(category_id=1)
+        with self.assertNumQueries(3):
+            response = client.get("/api/categories/1/products")
+        assert_that(response.json()).extracting("id").is_equal_to(
+            [1, 2, 3, 4, 5]
+        )
+
+    def test_get_prods_in_cat_filters_retired_and_paginates(self):
+        self.seedFixture("categories", "basic-1.json")
+        self.seedFixture("products", "extreme-5.json")
+        Product.objects.update(category_id=1)
+        Product.objects.filter(id__in=[2, 4]).update(retired=True)
+        response = client.get(
+            "/api/categories/1/products", {"retired": False, "pageSize": 2}
+        )
+        assert_that(response.json()["results"]).extracting("id").is_equal_to(
+            [1, 3]
+        )
+        next_page = client.get(response.json()["next"])
+        assert_that(next_page.json()["results"]).extracting("id").is_equal_to(
+            [5]
+        )
+
+    def test_get_id_after_product_moved_in_returns_modified(self):
+        seeded_data = self.seedFixture("categories", "basic-1.json")
+        cat_url = f"/api/categories/{seeded_data['id']}"  # type: ignore[GeneralTypeIssue]
+        first_response = client.get(cat_url)
+        product = Product.objects.create(
+            **self.getFixture("products", "basic-1.json")
+        )
+        product.category_id = seeded_data["id"]  # type: ignore[GeneralTypeIssue]
+        product.save()
+        response = client.get(
+            cat_url, HTTP_IF_NONE_MATCH=first_response["ETag"]
+        )
+        assert_that(response.status_code).is_equal_to(200)
+        assert_that(response.json()["products"]).is_equal_to([product.id])
+
 
 @ddt
 class PostTests(IntegrationTestBase):
@@ -292,3 +341,46 @@ class DeleteTests(IntegrationTestBase):
         assert_that(response_1.status_code).is_equal_to(204)
         self.assertJSONErrorResponse(response_2.json())
         assert_that(response_2.status_code).is_equal_to(410)
+
+
+class BulkRetireTests(IntegrationTestBase):
+    def post(self, action: str, ids: list[int]):
+        return client.post(
+            f"/api/categories/{action}",
+            {"ids": ids},
+            content_type="application/json",
+        )
+
+    def test_bulk_retire_and_unretire(self):
+        self.seedFixture("categories", "extreme-3.json")
+        client.get("/api/categories/1")
+        retire_response = self.post("retire", [1, 2])
+        assert_that(retire_response.status_code).is_equal_to(204)
+        assert_that(
+            client.get("/api/categories/1").json()["retired"]
+        ).is_true()
+        unretire_response = self.post("unretire", [1, 3])
+        assert_that(unretire_response.status_code).is_equal_to(204)
+        assert_that(
+            list(
+                Category.objects.filter(retired=True).values_list(
+                    "id", flat=True
+                )
+            )
+        ).is_equal_to([2])
+        assert_that(Category.objects.get(id=1).version).is_equal_to(3)
+
+    def test_bulk_retire_query_count_does_not_grow_with_ids(self):
+        self.seedFixture("categories", "extreme-3.json")
+        with CaptureQueriesContext(connection) as one:
+            self.post("retire", [1])
+        with CaptureQueriesContext(connection) as many:
+            self.post("retire", [2, 3])
+        assert_that(len(many)).is_equal_to(len(one))
+
+    def test_bulk_retire_non_existent_ids_returns_not_found(self):
+        self.seedFixture("categories", "extreme-3.json")
+        response = self.post("retire", [1, 4])
+        self.assertJSONErrorResponse(response.json())
+        assert_that(response.status_code).is_equal_to(404)
+        assert_that(Category.objects.get(id=1).retired).is_false()
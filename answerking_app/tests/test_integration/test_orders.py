@@ -1,8 +1,16 @@
+import csv
+import json
+from datetime import timedelta
+from io import StringIO
+
 from assertpy import assert_that
-from ddt import data, ddt
+from ddt import data, ddt, unpack
+from django.core.management import call_command
 from django.test import Client
+from django.utils import timezone
 from freezegun import freeze_time
 
+from answerking_app.models.models import Order, Product
 from answerking_app.tests.test_integration.IntegrationTestBaseClass import (
     IntegrationTestBase,
 )
@@ -48,6 +56,93 @@ class GetTests(IntegrationTestBase):
         self.assertMatchSnapshot(response.json())
         assert_that(response.status_code).is_equal_to(200)
 
+    @data(
+        "basic-1.json",
+        "basic-1-with-products.json",
+        "basic-3.json",
+        "extreme-3.json",
+    )
+    def test_get_all_runs_constant_number_of_queries(self, seed):
+        self.preload_products(["basic-3.json"])
+        self.seedFixture("orders", seed)
+        with self.assertNumQueries(3):
+            response = client.get("/api/orders")
+        assert_that(response.status_code).is_equal_to(200)
+
+    @data("basic-1.json", "basic-1-with-products.json", "basic-3.json")
+    def test_get_id_runs_constant_number_of_queries(self, seed):
+        self.preload_products(["basic-3.json"])
+        seeded_data = self.seedFixture("orders", seed)
+        with self.assertNumQueries(2):
+            response = client.get(f"/api/orders/{seeded_data['id']}")  # type: ignore[GeneralTypeIssue]
+        assert_that(response.status_code).is_equal_to(200)
+
+    def test_get_id_sparse_fields_skips_line_items(self):
+        self.preload_products(["basic-3.json"])
+        seeded_data = self.seedFixture("orders", "basic-3.json")
+        with self.assertNumQueries(1):
+            response = client.get(
+                f"/api/orders/{seeded_data['id']}?fields=id,orderStatus"  # type: ignore[GeneralTypeIssue]
+            )
+        assert_that(response.json()).is_equal_to(
+            {"id": seeded_data["id"], "orderStatus": "Created"}  # type: ignore[GeneralTypeIssue]
+        )
+
+    def test_get_all_unchanged_returns_not_modified_without_loading(self):
+        self.preload_products(["basic-3.json"])
+        self.seedFixture("orders", "basic-3.json")
+        first_response = client.get("/api/orders")
+        with self.assertNumQueries(1):
+            response = client.get(
+                "/api/orders", HTTP_IF_NONE_MATCH=first_response["ETag"]
+            )
+        assert_that(response.status_code).is_equal_to(304)
+
+    def test_get_all_after_update_returns_modified(self):
+        self.preload_products(["basic-3.json"])
+        seeded_data = self.seedFixture("orders", "basic-3.json")
+        first_response = client.get("/api/orders")
+        order = Order.objects.get(pk=seeded_data["id"])  # type: ignore[GeneralTypeIssue]
+        order.order_status = Order.Status.CANCELLED
+        order.save()
+        response = client.get(
+            "/api/orders", HTTP_IF_NONE_MATCH=first_response["ETag"]
+        )
+        assert_that(response.status_code).is_equal_to(200)
+        assert_that(response["ETag"]).is_not_equal_to(first_response["ETag"])
+
+    def test_get_id_returns_products_as_sold(self):
+        self.preload_products(["basic-3.json"])
+        seeded_data = self.seedFixture("orders", "basic-3.json")
+        Product.objects.filter(pk=1).update(name="Renamed", price=9.99)
+        response = client.get(f"/api/orders/{seeded_data['id']}")  # type: ignore[GeneralTypeIssue]
+        product = response.json()["lineItems"][0]["product"]
+        assert_that(product).has_name("Burger").has_price(1.2)
+
+    @data(
+        ("status=Cancelled", [2]),
+        ("status=Created", [1, 3]),
+        ("totalMin=5&totalMax=10", [1]),
+        ("createdFrom=2022-04-01T00:00:00Z", [1, 2, 3]),
+        ("createdTo=2022-03-31T00:00:00Z", []),
+    )
+    @unpack
+    @freeze_time(frozen_time)
+    def test_get_all_filtered_returns_matching_orders(
+        self, query, expected_ids
+    ):
+        self.preload_products(["basic-3.json"])
+        self.seedFixture("orders", "extreme-3.json")
+        client.delete("/api/orders/2")
+        response = client.get(f"/api/orders?{query}")
+        assert_that(response.json()).extracting("id").is_equal_to(expected_ids)
+        assert_that(response.status_code).is_equal_to(200)
+
+    @data("status=Eaten", "createdFrom=yesterday", "totalMin=cheap")
+    def test_get_all_invalid_filter_returns_bad_request(self, query):
+        response = client.get(f"/api/orders?{query}")
+        assert_that(response.status_code).is_equal_to(400)
+
     def test_get_id_invalid_returns_Invalid(self):
         response = client.get("/api/orders/f")
         self.assertJSONErrorResponse(response.json())
@@ -251,3 +346,217 @@ class DeleteTests(IntegrationTestBase):
         assert_that(response_1.status_code).is_equal_to(204)
         self.assertJSONErrorResponse(response_2.json())
         assert_that(response_2.status_code).is_equal_to(400)
+
+
+class ArchivedOrderTests(IntegrationTestBase):
+    def setUp(self):
+        seeded_data = self.seedFixture("orders", "basic-1.json")
+        self.order_url = f"/api/orders/{seeded_data['id']}"  # type: ignore[GeneralTypeIssue]
+        Order.objects.update(
+            order_status=Order.Status.PAID,
+            last_updated=timezone.now() - timedelta(days=365),
+        )
+        call_command("archiveOrders", "--pause=0", stdout=StringIO())
+
+    def test_get_archived_order_returns_ok(self):
+        response = client.get(self.order_url)
+        assert_that(response.status_code).is_equal_to(200)
+        assert_that(response.json()["orderStatus"]).is_equal_to("Paid")
+        assert_that(Order.objects.exists()).is_false()
+
+    def test_put_archived_order_returns_gone(self):
+        response = client.put(
+            self.order_url,
+            self.getFixture("orders", "basic-1.json"),
+            content_type="application/json",
+        )
+        self.assertJSONErrorResponse(response.json())
+        assert_that(response.status_code).is_equal_to(410)
+
+    def test_delete_archived_order_returns_gone(self):
+        response = client.delete(self.order_url)
+        self.assertJSONErrorResponse(response.json())
+        assert_that(response.status_code).is_equal_to(410)
+
+
+class ExportTests(IntegrationTestBase):
+    def setUp(self):
+        self.preload_products(["basic-3.json"])
+        self.seedFixture("orders", "basic-1.json")
+        self.seedFixture("orders", "basic-3.json")
+
+    def test_export_ndjson_streams_one_order_per_line(self):
+        response = client.get("/api/orders/export?format=ndjson")
+        lines = b"".join(response.streaming_content).splitlines()
+        orders = [json.loads(line) for line in lines]
+        assert_that(response.status_code).is_equal_to(200)
+        assert_that(response["Content-Type"]).starts_with(
+            "application/x-ndjson"
+        )
+        assert_that(orders).extracting("id").is_equal_to([1, 3])
+        assert_that(orders[1]["lineItems"]).is_length(2)
+
+    def test_export_csv_streams_one_row_per_line_item(self):
+        response = client.get("/api/orders/export", HTTP_ACCEPT="text/csv")
+        rows = list(
+            csv.DictReader(
+                b"".join(response.streaming_content).decode().splitlines()
+            )
+        )
+        assert_that(response.status_code).is_equal_to(200)
+        assert_that(rows).extracting("orderId", "productId").is_equal_to(
+            [("1", ""), ("3", "1"), ("3", "2")]
+        )
+
+    def test_export_with_invalid_filter_returns_bad_request(self):
+        response = client.get("/api/orders/export?status=Unknown")
+        assert_that(response.status_code).is_equal_to(400)
+        assert_that(response.json()["status"]).is_equal_to(400)
+
+
+class LineItemTests(IntegrationTestBase):
+    def setUp(self):
+        self.preload_products(["basic-3.json"])
+        self.seedFixture("orders", "basic-3.json")
+
+    def test_post_line_item_adds_product_and_updates_total(self):
+        response = client.post(
+            "/api/orders/3/lineItems/3",
+            {"quantity": 2},
+            content_type="application/json",
+        )
+        assert_that(response.status_code).is_equal_to(201)
+        assert_that(response.json()).has_orderTotal(9.6).has_subTotal(3.0)
+        assert_that(client.get("/api/orders/3").json()["lineItems"]).is_length(
+            3
+        )
+
+    def test_post_line_item_already_in_order_returns_bad_request(self):
+        response = client.post(
+            "/api/orders/3/lineItems/1",
+            {"quantity": 2},
+            content_type="application/json",
+        )
+        self.assertJSONErrorResponse(response.json())
+        assert_that(response.status_code).is_equal_to(400)
+
+    def test_patch_line_item_changes_quantity_and_total(self):
+        with self.assertNumQueries(12):
+            response = client.patch(
+                "/api/orders/3/lineItems/1",
+                {"quantity": 1},
+                content_type="application/json",
+            )
+        assert_that(response.status_code).is_equal_to(200)
+        assert_that(response.json()).has_quantity(1).has_orderTotal(4.2)
+
+    def test_delete_line_item_removes_product_and_updates_total(self):
+        response = client.delete("/api/orders/3/lineItems/2")
+        order = client.get("/api/orders/3").json()
+        assert_that(response.status_code).is_equal_to(204)
+        assert_that(order["orderTotal"]).is_equal_to(3.6)
+        assert_that(order["lineItems"]).is_length(1)
+
+    def test_delete_line_item_not_in_order_returns_not_found(self):
+        response = client.delete("/api/orders/3/lineItems/3")
+        self.assertJSONErrorResponse(response.json())
+        assert_that(response.status_code).is_equal_to(404)
+
+    def test_patch_line_item_of_cancelled_order_returns_bad_request(self):
+        client.delete("/api/orders/3")
+        response = client.patch(
+            "/api/orders/3/lineItems/1",
+            {"quantity": 1},
+            content_type="application/json",
+        )
+        self.assertJSONErrorResponse(response.json())
+        assert_that(response.status_code).is_equal_to(400)
+
+
+class VersionedUpdateTests(IntegrationTestBase):
+    def test_get_returns_version_etag(self):
+        seeded_data = self.seedFixture("orders", "basic-1.json")
+        response = client.get(
+            f"/api/orders/{seeded_data['id']}"  # type: ignore[GeneralTypeIssue]
+        )
+        assert_that(response.status_code).is_equal_to(200)
+        assert_that(response["ETag"]).is_equal_to(
+            f'"{Order.objects.get().version}"'
+        )
+
+    def test_put_with_matching_if_match_returns_ok_and_new_etag(self):
+        seeded_data = self.seedFixture("orders", "basic-1.json")
+        self.preload_products(["basic-3.json"])
+        order_url = f"/api/orders/{seeded_data['id']}"  # type: ignore[GeneralTypeIssue]
+        etag = client.get(order_url)["ETag"]
+        response = client.put(
+            order_url,
+            self.getFixture("orders", "basic-3.json"),
+            content_type="application/json",
+            HTTP_IF_MATCH=etag,
+        )
+        assert_that(response.status_code).is_equal_to(200)
+        assert_that(response["ETag"]).is_not_equal_to(etag)
+
+    def test_put_with_stale_if_match_returns_precondition_failed(self):
+        seeded_data = self.seedFixture("orders", "basic-1.json")
+        self.preload_products(["basic-3.json"])
+        order_url = f"/api/orders/{seeded_data['id']}"  # type: ignore[GeneralTypeIssue]
+        put_data = self.getFixture("orders", "basic-3.json")
+        etag = client.get(order_url)["ETag"]
+        responses = [
+            client.put(
+                order_url,
+                put_data,
+                content_type="application/json",
+                HTTP_IF_MATCH=etag,
+            )
+            for _ in range(2)
+        ]
+        assert_that(responses[0].status_code).is_equal_to(200)
+        self.assertJSONErrorResponse(responses[1].json())
+        assert_that(responses[1].status_code).is_equal_to(412)
+
+    def test_delete_with_stale_if_match_returns_precondition_failed(self):
+        seeded_data = self.seedFixture("orders", "basic-1.json")
+        response = client.delete(
+            f"/api/orders/{seeded_data['id']}",  # type: ignore[GeneralTypeIssue]
+            HTTP_IF_MATCH='"0"',
+        )
+        self.assertJSONErrorResponse(response.json())
+        assert_that(response.status_code).is_equal_to(412)
+        assert_that(Order.objects.get().order_status).is_equal_to("Created")
+
+
+# Runs after the snapshot tests as its POSTs advance the order ids
+class RetriedPostTests(IntegrationTestBase):
+    def test_post_with_repeated_idempotency_key_replays_response(self):
+        post_data = self.getFixture("orders", "basic-3.json")
+        self.preload_products(["basic-3.json"])
+        responses = [
+            client.post(
+                "/api/orders",
+                post_data,
+                content_type="application/json",
+                HTTP_IDEMPOTENCY_KEY="till-1-order-1",
+            )
+            for _ in range(2)
+        ]
+        assert_that(responses[1].json()).is_equal_to(responses[0].json())
+        assert_that(responses[1].status_code).is_equal_to(201)
+        assert_that(responses[1]["Idempotent-Replayed"]).is_equal_to("true")
+        assert_that(Order.objects.count()).is_equal_to(1)
+
+    def test_post_reused_idempotency_key_with_new_body_returns_unprocessable(
+        self,
+    ):
+        self.preload_products(["basic-3.json"])
+        for order_data in ["basic-1.json", "basic-3.json"]:
+            response = client.post(
+                "/api/orders",
+                self.getFixture("orders", order_data),
+                content_type="application/json",
+                HTTP_IDEMPOTENCY_KEY="till-1-order-1",
+            )
+        assert_that(response.status_code).is_equal_to(422)
+        assert_that(Order.objects.count()).is_equal_to(1)
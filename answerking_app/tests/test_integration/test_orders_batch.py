@@ -0,0 +1,56 @@
+from assertpy import assert_that
+from django.test import Client
+
+from answerking_app.models.models import LineItem, Order, Product
+from answerking_app.tests.test_integration.IntegrationTestBaseClass import (
+    IntegrationTestBase,
+)
+
+client = Client()
+
+
+class PostBatchTests(IntegrationTestBase):
+    def test_post_batch_valid_returns_created(self):
+        self.preload_products(["basic-3.json"])
+        post_data = [
+            self.getFixture("orders", "basic-1.json"),
+            self.getFixture("orders", "basic-3.json"),
+        ]
+        response = client.post(
+            "/api/orders/batch", post_data, content_type="application/json"
+        )
+        results = response.json()
+
+        assert_that(response.status_code).is_equal_to(201)
+        assert_that(results).extracting("status").is_equal_to([201, 201])
+        assert_that(results[1]["order"]["orderTotal"]).is_equal_to(6.6)
+        assert_that(results[1]["order"]["lineItems"]).is_length(2)
+        assert_that(Order.objects.count()).is_equal_to(2)
+        assert_that(LineItem.objects.count()).is_equal_to(2)
+
+    def test_post_batch_with_invalid_orders_returns_multi_status(self):
+        self.preload_products(["basic-3.json"])
+        Product.objects.filter(pk=2).update(retired=True)
+        post_data = [
+            self.getFixture("orders", "basic-1-with-products.json"),
+            self.getFixture("orders", "invalid-product-id.json"),
+            self.getFixture("orders", "basic-2.json"),
+        ]
+        response = client.post(
+            "/api/orders/batch", post_data, content_type="application/json"
+        )
+        results = response.json()
+
+        assert_that(response.status_code).is_equal_to(207)
+        assert_that(results).extracting("status").is_equal_to([201, 400, 410])
+        assert_that(results[0]["order"]["orderTotal"]).is_equal_to(4.8)
+        assert_that(results[1]["problem"]).contains_key("errors")
+        assert_that(Order.objects.count()).is_equal_to(1)
+
+    def test_post_batch_not_a_list_returns_bad_request(self):
+        post_data = self.getFixture("orders", "basic-1.json")
+        response = client.post(
+            "/api/orders/batch", post_data, content_type="application/json"
+        )
+        assert_that(response.status_code).is_equal_to(400)
+        assert_that(Order.objects.count()).is_equal_to(0)
@@ -1,10 +1,18 @@
+import json
+
 from assertpy import assert_that
-from ddt import data, ddt
-from django.test import Client
+from ddt import data, ddt, unpack
+from django.db import connection
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from freezegun import freeze_time
 
+from answerking_app.models.models import Category, Product, ProductPrice, Tag
 from answerking_app.tests.test_integration.IntegrationTestBaseClass import (
     IntegrationTestBase,
 )
+from answerking_app.utils.catalogue_cache import get_catalogue_cache
+from answerking_app.utils.search import get_search_backend
 
 client = Client()
 
@@ -23,6 +31,223 @@ class GetTests(IntegrationTestBase):
         self.assertMatchSnapshot(response.json())
         assert_that(response.status_code).is_equal_to(200)
 
+    def test_get_all_runs_constant_number_of_queries(self):
+        self.seedFixture("products", "extreme-5.json")
+        category = Category.objects.create(
+            **self.getFixture("categories", "basic-1.json")
+        )
+        tag = Tag.objects.create(**self.getFixture("tags", "basic-1.json"))
+        for product in Product.objects.all():
+            product.category = category
+            product.save()
+            tag.products.add(product)
+        with self.assertNumQueries(4):
+            response = client.get("/api/products")
+        assert_that(response.json()).extracting("tags").contains_only([tag.id])
+
+    def test_get_id_runs_constant_number_of_queries(self):
+        _, seeded_data_prod_id = self.seed_cat_with_prod(
+            "basic-1.json", "basic-1.json"
+        )
+        with self.assertNumQueries(3):
+            response = client.get(f"/api/products/{seeded_data_prod_id}")
+        assert_that(response.status_code).is_equal_to(200)
+
+    def test_get_all_sparse_fields_skips_unused_joins(self):
+        self.seedFixture("products", "extreme-5.json")
+        with self.assertNumQueries(3):
+            response = client.get("/api/products?fields=id,name,price")
+        assert_that(response.status_code).is_equal_to(200)
+        assert_that(response.json()[0]).is_equal_to(
+            {"id": 1, "name": "Burger", "price": 100000000000000.0}
+        )
+
+    def test_get_id_exclude_leaves_out_fields(self):
+        self.seedFixture("products", "basic-1.json")
+        response = client.get("/api/products/1?exclude=description,tags")
+        assert_that(response.json()).contains_only(
+            "id", "name", "price", "category", "retired"
+        )
+
+    @data("fields=id,secret", "exclude=categoryId")
+    def test_get_unknown_sparse_field_returns_bad_request(self, query):
+        self.seedFixture("products", "basic-1.json")
+        response = client.get(f"/api/products/1?{query}")
+        self.assertJSONErrorResponse(response.json())
+        assert_that(response.status_code).is_equal_to(400)
+
+    def test_get_all_repeated_is_served_from_cache(self):
+        self.seedFixture("products", "extreme-5.json")
+        first_response = client.get("/api/products")
+        # Only the catalogue version is read
+        with self.assertNumQueries(1):
+            second_response = client.get("/api/products")
+        assert_that(second_response.json()).is_equal_to(first_response.json())
+
+    def test_get_id_after_update_returns_updated_product(self):
+        seeded_data = self.seedFixture("products", "basic-1.json")
+        prod_url = f"/api/products/{seeded_data['id']}"  # type: ignore[GeneralTypeIssue]
+        client.get(prod_url)
+        put_data = self.getFixture("products", "basic-1-update.json")
+        client.put(prod_url, put_data, content_type="application/json")
+        client.get(prod_url)
+        # Only the catalogue version is read
+        with self.assertNumQueries(1):
+            response = client.get(prod_url)
+        product = Product.objects.get(pk=seeded_data["id"])  # type: ignore[GeneralTypeIssue]
+        assert_that(response.json()["name"]).is_equal_to(put_data["name"])
+        assert_that(response["ETag"]).is_equal_to(f'"{product.version}"')
+
+    def test_get_all_unchanged_returns_not_modified(self):
+        self.seedFixture("products", "extreme-5.json")
+        first_response = client.get("/api/products")
+        # Only the catalogue version is read
+        with self.assertNumQueries(1):
+            response = client.get(
+                "/api/products", HTTP_IF_NONE_MATCH=first_response["ETag"]
+            )
+        assert_that(response.status_code).is_equal_to(304)
+        assert_that(response.content).is_empty()
+        assert_that(response["ETag"]).is_equal_to(first_response["ETag"])
+
+    def test_get_page_unchanged_returns_not_modified(self):
+        self.seedFixture("products", "extreme-5.json")
+        first_response = client.get("/api/products?pageSize=2")
+        get_catalogue_cache().bump()
+        response = client.get(
+            "/api/products?pageSize=2",
+            HTTP_IF_NONE_MATCH=first_response["ETag"],
+        )
+        assert_that(response.status_code).is_equal_to(304)
+
+    def test_get_all_after_row_leaves_filter_returns_modified(self):
+        self.seedFixture("products", "extreme-5.json")
+        first_response = client.get("/api/products?retired=false")
+        Product.objects.filter(pk=1).update(retired=True)
+        get_catalogue_cache().bump()
+        response = client.get(
+            "/api/products?retired=false",
+            HTTP_IF_NONE_MATCH=first_response["ETag"],
+        )
+        assert_that(response.status_code).is_equal_to(200)
+        assert_that(response.json()).extracting("id").does_not_contain(1)
+
+    def test_get_all_after_row_leaves_filter_ignores_modified_since(self):
+        self.seedFixture("products", "extreme-5.json")
+        first_response = client.get("/api/products?retired=false")
+        Product.objects.filter(pk=1).update(retired=True)
+        get_catalogue_cache().bump()
+        response = client.get(
+            "/api/products?retired=false",
+            HTTP_IF_MODIFIED_SINCE="Fri, 01 Jan 2100 00:00:00 GMT",
+        )
+        assert_that(first_response.has_header("Last-Modified")).is_false()
+        assert_that(response.status_code).is_equal_to(200)
+
+    def test_get_id_unmodified_since_returns_not_modified(self):
+        seeded_data = self.seedFixture("products", "basic-1.json")
+        prod_url = f"/api/products/{seeded_data['id']}"  # type: ignore[GeneralTypeIssue]
+        first_response = client.get(prod_url)
+        response = client.get(
+            prod_url, HTTP_IF_MODIFIED_SINCE=first_response["Last-Modified"]
+        )
+        assert_that(response.status_code).is_equal_to(304)
+
+    def test_get_id_after_tagging_returns_modified(self):
+        seeded_data = self.seedFixture("products", "basic-1.json")
+        prod_url = f"/api/products/{seeded_data['id']}"  # type: ignore[GeneralTypeIssue]
+        first_response = client.get(prod_url)
+        tag = Tag.objects.create(**self.getFixture("tags", "basic-1.json"))
+        tag.products.add(seeded_data["id"])  # type: ignore[GeneralTypeIssue]
+        response = client.get(
+            prod_url, HTTP_IF_NONE_MATCH=first_response["ETag"]
+        )
+        assert_that(response.status_code).is_equal_to(200)
+        assert_that(response.json()["tags"]).is_equal_to([tag.id])
+
+    @data(
+        ("categoryId=1", [1, 2]),
+        ("categoryId=1&retired=false", [2]),
+        ("retired=true", [1]),
+        ("tagId=1", [4, 5]),
+        ("priceMin=1&priceMax=2", [3, 4, 5]),
+        ("sort=-price", [1, 3, 4, 5, 2]),
+        ("sort=price,-name", [2, 5, 3, 4, 1]),
+    )
+    @unpack
+    def test_get_all_filtered_and_sorted_returns_matching_products(
+        self, query, expected_ids
+    ):
+        self.seedFixture("products", "extreme-5.json")
+        self.seedFixture("categories", "basic-1.json")
+        self.seedFixture("tags", "basic-1.json")
+        Product.objects.filter(pk__in=[1, 2]).update(category_id=1)
+        Product.objects.filter(pk=1).update(retired=True)
+        Tag.objects.get(pk=1).products.add(4, 5)
+        response = client.get(f"/api/products?{query}")
+        assert_that(response.status_code).is_equal_to(200)
+        assert_that(response.json()).extracting("id").is_equal_to(expected_ids)
+
+    @data("categoryId=first", "retired=maybe", "sort=description")
+    def test_get_all_invalid_filter_returns_bad_request(self, query):
+        response = client.get(f"/api/products?{query}")
+        assert_that(response.status_code).is_equal_to(400)
+
+    def test_get_all_sorted_paginated_returns_pages(self):
+        self.seedFixture("products", "extreme-5.json")
+        first_page = client.get("/api/products?sort=-price&pageSize=3").json()
+        second_page = client.get(first_page["next"]).json()
+        assert_that(first_page["results"] + second_page["results"]).extracting(
+            "id"
+        ).is_equal_to([1, 3, 4, 5, 2])
+
+    def test_get_all_sorted_paginated_seeks_past_ties(self):
+        self.seedFixture("products", "extreme-5.json")
+        page: dict = client.get("/api/products?sort=price&pageSize=1").json()
+        forward: list[int] = [page["results"][0]["id"]]
+        with CaptureQueriesContext(connection) as context:
+            while page["next"]:
+                page = client.get(page["next"]).json()
+                forward.append(page["results"][0]["id"])
+            backward: list[int] = [page["results"][0]["id"]]
+            while page["previous"]:
+                page = client.get(page["previous"]).json()
+                backward.append(page["results"][0]["id"])
+
+        assert_that(forward).is_equal_to([2, 3, 4, 5, 1])
+        assert_that(backward).is_equal_to(forward[::-1])
+        assert_that(
+            [
+                query["sql"]
+                for query in context.captured_queries
+                if "OFFSET" in query["sql"]
+            ]
+        ).is_empty()
+
+    def test_get_all_cursor_with_invalid_position_returns_not_found(self):
+        self.seedFixture("products", "extreme-5.json")
+        response = client.get("/api/products?cursor=cD0x")
+        assert_that(response.status_code).is_equal_to(404)
+
+    def test_get_all_paginated_returns_pages(self):
+        self.seedFixture("products", "extreme-5.json")
+        first_page = client.get("/api/products?pageSize=3").json()
+        second_page = client.get(first_page["next"]).json()
+
+        assert_that(first_page["previous"]).is_none()
+        assert_that(first_page["results"]).extracting("id").is_equal_to(
+            [1, 2, 3]
+        )
+        assert_that(second_page["next"]).is_none()
+        assert_that(second_page["results"]).extracting("id").is_equal_to(
+            [4, 5]
+        )
+
+    def test_get_all_paginated_without_products_returns_empty_page(self):
+        response = client.get("/api/products?pageSize=3")
+        assert_that(response.json()["results"]).is_equal_to([])
+        assert_that(response.status_code).is_equal_to(200)
+
     def test_get_id_valid_returns_ok(self):
         seeded_data = self.seedFixture("products", "basic-1.json")
         response = client.get(
@@ -237,3 +462,348 @@ class DeleteTests(IntegrationTestBase):
         assert_that(response_1.status_code).is_equal_to(204)
         self.assertJSONErrorResponse(response_2.json())
         assert_that(response_2.status_code).is_equal_to(410)
+
+
+@ddt
+class BulkRetireTests(IntegrationTestBase):
+    def retire(self, body):
+        return client.post(
+            "/api/products/retire", body, content_type="application/json"
+        )
+
+    def test_bulk_retire_retires_every_product(self):
+        self.seedFixture("products", "extreme-5.json")
+        response = self.retire({"ids": [1, 3, 5]})
+        assert_that(response.status_code).is_equal_to(204)
+        assert_that(
+            list(
+                Product.objects.filter(retired=True).values_list(
+                    "id", "version"
+                )
+            )
+        ).contains_only((1, 2), (3, 2), (5, 2))
+
+    def test_bulk_retire_skips_retired_products(self):
+        self.seedFixture("products", "extreme-5.json")
+        self.retire({"ids": [1]})
+        response = self.retire({"ids": [1, 2]})
+        assert_that(response.status_code).is_equal_to(204)
+        assert_that(Product.objects.get(id=1).version).is_equal_to(2)
+        assert_that(Product.objects.get(id=2).retired).is_true()
+
+    def test_bulk_retire_query_count_does_not_grow_with_ids(self):
+        self.seedFixture("products", "extreme-5.json")
+        with CaptureQueriesContext(connection) as one:
+            self.retire({"ids": [1]})
+        with CaptureQueriesContext(connection) as many:
+            self.retire({"ids": [2, 3, 4, 5]})
+        assert_that(len(many)).is_equal_to(len(one))
+
+    def test_bulk_retire_products_in_active_order_returns_bad_request(
+        self,
+    ):
+        self.seedFixture("products", "extreme-5.json")
+        self.create_order_lineItems(
+            {"id": 1, "lineItems": [{"productId": 2, "quantity": 1}]}
+        )
+        response = self.retire({"ids": [1, 2]})
+        self.assertJSONErrorResponse(response.json())
+        assert_that(response.status_code).is_equal_to(400)
+        assert_that(response.json()["errors"]["ids"]).is_equal_to([2])
+        assert_that(Product.objects.filter(retired=True).count()).is_zero()
+
+    def test_bulk_retire_non_existent_ids_returns_not_found(self):
+        self.seedFixture("products", "basic-1.json")
+        response = self.retire({"ids": [1, 7, 8]})
+        self.assertJSONErrorResponse(response.json())
+        assert_that(response.status_code).is_equal_to(404)
+        assert_that(Product.objects.get(id=1).retired).is_false()
+
+    def test_bulk_unretire_restores_products_to_search(self):
+        get_search_backend().invalidate()
+        self.seedFixture("products", "extreme-5.json")
+        self.retire({"ids": [3]})
+        assert_that(
+            client.get("/api/products/search", {"q": "chips"}).json()
+        ).is_empty()
+        response = client.post(
+            "/api/products/unretire",
+            {"ids": [3]},
+            content_type="application/json",
+        )
+        assert_that(response.status_code).is_equal_to(204)
+        assert_that(
+            client.get("/api/products/search", {"q": "chips"}).json()
+        ).extracting("id").is_equal_to([3])
+
+    @data({}, {"ids": []}, {"ids": "1"}, {"ids": [0]}, [1, 2])
+    def test_bulk_retire_invalid_body_returns_bad_request(self, body):
+        response = self.retire(body)
+        self.assertJSONErrorResponse(response.json())
+        assert_that(response.status_code).is_equal_to(400)
+
+
+@ddt
+class SearchTests(IntegrationTestBase):
+    def setUp(self):
+        super().setUp()
+        get_search_backend().invalidate()
+
+    @data(
+        ("chips", [3]),
+        ("chi", [3]),
+        ("LOREM", [4, 3]),
+        ("lorem duis", [3]),
+        ("pizza", []),
+    )
+    @unpack
+    def test_search_returns_ranked_products(self, query, expected_ids):
+        self.seedFixture("products", "extreme-5.json")
+        response = client.get("/api/products/search", {"q": query})
+        assert_that(response.status_code).is_equal_to(200)
+        assert_that(response.json()).extracting("id").is_equal_to(expected_ids)
+
+    def test_search_limit_returns_best_matches(self):
+        self.seedFixture("products", "extreme-5.json")
+        response = client.get(
+            "/api/products/search", {"q": "lorem", "limit": 1}
+        )
+        assert_that(response.json()).extracting("id").is_equal_to([4])
+
+    def test_search_excludes_retired_products(self):
+        self.seedFixture("products", "extreme-5.json")
+        client.get("/api/products/search", {"q": "chips"})
+        client.delete("/api/products/3")
+        response = client.get("/api/products/search", {"q": "chips"})
+        assert_that(response.json()).is_equal_to([])
+
+    def test_search_finds_updated_products(self):
+        seeded_data = self.seedFixture("products", "basic-1.json")
+        client.get("/api/products/search", {"q": "burger"})
+        put_data = self.getFixture("products", "basic-1-update.json")
+        client.put(
+            f"/api/products/{seeded_data['id']}",  # type: ignore[GeneralTypeIssue]
+            put_data,
+            content_type="application/json",
+        )
+        response = client.get("/api/products/search", {"q": put_data["name"]})
+        assert_that(response.json()).extracting("id").is_equal_to(
+            [seeded_data["id"]]  # type: ignore[GeneralTypeIssue]
+        )
+
+    def test_search_refresh_picks_up_queryset_updates(self):
+        self.seedFixture("products", "extreme-5.json")
+        client.get("/api/products/search", {"q": "kabab"})
+        Product.objects.filter(id=5).update(name="Kebab")
+        get_search_backend().refresh([5])
+        response = client.get("/api/products/search", {"q": "kebab"})
+        assert_that(response.json()).extracting("id").is_equal_to([5])
+
+    @data("", "q=", "q=burger&limit=0", "q=burger&limit=101")
+    def test_search_invalid_query_returns_bad_request(self, query):
+        response = client.get(f"/api/products/search?{query}")
+        self.assertJSONErrorResponse(response.json())
+        assert_that(response.status_code).is_equal_to(400)
+
+
+@ddt
+class PriceHistoryTests(IntegrationTestBase):
+    def seed_price_change(self):
+        with freeze_time("2023-01-01T10:00:00Z"):
+            self.seedFixture("products", "basic-1.json")
+        with freeze_time("2023-02-01T10:00:00Z"):
+            client.put(
+                "/api/products/1",
+                self.getFixture("products", "basic-1-update.json"),
+                content_type="application/json",
+            )
+
+    def test_get_price_as_of_returns_price_at_that_time(self):
+        self.seed_price_change()
+        before = client.get("/api/products/1/price?at=2023-01-15T00:00:00Z")
+        after = client.get("/api/products/1/price?at=2023-02-01T10:00:00Z")
+        assert_that(before.json()).is_equal_to(
+            {
+                "productId": 1,
+                "price": 1.2,
+                "validFrom": "2023-01-01T10:00:00.000000Z",
+            }
+        )
+        assert_that(after.json()["price"]).is_equal_to(1.5)
+        assert_that(
+            client.get("/api/products/1/price").json()["price"]
+        ).is_equal_to(1.5)
+
+    def test_update_without_price_change_keeps_history(self):
+        self.seed_price_change()
+        update = self.getFixture("products", "basic-1-update.json")
+        client.put(
+            "/api/products/1",
+            update | {"description": "Another desc"},
+            content_type="application/json",
+        )
+        assert_that(
+            ProductPrice.objects.filter(product_id=1).count()
+        ).is_equal_to(2)
+
+    def test_get_price_before_first_price_returns_not_found(self):
+        self.seed_price_change()
+        response = client.get("/api/products/1/price?at=2022-12-31T00:00:00Z")
+        self.assertJSONErrorResponse(response.json())
+        assert_that(response.status_code).is_equal_to(404)
+
+    def test_get_prices_as_of_is_one_query(self):
+        self.seed_price_change()
+        with freeze_time("2023-01-10T10:00:00Z"):
+            Product.objects.create(id=3, name="Chips", price="2.50")
+        with self.assertNumQueries(1):
+            response = client.get(
+                "/api/products/prices",
+                {"ids": [1, 3, 99], "at": "2023-01-15T00:00:00Z"},
+            )
+        assert_that(response.json()).extracting(
+            "productId", "price"
+        ).is_equal_to([(1, 1.2), (3, 2.5)])
+
+    @data("", "ids=0", "ids=1&at=yesterday")
+    def test_get_prices_invalid_query_returns_bad_request(self, query):
+        response = client.get(f"/api/products/prices?{query}")
+        self.assertJSONErrorResponse(response.json())
+        assert_that(response.status_code).is_equal_to(400)
+
+
+# Runs after the snapshot tests, the imported products get generated ids
+class StreamingImportTests(IntegrationTestBase):
+    def setUp(self):
+        super().setUp()
+        get_search_backend().invalidate()
+
+    def import_products(self, body: str, content_type: str):
+        return client.post(
+            "/api/products/import", body, content_type=content_type
+        )
+
+    def test_import_json_creates_products_with_category_and_tags(self):
+        category = Category.objects.create(
+            **self.getFixture("categories", "basic-1.json")
+        )
+        tag = Tag.objects.create(**self.getFixture("tags", "basic-1.json"))
+        response = self.import_products(
+            json.dumps(
+                [
+                    {
+                        "name": "Cheeseburger",
+                        "description": "With cheese",
+                        "price": "5.50",
+                        "categoryId": category.id,
+                        "tags": [tag.id],
+                    },
+                    {"name": "Fries", "description": "", "price": "2.00"},
+                ]
+            ),
+            "application/json",
+        )
+        assert_that(response.status_code).is_equal_to(200)
+        assert_that(response.json()).is_equal_to(
+            {"created": 2, "updated": 0, "errors": []}
+        )
+        product = client.get(
+            "/api/products/search", {"q": "cheeseburger"}
+        ).json()[0]
+        assert_that(product["category"]["id"]).is_equal_to(category.id)
+        assert_that(product["tags"]).is_equal_to([tag.id])
+
+    def test_import_ndjson_updates_existing_products_by_name(self):
+        self.seedFixture("products", "basic-1.json")
+        version = Product.objects.get(name="Burger").version
+        response = self.import_products(
+            '{"name": "Burger", "description": "Bigger", "price": "9.00"}\n',
+            "application/x-ndjson",
+        )
+        product = Product.objects.get(name="Burger")
+        assert_that(response.json()["updated"]).is_equal_to(1)
+        assert_that(str(product.price)).is_equal_to("9.00")
+        assert_that(product.version).is_equal_to(version + 1)
+        assert_that(
+            [
+                str(price)
+                for price in ProductPrice.objects.filter(
+                    product=product
+                ).values_list("price", flat=True)
+            ]
+        ).contains_only("1.20", "9.00")
+        assert_that(
+            client.get(f"/api/products/{product.id}").json()["description"]
+        ).is_equal_to("Bigger")
+
+    def test_import_csv_reports_invalid_rows(self):
+        response = self.import_products(
+            "name,description,price,categoryId\n"
+            "Nuggets,Six pieces,3.00,\n"
+            "Wrap,Chicken,not-a-price,\n"
+            "Shake,Vanilla,2.50,999\n",
+            "text/csv",
+        )
+        assert_that(response.status_code).is_equal_to(207)
+        assert_that(response.json()["created"]).is_equal_to(1)
+        assert_that(response.json()["errors"]).extracting("row").is_equal_to(
+            [2, 3]
+        )
+        assert_that(response.json()["errors"][1]["errors"]).contains_key(
+            "categoryId"
+        )
+
+    def test_import_query_count_does_not_grow_with_rows(self):
+        tag = Tag.objects.create(**self.getFixture("tags", "basic-1.json"))
+
+        def count_queries(names: list[str]) -> int:
+            body = json.dumps(
+                [
+                    {
+                        "name": name,
+                        "description": "",
+                        "price": "1.00",
+                        "tags": [tag.id],
+                    }
+                    for name in names
+                ]
+            )
+            with CaptureQueriesContext(connection) as context:
+                self.import_products(body, "application/json")
+            return len(context.captured_queries)
+
+        assert_that(
+            count_queries([f"Small {i}" for i in range(2)])
+        ).is_equal_to(count_queries([f"Large {i}" for i in range(40)]))
+
+    def test_import_unsupported_media_type_returns_unsupported(self):
+        response = self.import_products("name\nBurger\n", "text/plain")
+        assert_that(response.status_code).is_equal_to(415)
+
+    def test_import_truncated_json_reports_row_error(self):
+        response = self.import_products('[{"name": "Bur', "application/json")
+        assert_that(response.status_code).is_equal_to(207)
+        assert_that(response.json()).has_created(0).has_updated(0)
+        assert_that(response.json()["errors"]).extracting("row").is_equal_to(
+            [1]
+        )
+
+    @override_settings(PRODUCT_IMPORT_BATCH_SIZE=2)
+    def test_import_malformed_json_keeps_committed_batches(self):
+        records: list[str] = [
+            json.dumps({"name": name, "description": "", "price": "1.00"})
+            for name in ("Burger", "Chips", "Cola")
+        ]
+        response = self.import_products(
+            "[" + ", ".join(records) + ', {"name": nope}, '
+            '{"name": "Shake", "description": "", "price": "2.00"}]',
+            "application/json",
+        )
+        assert_that(response.status_code).is_equal_to(207)
+        assert_that(response.json()).has_created(3).has_updated(0)
+        assert_that(response.json()["errors"]).extracting("row").is_equal_to(
+            [4]
+        )
+        assert_that(
+            list(Product.objects.values_list("name", flat=True))
+        ).contains_only("Burger", "Chips", "Cola")
@@ -0,0 +1,53 @@
+from assertpy import assert_that
+from django.test import Client
+
+from answerking_app.tests.test_integration.IntegrationTestBaseClass import (
+    IntegrationTestBase,
+)
+
+client = Client()
+
+
+class GetSalesReportTests(IntegrationTestBase):
+    def setUp(self):
+        self.preload_products(["basic-3.json"])
+        response = client.post(
+            "/api/orders",
+            self.getFixture("orders", "basic-3.json"),
+            content_type="application/json",
+        )
+        self.order_id = response.json()["id"]
+
+    def test_get_after_order_created_returns_rollups(self):
+        response = client.get("/api/reports/sales?granularity=hour")
+        assert_that(response.status_code).is_equal_to(200)
+        assert_that(response.json()).extracting(
+            "productId", "quantity", "revenue", "lineCount", "orderStatus"
+        ).contains_only(
+            (1, 3, 3.6, 1, "Created"),
+            (2, 2, 3.0, 1, "Created"),
+        )
+
+    def test_get_after_order_cancelled_returns_cancelled_rollups(self):
+        client.delete(f"/api/orders/{self.order_id}")
+        response = client.get("/api/reports/sales?status=Cancelled")
+        assert_that(response.json()).extracting(
+            "productId", "quantity", "granularity"
+        ).contains_only((1, 3, "day"), (2, 2, "day"))
+        created = client.get("/api/reports/sales?status=Created").json()
+        assert_that(created).extracting("quantity").contains_only(0)
+
+    def test_get_after_order_updated_returns_updated_rollups(self):
+        client.put(
+            f"/api/orders/{self.order_id}",
+            self.getFixture("orders", "basic-1-with-products.json"),
+            content_type="application/json",
+        )
+        response = client.get("/api/reports/sales")
+        assert_that(response.json()).extracting(
+            "productId", "quantity", "lineCount"
+        ).contains_only((1, 4, 1), (2, 0, 0))
+
+    def test_get_with_invalid_granularity_returns_bad_request(self):
+        response = client.get("/api/reports/sales?granularity=week")
+        assert_that(response.status_code).is_equal_to(400)
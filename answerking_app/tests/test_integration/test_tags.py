@@ -1,6 +1,8 @@
 from assertpy import assert_that
 from ddt import data, ddt
+from django.db import connection
 from django.test import Client
+from django.test.utils import CaptureQueriesContext
 
 from answerking_app.models.models import Product, Tag
 from answerking_app.tests.test_integration.IntegrationTestBaseClass import (
@@ -40,6 +42,17 @@ class GetTests(IntegrationTestBase):
         self.assertMatchSnapshot(response.json())
         assert_that(response.status_code).is_equal_to(200)
 
+    def test_get_id_after_adding_product_returns_product(self):
+        seeded_data = self.seedFixture("tags", "basic-1.json")
+        tag_url = f"/api/tags/{seeded_data['id']}"  # type: ignore[GeneralTypeIssue]
+        client.get(tag_url)
+        product = Product.objects.create(
+            **self.getFixture("products", "basic-1.json")
+        )
+        Tag.objects.get(pk=seeded_data["id"]).products.add(product)  # type: ignore[GeneralTypeIssue]
+        response = client.get(tag_url)
+        assert_that(response.json()["products"]).is_equal_to([product.id])
+
     def test_get_invalid_id_returns_bad_request(self):
         response = client.get("/api/tags/invalid-id")
         self.assertJSONErrorResponse(response.json())
@@ -278,3 +291,40 @@ class DeleteTests(IntegrationTestBase):
         assert_that(response_1.status_code).is_equal_to(204)
         self.assertJSONErrorResponse(response_2.json())
         assert_that(response_2.status_code).is_equal_to(410)
+
+
+class BulkRetireTests(IntegrationTestBase):
+    def post(self, action: str, ids: list[int]):
+        return client.post(
+            f"/api/tags/{action}",
+            {"ids": ids},
+            content_type="application/json",
+        )
+
+    def test_bulk_retire_and_unretire(self):
+        self.seedFixture("tags", "extreme-3.json")
+        client.get("/api/tags/1")
+        retire_response = self.post("retire", [1, 2])
+        assert_that(retire_response.status_code).is_equal_to(204)
+        assert_that(client.get("/api/tags/1").json()["retired"]).is_true()
+        unretire_response = self.post("unretire", [1, 3])
+        assert_that(unretire_response.status_code).is_equal_to(204)
+        assert_that(
+            list(Tag.objects.filter(retired=True).values_list("id", flat=True))
+        ).is_equal_to([2])
+        assert_that(Tag.objects.get(id=1).version).is_equal_to(3)
+
+    def test_bulk_retire_query_count_does_not_grow_with_ids(self):
+        self.seedFixture("tags", "extreme-3.json")
+        with CaptureQueriesContext(connection) as one:
+            self.post("retire", [1])
+        with CaptureQueriesContext(connection) as many:
+            self.post("retire", [2, 3])
+        assert_that(len(many)).is_equal_to(len(one))
+
+    def test_bulk_retire_non_existent_ids_returns_not_found(self):
+        self.seedFixture("tags", "extreme-3.json")
+        response = self.post("retire", [1, 4])
+        self.assertJSONErrorResponse(response.json())
+        assert_that(response.status_code).is_equal_to(404)
+        assert_that(Tag.objects.get(id=1).retired).is_false()
@@ -0,0 +1,55 @@
+from ddt import data, ddt
+from django.test import override_settings
+
+from answerking_app.models.models import CatalogueVersion
+from answerking_app.tests.test_unit.UnitTestBaseClass import UnitTestBase
+from answerking_app.utils.catalogue_cache import (
+    CachedResponse,
+    LocalCatalogueCache,
+    SharedCatalogueCache,
+)
+
+
+@ddt
+class CatalogueCacheUnitTests(UnitTestBase):
+    path: str = "/api/products?"
+    response = CachedResponse(data=[{"id": 1}], headers={"ETag": '"1"'})
+
+    @data(LocalCatalogueCache, SharedCatalogueCache)
+    def test_get_returns_cached_response(self, cache_class):
+        cache = cache_class()
+        key = cache.make_key(self.path)
+        cache.set(key, self.response)
+        self.assertEqual(cache.get(key), self.response)
+
+    @data(LocalCatalogueCache, SharedCatalogueCache)
+    def test_bump_changes_key(self, cache_class):
+        cache = cache_class()
+        key = cache.make_key(self.path)
+        cache.set(key, self.response)
+        cache.bump()
+        self.assertIsNone(cache.get(cache.make_key(self.path)))
+
+    def test_bump_is_shared_through_database(self):
+        cache = LocalCatalogueCache()
+        version = cache.version()
+        cache.bump()
+        self.assertEqual(CatalogueVersion.objects.get().version, version + 1)
+
+    def test_bump_after_version_lost_changes_key(self):
+        cache = LocalCatalogueCache()
+        key = cache.make_key(self.path)
+        CatalogueVersion.objects.all().delete()
+        cache.bump()
+        self.assertNotEqual(cache.make_key(self.path), key)
+
+    @override_settings(CATALOGUE_CACHE_MAX_ENTRIES=2)
+    def test_local_cache_evicts_least_recently_used(self):
+        cache = LocalCatalogueCache()
+        cache.set("first", self.response)
+        cache.set("second", self.response)
+        cache.get("first")
+        cache.set("third", self.response)
+        self.assertIsNone(cache.get("second"))
+        self.assertEqual(cache.get("first"), self.response)
+        self.assertEqual(cache.get("third"), self.response)
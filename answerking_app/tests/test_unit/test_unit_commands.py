@@ -0,0 +1,230 @@
+import json
+import tempfile
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+
+from django.core.management import call_command
+from django.utils import timezone
+
+from answerking_app.models.models import (
+    ArchivedLineItem,
+    ArchivedOrder,
+    LineItem,
+    Order,
+    Product,
+    SalesRollup,
+)
+from answerking_app.tests.test_unit.UnitTestBaseClass import UnitTestBase
+
+
+class ReconcileOrderTotalsCommandTests(UnitTestBase):
+    def setUp(self):
+        self.seed_data({"margarita_pizza_data.json": "products"})
+        self.product: Product = Product.objects.get(name="Margarita pizza")
+        self.drifted_order: Order = Order.objects.create(
+            order_total=Decimal(99.00)
+        )
+        LineItem.bulk_create_for_order(
+            self.drifted_order, [{"product": self.product, "quantity": 2}]
+        )
+        self.correct_order: Order = Order.objects.create()
+        LineItem.bulk_create_for_order(
+            self.correct_order, [{"product": self.product, "quantity": 1}]
+        )
+        self.correct_order.calculate_total()
+
+    def test_reconcile_fixes_drifted_totals(self):
+        out = StringIO()
+        call_command("reconcileOrderTotals", "--chunk-size=1", stdout=out)
+
+        self.drifted_order.refresh_from_db()
+        self.correct_order.refresh_from_db()
+
+        self.assertEqual(
+            self.drifted_order.order_total, self.product.price * 2
+        )
+        self.assertEqual(self.correct_order.order_total, self.product.price)
+        self.assertIn("Fixed 1 drifted order total(s)", out.getvalue())
+
+    def test_reconcile_dry_run_does_not_write(self):
+        out = StringIO()
+        call_command("reconcileOrderTotals", "--dry-run", stdout=out)
+
+        self.drifted_order.refresh_from_db()
+
+        self.assertEqual(self.drifted_order.order_total, Decimal(99.00))
+        self.assertIn("Found 1 drifted order total(s)", out.getvalue())
+
+
+class ArchiveOrdersCommandTests(UnitTestBase):
+    def setUp(self):
+        self.seed_data({"margarita_pizza_data.json": "products"})
+        self.product: Product = Product.objects.get(name="Margarita pizza")
+        self.old_paid_order: Order = self.create_order(
+            Order.Status.PAID, days_old=100
+        )
+        self.old_created_order: Order = self.create_order(
+            Order.Status.CREATED, days_old=100
+        )
+        self.recent_paid_order: Order = self.create_order(
+            Order.Status.PAID, days_old=1
+        )
+
+    def create_order(self, order_status: str, days_old: int) -> Order:
+        order: Order = Order.objects.create()
+        LineItem.bulk_create_for_order(
+            order, [{"product": self.product, "quantity": 2}]
+        )
+        order.calculate_total()
+        Order.objects.filter(pk=order.pk).update(
+            order_status=order_status,
+            last_updated=timezone.now() - timedelta(days=days_old),
+        )
+        return order
+
+    def test_archive_moves_old_finished_orders(self):
+        out = StringIO()
+        call_command(
+            "archiveOrders", "--chunk-size=1", "--pause=0", stdout=out
+        )
+
+        archived: ArchivedOrder = ArchivedOrder.objects.get()
+
+        self.assertEqual(archived.id, self.old_paid_order.id)
+        self.assertEqual(archived.order_total, self.product.price * 2)
+        self.assertEqual(
+            ArchivedLineItem.objects.get(order=archived).quantity, 2
+        )
+        self.assertFalse(
+            Order.objects.filter(pk=self.old_paid_order.pk).exists()
+        )
+        self.assertFalse(
+            LineItem.objects.filter(order=self.old_paid_order.pk).exists()
+        )
+        self.assertEqual(Order.objects.count(), 2)
+        self.assertIn("Archived 1 archivable order(s)", out.getvalue())
+
+    def test_archive_dry_run_does_not_write(self):
+        out = StringIO()
+        call_command("archiveOrders", "--dry-run", "--pause=0", stdout=out)
+
+        self.assertEqual(Order.objects.count(), 3)
+        self.assertFalse(ArchivedOrder.objects.exists())
+        self.assertIn("Found 1 archivable order(s)", out.getvalue())
+
+
+class RebuildSalesRollupsCommandTests(UnitTestBase):
+    def test_rebuild_matches_line_items(self):
+        self.seed_data({"margarita_pizza_data.json": "products"})
+        product: Product = Product.objects.get(name="Margarita pizza")
+        for quantity in [1, 2]:
+            order: Order = Order.objects.create()
+            LineItem.bulk_create_for_order(
+                order, [{"product": product, "quantity": quantity}]
+            )
+        out = StringIO()
+        call_command("rebuildSalesRollups", stdout=out)
+
+        rollup: SalesRollup = SalesRollup.objects.get(
+            granularity=SalesRollup.Granularity.DAY
+        )
+
+        self.assertEqual(rollup.quantity, 3)
+        self.assertEqual(rollup.revenue, product.price * 3)
+        self.assertEqual(rollup.line_count, 2)
+        self.assertIn("Rebuilt 2 sales rollup(s)", out.getvalue())
+
+
+class ExportOrdersCommandTests(UnitTestBase):
+    def setUp(self):
+        self.seed_data({"margarita_pizza_data.json": "products"})
+        self.product: Product = Product.objects.get(name="Margarita pizza")
+        for quantity in [1, 2, 3]:
+            order: Order = Order.objects.create()
+            LineItem.bulk_create_for_order(
+                order, [{"product": self.product, "quantity": quantity}]
+            )
+
+    def test_export_ndjson_walks_every_chunk(self):
+        out = StringIO()
+        call_command("exportOrders", "--chunk-size=2", stdout=out)
+
+        orders: list[dict] = [
+            json.loads(line) for line in out.getvalue().splitlines()
+        ]
+
+        self.assertEqual(
+            [order["lineItems"][0]["quantity"] for order in orders],
+            [1, 2, 3],
+        )
+
+    def test_export_csv_writes_header_and_line_item_rows(self):
+        out = StringIO()
+        call_command("exportOrders", "--format=csv", stdout=out)
+
+        lines: list[str] = out.getvalue().splitlines()
+
+        self.assertEqual(lines[0].split(",")[0], "orderId")
+        self.assertEqual(len(lines), 4)
+
+
+class ImportProductsCommandTests(UnitTestBase):
+    def setUp(self):
+        self.seed_data({"margarita_pizza_data.json": "products"})
+
+    def import_file(self, suffix: str, body: str, *args: str) -> StringIO:
+        out = StringIO()
+        with tempfile.NamedTemporaryFile("w", suffix=suffix) as file:
+            file.write(body)
+            file.flush()
+            call_command(
+                "importProducts", file.name, *args, stdout=out, stderr=out
+            )
+        return out
+
+    def test_import_csv_creates_and_updates_products_by_name(self):
+        out = self.import_file(
+            ".csv",
+            "name,description,price\n"
+            "Margarita pizza,Tomato and basil,9.99\n"
+            "Hawaiian pizza,,8.50\n",
+            "--batch-size=1",
+        )
+
+        self.assertIn("Created 1 and updated 1 product(s)", out.getvalue())
+        self.assertEqual(
+            Product.objects.get(name="Margarita pizza").price, Decimal("9.99")
+        )
+        self.assertTrue(Product.objects.filter(name="Hawaiian pizza").exists())
+
+    def test_import_json_reports_rejected_rows(self):
+        out = self.import_file(
+            ".json",
+            json.dumps(
+                [
+                    {"name": "Calzone", "description": "", "price": "7.00"},
+                    {"name": "Calzone", "description": "", "price": "7.50"},
+                    {"name": "Garlic bread", "price": "-1"},
+                ]
+            ),
+        )
+
+        self.assertIn("Row 2:", out.getvalue())
+        self.assertIn("Row 3:", out.getvalue())
+        self.assertIn("2 row(s) rejected", out.getvalue())
+        self.assertEqual(
+            Product.objects.get(name="Calzone").price, Decimal("7.00")
+        )
+
+    def test_import_malformed_json_keeps_rows_before_it(self):
+        out = self.import_file(
+            ".json",
+            '[{"name": "Calzone", "description": "", "price": "7.00"}, '
+            '{"name": nope}]',
+            "--batch-size=1",
+        )
+
+        self.assertIn("Row 2:", out.getvalue())
+        self.assertIn("Created 1 and updated 0 product(s)", out.getvalue())
+        self.assertTrue(Product.objects.filter(name="Calzone").exists())
@@ -0,0 +1,115 @@
+import tempfile
+from datetime import timedelta
+from unittest import mock
+
+from ddt import data, ddt
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from django.test import override_settings
+from django.utils import timezone
+
+from answerking_app.tests.test_unit.UnitTestBaseClass import UnitTestBase
+from answerking_app.utils.idempotency import (
+    CacheIdempotencyStore,
+    DatabaseIdempotencyStore,
+    IdempotencyStore,
+    StoredResponse,
+)
+from answerking_app.utils.mixins.ApiExceptions import ProblemDetails
+
+
+# A cache every worker shares, the cache store refuses LocMemCache
+SHARED_CACHES: dict = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    "shared": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": tempfile.mkdtemp(),
+    },
+}
+
+
+@ddt
+@override_settings(
+    IDEMPOTENCY_LOCK_TIMEOUT=0,
+    IDEMPOTENCY_LOCK_LEASE=30,
+    CACHES=SHARED_CACHES,
+    IDEMPOTENCY_CACHE_ALIAS="shared",
+)
+class IdempotencyStoreUnitTests(UnitTestBase):
+    key: str = "till-1-order-1"
+    scope: str = "POST /api/orders"
+    response = StoredResponse(status_code=201, body='{"id": 1}')
+
+    def setUp(self):
+        caches["shared"].clear()
+
+    @data(DatabaseIdempotencyStore, CacheIdempotencyStore)
+    def test_begin_new_key_acquires_lock(self, store_class):
+        store = store_class()
+        self.assertIsNone(store.begin(self.key, self.scope, "hash"))
+        store.release(self.key, self.scope)
+
+    @data(DatabaseIdempotencyStore, CacheIdempotencyStore)
+    def test_begin_completed_key_returns_stored_response(self, store_class):
+        store = store_class()
+        store.begin(self.key, self.scope, "hash")
+        store.save(self.key, self.scope, self.response)
+        self.assertEqual(
+            store.begin(self.key, self.scope, "hash"), self.response
+        )
+        store.release(self.key, self.scope)
+
+    @data(DatabaseIdempotencyStore, CacheIdempotencyStore)
+    def test_begin_key_in_progress_conflicts(self, store_class):
+        store = store_class()
+        store.begin(self.key, self.scope, "hash")
+        with self.assertRaises(ProblemDetails) as context:
+            store.begin(self.key, self.scope, "hash")
+        self.assertEqual(context.exception.status_code, 409)
+        store.release(self.key, self.scope)
+
+    @data(DatabaseIdempotencyStore, CacheIdempotencyStore)
+    def test_begin_key_with_different_request_fails(self, store_class):
+        store = store_class()
+        store.begin(self.key, self.scope, "hash")
+        store.save(self.key, self.scope, self.response)
+        with self.assertRaises(ProblemDetails) as context:
+            store.begin(self.key, self.scope, "other-hash")
+        self.assertEqual(context.exception.status_code, 422)
+        store.release(self.key, self.scope)
+
+    @data(DatabaseIdempotencyStore, CacheIdempotencyStore)
+    def test_release_frees_key(self, store_class):
+        store = store_class()
+        store.begin(self.key, self.scope, "hash")
+        store.release(self.key, self.scope)
+        self.assertIsNone(store.begin(self.key, self.scope, "other-hash"))
+        store.release(self.key, self.scope)
+
+    def test_begin_key_with_expired_lock_takes_it_over(self):
+        store = DatabaseIdempotencyStore()
+        store.begin(self.key, self.scope, "hash")
+        later = timezone.now() + timedelta(seconds=30)
+        with mock.patch("django.utils.timezone.now", return_value=later):
+            self.assertIsNone(store.begin(self.key, self.scope, "hash"))
+        store.release(self.key, self.scope)
+
+    def test_cache_begin_key_with_expired_lock_takes_it_over(self):
+        store = CacheIdempotencyStore()
+        store.begin(self.key, self.scope, "hash")
+        store.cache.delete(f"{store.make_key(self.key, self.scope)}:lock")
+        self.assertIsNone(store.begin(self.key, self.scope, "hash"))
+        store.release(self.key, self.scope)
+
+    @override_settings(IDEMPOTENCY_CACHE_ALIAS="default")
+    def test_cache_store_refuses_per_process_cache(self):
+        with self.assertRaises(ImproperlyConfigured):
+            CacheIdempotencyStore()
+
+    def test_incomplete_store_cannot_be_created(self):
+        class PartialStore(IdempotencyStore):
+            def acquire(self, key, scope, request_hash):
+                return None
+
+        with self.assertRaises(TypeError):
+            PartialStore()  # type: ignore[reportGeneralTypeIssues]
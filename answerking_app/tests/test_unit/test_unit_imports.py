@@ -0,0 +1,139 @@
+from decimal import Decimal
+from unittest import mock
+
+from ddt import data, ddt
+from django.db.models import QuerySet
+from rest_framework.exceptions import ParseError
+
+from answerking_app.models.models import Product
+from answerking_app.tests.test_unit.UnitTestBaseClass import UnitTestBase
+from answerking_app.utils.imports import (
+    import_products,
+    iter_csv_records,
+    iter_json_records,
+)
+
+
+def split_into_chunks(text: str, size: int) -> list[str]:
+    chunks: list[str] = []
+    for start in range(0, len(text), size):
+        end: int = start + size
+        chunks.append(text[start:end])
+    return chunks
+
+
+@ddt
+class ImportParserUnitTests(UnitTestBase):
+    records: list[dict] = [
+        {"name": "Burger", "description": "Beef, {bun}", "price": "5.00"},
+        {"name": "Chips", "description": "Salted", "price": "1.50"},
+    ]
+
+    @data(
+        '[{"name": "Burger", "description": "Beef, {bun}", "price": "5.00"},'
+        ' {"name": "Chips", "description": "Salted", "price": "1.50"}]',
+        '{"name": "Burger", "description": "Beef, {bun}", "price": "5.00"}\n'
+        '{"name": "Chips", "description": "Salted", "price": "1.50"}\n',
+    )
+    def test_json_records_split_across_chunks(self, body):
+        for size in (1, 7, len(body)):
+            self.assertEqual(
+                list(iter_json_records(split_into_chunks(body, size))),
+                self.records,
+            )
+
+    def test_json_records_truncated_raises_parse_error(self):
+        with self.assertRaises(ParseError):
+            list(iter_json_records(['[{"name": "Burger"}, {"name": ']))
+
+    @data(
+        '[[{"name": "Burger"}]]',
+        '{"name": "Burger"}]{"name": "Chips"}',
+        '[{"name": "Burger"},,{"name": "Chips"}]',
+        '[{"name": "Burger"},]',
+        '[{"name": "Burger"} {"name": "Chips"}]',
+        '{"name": "Burger"},{"name": "Chips"}',
+        '[{"name": "Burger"}] {"name": "Chips"}',
+    )
+    def test_json_records_malformed_raises_parse_error(self, body):
+        for size in (1, len(body)):
+            with self.assertRaises(ParseError):
+                list(iter_json_records(split_into_chunks(body, size)))
+
+    def test_json_records_malformed_record_stops_reading(self):
+        def chunks():
+            yield '[{"name": "Burger"}, {"name": nope}, '
+            raise AssertionError("read past the malformed record")
+
+        records = iter_json_records(chunks())
+        self.assertEqual(next(records), {"name": "Burger"})
+        with self.assertRaises(ParseError):
+            next(records)
+
+    @mock.patch("answerking_app.utils.imports.MAX_RECORD_SIZE", 32)
+    def test_json_records_longer_than_limit_raise_parse_error(self):
+        def chunks():
+            yield '[{"name": "Burger"}, {"description": "'
+            while True:
+                yield "x" * 8
+
+        records = iter_json_records(chunks())
+        self.assertEqual(next(records), {"name": "Burger"})
+        with self.assertRaises(ParseError):
+            next(records)
+
+    def test_csv_records_split_tags_and_drop_empty_values(self):
+        body = (
+            "name,description,price,categoryId,tags\n"
+            'Burger,"Beef, bun",5.00,1,1;2\n'
+            "Chips,,1.50,,\n"
+        )
+        self.assertEqual(
+            list(iter_csv_records(split_into_chunks(body, 5))),
+            [
+                {
+                    "name": "Burger",
+                    "description": "Beef, bun",
+                    "price": "5.00",
+                    "categoryId": "1",
+                    "tags": ["1", "2"],
+                },
+                {
+                    "name": "Chips",
+                    "description": "",
+                    "price": "1.50",
+                    "tags": [],
+                },
+            ],
+        )
+
+
+class ImportWriteUnitTests(UnitTestBase):
+    def test_import_updates_product_created_after_names_were_read(self):
+        Product.objects.create(
+            name="Burger", description="", price=Decimal("1.00")
+        )
+        in_bulk = QuerySet.in_bulk
+        product_reads: list[QuerySet] = []
+
+        def stale_in_bulk(queryset: QuerySet, *args, **kwargs) -> dict:
+            if queryset.model is Product:
+                product_reads.append(queryset)
+                # The first read misses the row another request created
+                if len(product_reads) == 1:
+                    return {}
+            return in_bulk(queryset, *args, **kwargs)
+
+        with mock.patch.object(
+            QuerySet, "in_bulk", autospec=True, side_effect=stale_in_bulk
+        ):
+            result = import_products(
+                [{"name": "Burger", "description": "Bigger", "price": "9.00"}],
+                batch_size=10,
+            )
+        self.assertEqual(
+            (result.created, result.updated, result.errors), (0, 1, [])
+        )
+        product = Product.objects.get(name="Burger")
+        self.assertEqual(product.description, "Bigger")
+        self.assertEqual(product.version, 2)
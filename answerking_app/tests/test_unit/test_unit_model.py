@@ -1,6 +1,16 @@
 from decimal import Decimal
 
-from answerking_app.models.models import Order, Product, LineItem
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from answerking_app.models.models import (
+    LineItem,
+    LineItemChange,
+    Order,
+    Product,
+    SalesRollup,
+    VersionConflict,
+)
 from answerking_app.tests.test_unit.UnitTestBaseClass import UnitTestBase
 
 
@@ -79,3 +89,200 @@ class ModelTests(UnitTestBase):
         self.assertEqual(calculated_sub_tot, expected_sub_tot)
         self.assertEqual(test_order_line_1.product.id, prod.id)
         self.assertEqual(test_order_line_1.quantity, quant)
+
+    def test_bulk_create_for_order(self):
+        to_seed = {
+            "margarita_pizza_data.json": "products",
+            "pepperoni_pizza_data.json": "products",
+        }
+        self.seed_data(to_seed)
+        prod_1 = Product.objects.get(name="Margarita pizza")
+        prod_2 = Product.objects.get(name="Pepperoni pizza")
+        test_order: Order = Order.objects.create()
+
+        with CaptureQueriesContext(connection) as queries:
+            LineItem.bulk_create_for_order(
+                test_order,
+                [
+                    {"product": prod_1, "quantity": 2},
+                    {"product": prod_2, "quantity": 3},
+                ],
+            )
+
+        line_items = LineItem.objects.filter(order=test_order).order_by(
+            "product_id"
+        )
+        expected_sub_totals: list[Decimal] = [
+            prod_1.price * 2,
+            prod_2.price * 3,
+        ]
+        actual_sub_totals: list[Decimal] = [
+            line_item.sub_total for line_item in line_items
+        ]
+
+        insert_queries: list[dict] = [
+            query
+            for query in queries.captured_queries
+            if query["sql"].startswith("INSERT")
+        ]
+
+        self.assertEqual(len(insert_queries), 1)
+        self.assertEqual(line_items.count(), 2)
+        self.assertEqual(actual_sub_totals, expected_sub_totals)
+
+    def test_apply_total_delta(self):
+        test_order: Order = Order.objects.create(order_total=Decimal(10.00))
+        test_order.apply_total_delta(Decimal(2.50))
+
+        calculated_tot: Decimal = test_order.order_total
+        expected_tot: Decimal = Decimal(12.50)
+
+        self.assertEqual(calculated_tot, expected_tot)
+        self.assertEqual(
+            Order.objects.get(pk=test_order.pk).order_total, expected_tot
+        )
+
+    def test_apply_total_delta_with_stale_version_raises_conflict(self):
+        test_order: Order = Order.objects.create(order_total=Decimal(10.00))
+        Order.objects.filter(pk=test_order.pk).update(version=2)
+
+        with self.assertRaises(VersionConflict):
+            test_order.apply_total_delta(Decimal(2.50), expected_version=1)
+
+        self.assertEqual(
+            Order.objects.get(pk=test_order.pk).order_total, Decimal(10.00)
+        )
+
+    def test_save_increments_version(self):
+        test_prod: Product = Product.objects.create(
+            **self.get_fixture("products", "plain_burger_data.json")
+        )
+        test_prod.price = Decimal(2.00)
+        test_prod.save()
+
+        self.assertEqual(test_prod.version, 2)
+        self.assertEqual(Product.objects.get(pk=test_prod.pk).version, 2)
+
+    def test_save_with_stale_version_raises_conflict(self):
+        test_prod: Product = Product.objects.create(
+            **self.get_fixture("products", "plain_burger_data.json")
+        )
+        stale_prod: Product = Product.objects.get(pk=test_prod.pk)
+        test_prod.name = "First writer"
+        test_prod.save()
+        stale_prod.name = "Second writer"
+
+        with self.assertRaises(VersionConflict):
+            stale_prod.save()
+
+        self.assertEqual(
+            Product.objects.get(pk=test_prod.pk).name, "First writer"
+        )
+
+    def test_sync_for_order_only_writes_changed_line_items(self):
+        to_seed = {
+            "margarita_pizza_data.json": "products",
+            "pepperoni_pizza_data.json": "products",
+            "plain_burger_data.json": "products",
+        }
+        self.seed_data(to_seed)
+        prod_1 = Product.objects.get(name="Margarita pizza")
+        prod_2 = Product.objects.get(name="Pepperoni pizza")
+        prod_3 = Product.objects.get(name="Plain Burger")
+        test_order: Order = Order.objects.create()
+        LineItem.bulk_create_for_order(
+            test_order,
+            [
+                {"product": prod_1, "quantity": 1},
+                {"product": prod_2, "quantity": 1},
+            ],
+        )
+        unchanged_line_id: int = LineItem.objects.get(
+            order=test_order, product=prod_1
+        ).id
+
+        with CaptureQueriesContext(connection) as queries:
+            changes: list[LineItemChange] = LineItem.sync_for_order(
+                test_order,
+                [
+                    {"product": prod_1, "quantity": 1},
+                    {"product": prod_3, "quantity": 2},
+                ],
+            )
+
+        write_queries: list[str] = [
+            query["sql"].split(" ")[0]
+            for query in queries.captured_queries
+            if query["sql"].startswith(("INSERT", "UPDATE", "DELETE"))
+        ]
+        expected_delta: Decimal = prod_3.price * 2 - prod_2.price
+
+        self.assertEqual(sorted(write_queries), ["DELETE", "INSERT"])
+        self.assertEqual(
+            sum(change.sub_total for change in changes), expected_delta
+        )
+        self.assertEqual(
+            sorted(change.line_count for change in changes), [-1, 1]
+        )
+        self.assertEqual(
+            LineItem.objects.get(order=test_order, product=prod_1).id,
+            unchanged_line_id,
+        )
+        self.assertFalse(
+            LineItem.objects.filter(order=test_order, product=prod_2).exists()
+        )
+        self.assertEqual(
+            LineItem.objects.get(order=test_order, product=prod_3).quantity, 2
+        )
+
+    def test_sync_for_order_keeps_sold_price_of_existing_line_items(self):
+        self.seed_data({"margarita_pizza_data.json": "products"})
+        prod: Product = Product.objects.get(name="Margarita pizza")
+        sold_price: Decimal = prod.price
+        test_order: Order = Order.objects.create()
+        LineItem.bulk_create_for_order(
+            test_order, [{"product": prod, "quantity": 1}]
+        )
+        prod.price = sold_price + 1
+        prod.save()
+
+        LineItem.sync_for_order(test_order, [{"product": prod, "quantity": 3}])
+        line_item: LineItem = LineItem.objects.get(order=test_order)
+
+        self.assertEqual(line_item.unit_price, sold_price)
+        self.assertEqual(line_item.sub_total, sold_price * 3)
+
+    def test_sales_rollup_record_sums_changes_per_period(self):
+        self.seed_data({"margarita_pizza_data.json": "products"})
+        prod: Product = Product.objects.get(name="Margarita pizza")
+        test_order: Order = Order.objects.create()
+        line_items: list[LineItem] = LineItem.bulk_create_for_order(
+            test_order, [{"product": prod, "quantity": 2}]
+        )
+        change: LineItemChange = LineItemChange.added(line_items[0])
+
+        with CaptureQueriesContext(connection) as queries:
+            SalesRollup.record(
+                [
+                    (test_order, "Created", change),
+                    (test_order, "Created", change),
+                ]
+            )
+        SalesRollup.record([(test_order, "Created", change)])
+
+        write_queries: list[str] = [
+            query["sql"].split(" ")[0]
+            for query in queries.captured_queries
+            if query["sql"].startswith(("INSERT", "UPDATE"))
+        ]
+        rollups = SalesRollup.objects.filter(product=prod)
+
+        self.assertEqual(sorted(write_queries), ["INSERT", "UPDATE"])
+        self.assertEqual(
+            sorted(rollups.values_list("granularity", flat=True)),
+            ["day", "hour"],
+        )
+        for rollup in rollups:
+            self.assertEqual(rollup.quantity, 6)
+            self.assertEqual(rollup.revenue, prod.price * 6)
+            self.assertEqual(rollup.line_count, 3)
@@ -4,10 +4,20 @@ from unittest import mock
 from ddt import data, ddt
 from rest_framework.request import Request
 
-from answerking_app.models.models import Category, Product, Tag
+from answerking_app.models.models import (
+    Category,
+    LineItem,
+    Order,
+    Product,
+    Tag,
+)
 from answerking_app.tests.test_unit.UnitTestBaseClass import UnitTestBase
 from answerking_app.utils.mixins.ApiExceptions import ProblemDetails
-from answerking_app.utils.mixins.RetireMixin import RetireMixin
+from answerking_app.utils.mixins.RetireMixin import (
+    RetireMixin,
+    product_active_order_check,
+    products_in_active_orders,
+)
 
 
 @ddt
@@ -44,3 +54,37 @@ class RetireMixinUnitTests(UnitTestBase):
             with mock.patch("builtins.super") as super_obj:
                 RetireMixin().update(Request)
                 super_obj.assert_called()
+
+    def seed_orders(self, product: Product, statuses: list[str]):
+        for order_id, order_status in enumerate(statuses, start=1):
+            order = Order.objects.create(
+                id=order_id, order_status=order_status
+            )
+            LineItem.for_product(order, product, 1).save()
+
+    def test_active_order_check_is_one_query(self):
+        product = self.seed_data_and_get_models(self.product_data)[0]
+        self.seed_orders(product, [Order.Status.PAID] * 5)
+        with self.assertNumQueries(1):
+            product_active_order_check(product)  # type: ignore[reportGeneralTypeIssues]
+
+    def test_active_order_check_product_in_created_order(self):
+        product = self.seed_data_and_get_models(self.product_data)[0]
+        self.seed_orders(product, [Order.Status.PAID, Order.Status.CREATED])
+        with self.assertRaises(ProblemDetails) as context:
+            product_active_order_check(product)  # type: ignore[reportGeneralTypeIssues]
+        self.assertEqual(context.exception.status_code, 400)
+
+    def test_products_in_active_orders(self):
+        products = self.seed_data_and_get_models(
+            {
+                "margarita_pizza_data.json": "products",
+                "pepperoni_pizza_data.json": "products",
+            }
+        )
+        self.seed_orders(products[1], [Order.Status.CREATED] * 2)  # type: ignore[reportGeneralTypeIssues]
+        with self.assertNumQueries(1):
+            self.assertEqual(
+                products_in_active_orders([p.id for p in products]),
+                [products[1].id],
+            )
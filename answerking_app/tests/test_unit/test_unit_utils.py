@@ -11,7 +11,7 @@ from rest_framework.exceptions import ParseError
 from rest_framework.response import Response
 from rest_framework.serializers import ValidationError
 
-from answerking_app.models.models import Product
+from answerking_app.models.models import Product, VersionConflict
 from answerking_app.tests.test_unit.UnitTestBaseClass import UnitTestBase
 from answerking_app.utils.exceptions_handler import wrapper
 from answerking_app.utils.json404_middleware_config import json404_response
@@ -146,6 +146,19 @@ class UtilsTests(UnitTestBase):
             actual_data["status"], status.HTTP_500_INTERNAL_SERVER_ERROR
         )
 
+    def test_exception_handler_correct_exception_info_version_conflict(self):
+        exc: VersionConflict = VersionConflict()
+        context: MagicMock = MagicMock()
+        context.request = "get"
+
+        response: Response = wrapper(exc, context)
+        actual_data: dict = response.data
+
+        self.assertEqual(
+            actual_data["status"], status.HTTP_412_PRECONDITION_FAILED
+        )
+        self.assertEqual(actual_data["title"], "Precondition failed")
+
     def test_json404_response(self):
         request: Mock = Mock()
         request.scheme = "https"
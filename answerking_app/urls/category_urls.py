@@ -10,6 +10,16 @@ urlpatterns: list[partial] = [
         category_views.CategoryListView.as_view(),
         name="category_list",
     ),
+    path(
+        "categories/retire",
+        category_views.CategoryRetireView.as_view(),
+        name="category_retire",
+    ),
+    path(
+        "categories/unretire",
+        category_views.CategoryUnretireView.as_view(),
+        name="category_unretire",
+    ),
     path(
         "categories/<pk>",
         category_views.CategoryDetailView.as_view(),
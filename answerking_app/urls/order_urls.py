@@ -6,9 +6,24 @@ from answerking_app.views import order_views
 
 urlpatterns: list[partial] = [
     path("orders", order_views.OrderListView.as_view(), name="order_list"),
+    path(
+        "orders/batch",
+        order_views.OrderBatchView.as_view(),
+        name="order_batch",
+    ),
+    path(
+        "orders/export",
+        order_views.OrderExportView.as_view(),
+        name="order_export",
+    ),
     path(
         "orders/<pk>",
         order_views.OrderDetailView.as_view(),
         name="order_detail",
     ),
+    path(
+        "orders/<pk>/lineItems/<productId>",
+        order_views.OrderLineItemView.as_view(),
+        name="order_line_item",
+    ),
 ]
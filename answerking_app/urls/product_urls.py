@@ -10,9 +10,39 @@ urlpatterns: list[partial] = [
         product_views.ProductListView.as_view(),
         name="product_list",
     ),
+    path(
+        "products/import",
+        product_views.ProductImportView.as_view(),
+        name="product_import",
+    ),
+    path(
+        "products/prices",
+        product_views.ProductPricesView.as_view(),
+        name="product_prices",
+    ),
+    path(
+        "products/retire",
+        product_views.ProductRetireView.as_view(),
+        name="product_retire",
+    ),
+    path(
+        "products/unretire",
+        product_views.ProductUnretireView.as_view(),
+        name="product_unretire",
+    ),
+    path(
+        "products/search",
+        product_views.ProductSearchView.as_view(),
+        name="product_search",
+    ),
     path(
         "products/<pk>",
         product_views.ProductDetailView.as_view(),
         name="product_detail",
     ),
+    path(
+        "products/<pk>/price",
+        product_views.ProductPriceView.as_view(),
+        name="product_price",
+    ),
 ]
@@ -0,0 +1,13 @@
+from functools import partial
+
+from django.urls import path
+
+from answerking_app.views import report_views
+
+urlpatterns: list[partial] = [
+    path(
+        "reports/sales",
+        report_views.SalesReportView.as_view(),
+        name="sales_report",
+    ),
+]
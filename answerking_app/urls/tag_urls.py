@@ -10,6 +10,16 @@ urlpatterns: list[partial] = [
         tag_views.TagListView.as_view(),
         name="tag_list",
     ),
+    path(
+        "tags/retire",
+        tag_views.TagRetireView.as_view(),
+        name="tag_retire",
+    ),
+    path(
+        "tags/unretire",
+        tag_views.TagUnretireView.as_view(),
+        name="tag_unretire",
+    ),
     path(
         "tags/<pk>",
         tag_views.TagDetailView.as_view(),
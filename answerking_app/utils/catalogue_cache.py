@@ -0,0 +1,86 @@
+import hashlib
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import cache
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.module_loading import import_string
+
+from answerking_app.models.models import CatalogueVersion
+
+
+@dataclass
+class CachedResponse:
+    data: object
+    headers: dict[str, str]
+
+
+class CatalogueCache(ABC):
+    """Caches catalogue GET responses under the current catalogue version.
+
+    Any product, category or tag change bumps the version, so entries cached
+    for an older version are never read again and are evicted in LRU order.
+    The version is a database row, so a bump made by one process is seen by
+    all of them whatever cache holds the entries.
+    """
+
+    def version(self) -> int:
+        return CatalogueVersion.current()
+
+    def bump(self):
+        CatalogueVersion.bump()
+
+    def make_key(self, path: str) -> str:
+        digest: str = hashlib.sha256(path.encode()).hexdigest()
+        return f"catalogue:{self.version()}:{digest}"
+
+    @abstractmethod
+    def get(self, key: str) -> CachedResponse | None:
+        ...
+
+    @abstractmethod
+    def set(self, key: str, response: CachedResponse):
+        ...
+
+
+class LocalCatalogueCache(CatalogueCache):
+    def __init__(self):
+        self.max_entries: int = settings.CATALOGUE_CACHE_MAX_ENTRIES
+        self.lock = threading.Lock()
+        self.entries: OrderedDict[str, CachedResponse] = OrderedDict()
+
+    def get(self, key: str) -> CachedResponse | None:
+        with self.lock:
+            response: CachedResponse | None = self.entries.get(key)
+            if response is not None:
+                self.entries.move_to_end(key)
+            return response
+
+    def set(self, key: str, response: CachedResponse):
+        with self.lock:
+            self.entries[key] = response
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+
+class SharedCatalogueCache(CatalogueCache):
+    # Eviction is left to the cache backend, which should be configured
+    # for LRU (memcached, Redis with allkeys-lru, LocMemCache)
+    def __init__(self):
+        self.cache = caches[settings.CATALOGUE_CACHE_ALIAS]
+        self.ttl: int = settings.CATALOGUE_CACHE_TTL
+
+    def get(self, key: str) -> CachedResponse | None:
+        return self.cache.get(key)
+
+    def set(self, key: str, response: CachedResponse):
+        self.cache.set(key, response, timeout=self.ttl)
+
+
+@cache
+def get_catalogue_cache() -> CatalogueCache:
+    return import_string(settings.CATALOGUE_CACHE)()
@@ -7,6 +7,7 @@ from rest_framework import status
 from rest_framework.exceptions import ParseError
 from rest_framework.serializers import ValidationError
 
+from answerking_app.models.models import VersionConflict
 from answerking_app.utils.mixins.ApiExceptions import ProblemDetails
 
 
@@ -38,6 +39,12 @@ def wrapper(exc, context):
             title="Invalid input json.",
             extensions={"errors": exc.detail},
         )
+    elif isinstance(exc, VersionConflict):
+        exc = ProblemDetails(
+            status=status.HTTP_412_PRECONDITION_FAILED,
+            detail="The resource has been modified by another request",
+            title="Precondition failed",
+        )
     elif isinstance(exc, IntegrityError):
         if exc.args[0] == DUP_ENTRY:
             exc = ProblemDetails(
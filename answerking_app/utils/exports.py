@@ -0,0 +1,82 @@
+from collections.abc import Iterator
+
+from django.db.models import Model, QuerySet
+from rest_framework import serializers
+
+from answerking_app.models.models import LineItem, Order
+from answerking_app.models.serializers import OrderSerializer
+from answerking_app.utils.renderers import CSVRenderer, NDJSONRenderer
+
+ORDER_LINE_FIELDS: list[str] = [
+    "orderId",
+    "createdOn",
+    "lastUpdated",
+    "orderStatus",
+    "orderTotal",
+    "productId",
+    "productName",
+    "quantity",
+    "subTotal",
+]
+
+
+def iter_in_chunks(queryset: QuerySet, chunk_size: int) -> Iterator[Model]:
+    # A keyset walk rather than QuerySet.iterator(): mysqlclient buffers
+    # the whole result set client side, so only bounded chunks keep
+    # memory flat. Prefetches run once per chunk.
+    last_pk = 0
+    while True:
+        chunk: list[Model] = list(
+            queryset.filter(pk__gt=last_pk).order_by("pk")[:chunk_size]
+        )
+        if not chunk:
+            return
+        yield from chunk
+        last_pk = chunk[-1].pk
+
+
+def iter_orders(queryset: QuerySet[Order], chunk_size: int) -> Iterator[Order]:
+    return iter_in_chunks(  # type: ignore[reportGeneralTypeIssues]
+        queryset.prefetch_related("lineitem_set"),
+        chunk_size,
+    )
+
+
+def order_records(orders: Iterator[Order]) -> Iterator[dict]:
+    for order in orders:
+        yield OrderSerializer(order).data
+
+
+def order_line_rows(orders: Iterator[Order]) -> Iterator[dict]:
+    """One row per line item, or one row without product for empty orders"""
+    date_field = serializers.DateTimeField()
+    for order in orders:
+        order_row: dict = {
+            "orderId": order.id,
+            "createdOn": date_field.to_representation(order.created_on),
+            "lastUpdated": date_field.to_representation(order.last_updated),
+            "orderStatus": order.order_status,
+            "orderTotal": order.order_total,
+        }
+        line_items: list[LineItem] = list(order.lineitem_set.all())  # type: ignore[reportGeneralTypeIssues]
+        if not line_items:
+            yield order_row
+        for line_item in line_items:
+            yield {
+                **order_row,
+                "productId": line_item.product_id,  # type: ignore[reportGeneralTypeIssues]
+                "productName": line_item.product_name,
+                "quantity": line_item.quantity,
+                "subTotal": line_item.sub_total,
+            }
+
+
+def stream_orders(
+    queryset: QuerySet[Order],
+    renderer: CSVRenderer | NDJSONRenderer,
+    chunk_size: int,
+) -> Iterator[bytes]:
+    orders: Iterator[Order] = iter_orders(queryset, chunk_size)
+    if isinstance(renderer, CSVRenderer):
+        return renderer.stream(order_line_rows(orders), ORDER_LINE_FIELDS)
+    return renderer.stream(order_records(orders))
@@ -0,0 +1,204 @@
+from django.db.models import QuerySet
+from django.utils import timezone
+from rest_framework import serializers
+from rest_framework.filters import BaseFilterBackend, OrderingFilter
+from rest_framework.request import Request
+
+from answerking_app.models.models import Order, Product, SalesRollup
+
+
+class OrderFilterSerializer(serializers.Serializer):
+    status = serializers.ChoiceField(
+        choices=Order.Status.choices, required=False
+    )
+    createdFrom = serializers.DateTimeField(required=False)
+    createdTo = serializers.DateTimeField(required=False)
+    updatedFrom = serializers.DateTimeField(required=False)
+    updatedTo = serializers.DateTimeField(required=False)
+    totalMin = serializers.DecimalField(
+        max_digits=18, decimal_places=2, required=False
+    )
+    totalMax = serializers.DecimalField(
+        max_digits=18, decimal_places=2, required=False
+    )
+
+
+class ProductFilterSerializer(serializers.Serializer):
+    categoryId = serializers.IntegerField(required=False, min_value=1)
+    tagId = serializers.IntegerField(required=False, min_value=1)
+    # Without a None default DRF reads a missing boolean as False
+    retired = serializers.BooleanField(
+        required=False, allow_null=True, default=None
+    )
+    priceMin = serializers.DecimalField(
+        max_digits=18, decimal_places=2, required=False
+    )
+    priceMax = serializers.DecimalField(
+        max_digits=18, decimal_places=2, required=False
+    )
+
+
+class CategoryProductFilterSerializer(serializers.Serializer):
+    retired = serializers.BooleanField(
+        required=False, allow_null=True, default=None
+    )
+
+
+class ProductSearchSerializer(serializers.Serializer):
+    q = serializers.CharField(min_length=1, max_length=100)
+    limit = serializers.IntegerField(min_value=1, max_value=100, default=20)
+
+
+class PriceAsOfSerializer(serializers.Serializer):
+    at = serializers.DateTimeField(default=timezone.now)
+
+
+class ProductPricesSerializer(PriceAsOfSerializer):
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=100,
+    )
+
+
+class SalesReportFilterSerializer(serializers.Serializer):
+    granularity = serializers.ChoiceField(
+        choices=SalesRollup.Granularity.choices,
+        default=SalesRollup.Granularity.DAY,
+    )
+    periodFrom = serializers.DateTimeField(required=False)
+    periodTo = serializers.DateTimeField(required=False)
+    productId = serializers.IntegerField(required=False, min_value=1)
+    status = serializers.ChoiceField(
+        choices=Order.Status.choices, required=False
+    )
+
+
+class QueryParameterFilter(BaseFilterBackend):
+    filter_serializer_class: type[serializers.Serializer]
+    # Only parameters listed here are applied, each maps to a lookup
+    # served by an index declared on the model.
+    lookups: dict[str, str]
+
+    def filter_queryset(
+        self, request: Request, queryset: QuerySet, view
+    ) -> QuerySet:
+        serializer = self.filter_serializer_class(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        return queryset.filter(
+            **{
+                self.lookups[param]: value
+                for param, value in serializer.validated_data.items()  # type: ignore[reportGeneralTypeIssues]
+                if value is not None
+            }
+        )
+
+    def get_schema_operation_parameters(self, view) -> list[dict]:
+        fields = self.filter_serializer_class().fields
+        return [
+            {
+                "name": param,
+                "required": False,
+                "in": "query",
+                "description": f"Filter on {self.lookups[param]}.",
+                "schema": self.get_parameter_schema(fields[param]),
+            }
+            for param in self.lookups
+        ]
+
+    @staticmethod
+    def get_parameter_schema(field: serializers.Field) -> dict:
+        if isinstance(field, serializers.ChoiceField):
+            return {"type": "string", "enum": list(field.choices)}
+        if isinstance(field, serializers.DateTimeField):
+            return {"type": "string", "format": "date-time"}
+        if isinstance(field, serializers.DecimalField):
+            return {"type": "number", "format": "double"}
+        if isinstance(field, serializers.BooleanField):
+            return {"type": "boolean"}
+        if isinstance(field, serializers.IntegerField):
+            return {"type": "integer"}
+        return {"type": "string"}
+
+
+class QueryParameterOrdering(OrderingFilter):
+    ordering_param = "sort"
+    # API name -> model field, a leading "-" sorts descending
+    sort_fields: dict[str, str]
+
+    def get_ordering(self, request: Request, queryset: QuerySet, view):
+        params: str | None = request.query_params.get(self.ordering_param)
+        if not params:
+            return ["id"]
+        ordering: list[str] = []
+        for term in params.split(","):
+            term = term.strip()
+            name: str = term.lstrip("-")
+            if name not in self.sort_fields:
+                raise serializers.ValidationError(
+                    {self.ordering_param: [f"Cannot sort by {name}."]}
+                )
+            prefix: str = "-" if term.startswith("-") else ""
+            ordering.append(prefix + self.sort_fields[name])
+        # A unique tie-break keeps pages stable under cursor pagination
+        if not any(field.lstrip("-") == "id" for field in ordering):
+            ordering.append("id")
+        return ordering
+
+    def get_schema_operation_parameters(self, view) -> list[dict]:
+        return [
+            {
+                "name": self.ordering_param,
+                "required": False,
+                "in": "query",
+                "description": (
+                    "Comma separated fields to sort by, prefix with - for "
+                    f"descending: {', '.join(self.sort_fields)}."
+                ),
+                "schema": {"type": "string"},
+            }
+        ]
+
+
+class OrderFilter(QueryParameterFilter):
+    filter_serializer_class = OrderFilterSerializer
+    lookups = {
+        "status": "order_status",
+        "createdFrom": "created_on__gte",
+        "createdTo": "created_on__lte",
+        "updatedFrom": "last_updated__gte",
+        "updatedTo": "last_updated__lte",
+        "totalMin": "order_total__gte",
+        "totalMax": "order_total__lte",
+    }
+
+
+class SalesReportFilter(QueryParameterFilter):
+    filter_serializer_class = SalesReportFilterSerializer
+    lookups = {
+        "granularity": "granularity",
+        "periodFrom": "period_start__gte",
+        "periodTo": "period_start__lte",
+        "productId": "product_id",
+        "status": "order_status",
+    }
+
+
+class ProductFilter(QueryParameterFilter):
+    filter_serializer_class = ProductFilterSerializer
+    lookups = {
+        "categoryId": "category_id",
+        "tagId": "tag__id",
+        "retired": "retired",
+        "priceMin": "price__gte",
+        "priceMax": "price__lte",
+    }
+
+
+class CategoryProductFilter(QueryParameterFilter):
+    filter_serializer_class = CategoryProductFilterSerializer
+    lookups = {"retired": "retired"}
+
+
+class ProductOrdering(QueryParameterOrdering):
+    sort_fields = {"id": "id", "name": "name", "price": "price"}
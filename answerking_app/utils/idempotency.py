@@ -0,0 +1,217 @@
+import hashlib
+import json
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import timedelta
+from functools import cache
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.exceptions import ImproperlyConfigured
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.module_loading import import_string
+from rest_framework import status
+
+from answerking_app.models.models import IdempotencyKey
+from answerking_app.utils.mixins.ApiExceptions import ProblemDetails
+
+POLL_INTERVAL = 0.1
+
+
+@dataclass
+class StoredResponse:
+    status_code: int
+    body: str
+
+
+@dataclass
+class ExistingKey:
+    request_hash: str
+    response: StoredResponse | None
+
+
+def hash_request(data) -> str:
+    return hashlib.sha256(
+        json.dumps(data, sort_keys=True, default=str).encode()
+    ).hexdigest()
+
+
+class IdempotencyStore(ABC):
+    """Stores responses by Idempotency-Key so retries can be replayed.
+
+    begin() returns the stored response for a completed key, otherwise it
+    takes the key's lock and the caller must save() or release() it. The
+    lock is leased, so a request that dies without releasing it holds the
+    key for IDEMPOTENCY_LOCK_LEASE seconds rather than the whole TTL.
+    """
+
+    def __init__(self):
+        self.ttl = timedelta(seconds=settings.IDEMPOTENCY_KEY_TTL)
+        self.lock_timeout: float = settings.IDEMPOTENCY_LOCK_TIMEOUT
+        self.lock_lease = timedelta(seconds=settings.IDEMPOTENCY_LOCK_LEASE)
+
+    def begin(
+        self, key: str, scope: str, request_hash: str
+    ) -> StoredResponse | None:
+        deadline = time.monotonic() + self.lock_timeout
+        while True:
+            existing = self.acquire(key, scope, request_hash)
+            if existing is None:
+                return None
+            if existing.request_hash != request_hash:
+                raise ProblemDetails(
+                    status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                    detail="This Idempotency-Key has already been used "
+                    "with a different request",
+                )
+            if existing.response is not None:
+                return existing.response
+            if time.monotonic() >= deadline:
+                raise ProblemDetails(
+                    status=status.HTTP_409_CONFLICT,
+                    detail="A request with this Idempotency-Key is "
+                    "already in progress",
+                )
+            time.sleep(POLL_INTERVAL)
+
+    @abstractmethod
+    def acquire(
+        self, key: str, scope: str, request_hash: str
+    ) -> ExistingKey | None:
+        ...
+
+    @abstractmethod
+    def save(self, key: str, scope: str, response: StoredResponse):
+        ...
+
+    @abstractmethod
+    def release(self, key: str, scope: str):
+        ...
+
+
+class DatabaseIdempotencyStore(IdempotencyStore):
+    def acquire(
+        self, key: str, scope: str, request_hash: str
+    ) -> ExistingKey | None:
+        now = timezone.now()
+        IdempotencyKey.objects.filter(
+            key=key, scope=scope, expires_on__lte=now
+        ).delete()
+        try:
+            with transaction.atomic():
+                IdempotencyKey.objects.create(
+                    key=key,
+                    scope=scope,
+                    request_hash=request_hash,
+                    expires_on=now + self.ttl,
+                    locked_until=now + self.lock_lease,
+                )
+            return None
+        except IntegrityError:
+            pass
+        # The request holding an expired lease never finished
+        taken_over: int = IdempotencyKey.objects.filter(
+            Q(locked_until__lte=now) | Q(locked_until__isnull=True),
+            key=key,
+            scope=scope,
+            status_code__isnull=True,
+        ).update(
+            request_hash=request_hash,
+            expires_on=now + self.ttl,
+            locked_until=now + self.lock_lease,
+        )
+        if taken_over:
+            return None
+        existing = IdempotencyKey.objects.filter(key=key, scope=scope).first()
+        if existing is None:
+            return self.acquire(key, scope, request_hash)
+        response = None
+        if existing.status_code is not None:
+            response = StoredResponse(
+                status_code=existing.status_code,
+                body=existing.response_body or "",
+            )
+        return ExistingKey(existing.request_hash, response)
+
+    def save(self, key: str, scope: str, response: StoredResponse):
+        IdempotencyKey.objects.filter(key=key, scope=scope).update(
+            status_code=response.status_code,
+            response_body=response.body,
+            locked_until=None,
+        )
+
+    def release(self, key: str, scope: str):
+        IdempotencyKey.objects.filter(
+            key=key, scope=scope, status_code__isnull=True
+        ).delete()
+
+    @staticmethod
+    def purge_expired() -> int:
+        deleted, _ = IdempotencyKey.objects.filter(
+            expires_on__lte=timezone.now()
+        ).delete()
+        return deleted
+
+
+class CacheIdempotencyStore(IdempotencyStore):
+    # Completed responses are kept for the TTL. A key in progress is only
+    # a lock entry, which expires after the lease.
+    def __init__(self):
+        super().__init__()
+        alias: str = settings.IDEMPOTENCY_CACHE_ALIAS
+        self.cache = caches[alias]
+        if isinstance(self.cache, (LocMemCache, DummyCache)):
+            raise ImproperlyConfigured(
+                f"IDEMPOTENCY_CACHE_ALIAS '{alias}' must name a cache shared "
+                "by every worker"
+            )
+
+    def acquire(
+        self, key: str, scope: str, request_hash: str
+    ) -> ExistingKey | None:
+        cache_key = self.make_key(key, scope)
+        lock_key = f"{cache_key}:lock"
+        if self.cache.add(
+            lock_key, request_hash, timeout=self.lock_lease.total_seconds()
+        ):
+            stored = self.cache.get(cache_key)
+            if stored is None:
+                return None
+            # Completed while the lock was being taken
+            self.cache.delete(lock_key)
+            return ExistingKey(*stored)
+        stored = self.cache.get(cache_key)
+        if stored is not None:
+            return ExistingKey(*stored)
+        locked_hash: str | None = self.cache.get(lock_key)
+        if locked_hash is None:
+            return self.acquire(key, scope, request_hash)
+        return ExistingKey(locked_hash, None)
+
+    def save(self, key: str, scope: str, response: StoredResponse):
+        cache_key = self.make_key(key, scope)
+        lock_key = f"{cache_key}:lock"
+        self.cache.set(
+            cache_key,
+            (self.cache.get(lock_key), response),
+            timeout=self.ttl.total_seconds(),
+        )
+        self.cache.delete(lock_key)
+
+    def release(self, key: str, scope: str):
+        self.cache.delete(f"{self.make_key(key, scope)}:lock")
+
+    @staticmethod
+    def make_key(key: str, scope: str) -> str:
+        digest: str = hashlib.sha256(f"{scope}:{key}".encode()).hexdigest()
+        return f"idempotency:{digest}"
+
+
+@cache
+def get_idempotency_store() -> IdempotencyStore:
+    return import_string(settings.IDEMPOTENCY_STORE)()
@@ -0,0 +1,387 @@
+import codecs
+import csv
+import json
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from itertools import chain
+from typing import IO
+
+from django.db import IntegrityError, transaction
+from django.db.models import F, QuerySet
+from django.utils import timezone
+from rest_framework.exceptions import ParseError
+from rest_framework.settings import api_settings
+
+from answerking_app.models.models import (
+    Category,
+    Product,
+    ProductPrice,
+    Tag,
+)
+from answerking_app.models.serializers import ProductSerializer
+from answerking_app.utils.catalogue_cache import get_catalogue_cache
+from answerking_app.utils.search import get_search_backend
+
+PRODUCT_IMPORT_FIELDS: list[str] = [
+    "name",
+    "description",
+    "price",
+    "categoryId",
+    "tags",
+    "retired",
+]
+READ_SIZE = 64 * 1024
+# Longest JSON record accepted by the streaming import
+MAX_RECORD_SIZE = 64 * 1024
+JSON_STRUCTURAL = "[],"
+JSON_WHITESPACE = " \t\r\n"
+
+
+@dataclass
+class ImportResult:
+    created: int = 0
+    updated: int = 0
+    errors: list[dict] = field(default_factory=list)
+
+
+def iter_text(stream: IO, encoding: str = "utf-8") -> Iterator[str]:
+    chunks = iter(lambda: stream.read(READ_SIZE), b"")
+    return codecs.iterdecode(chunks, encoding)
+
+
+def iter_lines(chunks: Iterable[str]) -> Iterator[str]:
+    buffer = ""
+    for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split("\n")
+        for line in lines:
+            yield line + "\n"
+    if buffer:
+        yield buffer
+
+
+def iter_csv_records(chunks: Iterable[str]) -> Iterator[dict]:
+    """One record per row, tags given as ids separated by ;"""
+    for row in csv.DictReader(iter_lines(chunks)):
+        record: dict = {
+            name: value
+            for name, value in row.items()
+            if name in PRODUCT_IMPORT_FIELDS and value not in ("", None)
+        }
+        if "description" in row:
+            record.setdefault("description", "")
+        if "tags" in row:
+            record["tags"] = [
+                tag.strip() for tag in (row["tags"] or "").split(";") if tag
+            ]
+        yield record
+
+
+def iter_json_records(chunks: Iterable[str]) -> Iterator:
+    """Records from a JSON array or from one object per line
+
+    Only the record being decoded is held in memory.
+    """
+    tokens: Iterator[str] = iter_json_tokens(chunks)
+    first: str | None = next(tokens, None)
+    if first is None:
+        return
+    if first != "[":
+        for token in chain([first], tokens):
+            if token in JSON_STRUCTURAL:
+                raise unexpected_token(token)
+            yield decode_json_value(token)
+        return
+    # What the array allows next: a value or "]", a value, "," or "]", or
+    # nothing once it is closed
+    expected: str = "first"
+    for token in tokens:
+        if token == "]" and expected in ("first", "separator"):
+            expected = "end"
+        elif token == "," and expected == "separator":
+            expected = "value"
+        elif token not in JSON_STRUCTURAL and expected in ("first", "value"):
+            yield decode_json_value(token)
+            expected = "separator"
+        else:
+            raise unexpected_token(token)
+    if expected != "end":
+        raise ParseError("JSON parse error - unexpected end of input")
+
+
+def iter_json_tokens(chunks: Iterable[str]) -> Iterator[str]:
+    """The top level "[", "]" and "," of a JSON stream and the text of
+    each value between them
+
+    The scan resumes where the previous chunk ended, and a value longer
+    than MAX_RECORD_SIZE is rejected instead of buffered.
+    """
+    buffer = ""
+    start: int | None = None
+    depth = 0
+    in_string = escaped = False
+    for chunk in chunks:
+        position: int = len(buffer)
+        buffer += chunk
+        while position < len(buffer):
+            char: str = buffer[position]
+            end: int | None = None
+            if start is None:
+                if char in JSON_STRUCTURAL:
+                    yield char
+                elif char == "}":
+                    raise unexpected_token(char)
+                elif char not in JSON_WHITESPACE:
+                    start = position
+                    depth = 0
+                    in_string = escaped = False
+                    continue
+            elif in_string:
+                if escaped:
+                    escaped = False
+                elif char == "\\":
+                    escaped = True
+                elif char == '"':
+                    in_string = False
+                    if depth == 0:
+                        end = position + 1
+            elif char == '"':
+                if depth == 0 and position > start:
+                    end = position
+                else:
+                    in_string = True
+            elif char in "{[":
+                if depth == 0 and position > start:
+                    end = position
+                else:
+                    depth += 1
+            elif char in "}]":
+                if depth == 0:
+                    end = position
+                else:
+                    depth -= 1
+                    if depth == 0:
+                        end = position + 1
+            elif depth == 0 and (char in JSON_WHITESPACE or char == ","):
+                end = position
+            if end is not None:
+                yield buffer[start:end]
+                start = None
+                position = end
+                continue
+            if start is not None and position - start >= MAX_RECORD_SIZE:
+                raise ParseError(
+                    "JSON parse error - a record is longer than "
+                    f"{MAX_RECORD_SIZE} characters"
+                )
+            position += 1
+        buffer = buffer[start:] if start is not None else ""
+        start = 0 if start is not None else None
+    if start is not None:
+        if depth or in_string:
+            raise ParseError("JSON parse error - unexpected end of input")
+        yield buffer
+
+
+def decode_json_value(text: str):
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError as exc:
+        raise ParseError(f"JSON parse error - {exc.msg}")
+
+
+def unexpected_token(token: str) -> ParseError:
+    return ParseError(f"JSON parse error - unexpected '{token}'")
+
+
+def import_products(records: Iterable, batch_size: int) -> ImportResult:
+    """Imports the records in batches of batch_size
+
+    A record that cannot be parsed ends the import. The rows read before
+    it are still written and it is reported as an error on its row.
+    """
+    result = ImportResult()
+    names: set[str] = set()
+    batch: list[tuple[int, dict]] = []
+    parse_error: dict | None = None
+    row = 0
+    try:
+        for row, record in enumerate(records, start=1):
+            batch.append((row, record))
+            if len(batch) == batch_size:
+                import_batch(batch, names, result)
+                batch = []
+    except ParseError as exc:
+        parse_error = row_error(
+            row + 1, api_settings.NON_FIELD_ERRORS_KEY, str(exc.detail)
+        )
+    if batch:
+        import_batch(batch, names, result)
+    if parse_error is not None:
+        result.errors.append(parse_error)
+    return result
+
+
+def import_batch(
+    batch: list[tuple[int, dict]], names: set[str], result: ImportResult
+):
+    context: dict = {
+        "related_lookups": {
+            Category: Category.objects.in_bulk(
+                related_ids(batch, "categoryId")
+            ),
+            Tag: Tag.objects.in_bulk(related_ids(batch, "tags")),
+        }
+    }
+    valid: list[tuple[int, dict]] = []
+    for row, record in batch:
+        serializer = ProductSerializer(data=record, context=context)
+        if not serializer.is_valid():
+            result.errors.append({"row": row, "errors": serializer.errors})
+            continue
+        validated_data: dict = serializer.validated_data  # type: ignore[reportGeneralTypeIssues]
+        if validated_data["name"] in names:
+            result.errors.append(
+                row_error(row, "name", "This name is used by an earlier row.")
+            )
+            continue
+        names.add(validated_data["name"])
+        valid.append((row, validated_data))
+
+    try:
+        write_batch(valid, result)
+    except IntegrityError:
+        # Another request created one of the names after they were read.
+        # Its row is committed now, so the retry updates it instead.
+        write_batch(valid, result)
+
+
+def write_batch(valid: list[tuple[int, dict]], result: ImportResult):
+    errors: list[dict] = []
+    with transaction.atomic():
+        # Locked so a concurrent import or update cannot change the rows
+        # between the retired check and the write
+        locked: QuerySet[Product] = Product.objects.select_for_update()
+        existing: dict[str, Product] = locked.in_bulk(
+            [validated_data["name"] for _, validated_data in valid],
+            field_name="name",
+        )
+        writable: list[dict] = []
+        for row, validated_data in valid:
+            product: Product | None = existing.get(validated_data["name"])
+            if product is not None and product.retired:
+                errors.append(
+                    row_error(
+                        row,
+                        "name",
+                        "This product has been retired, unretire it before "
+                        "updating it",
+                    )
+                )
+                continue
+            writable.append(validated_data)
+        if writable:
+            write_products(writable, existing, result)
+    result.errors.extend(errors)
+
+
+def row_error(row: int, name: str, message: str) -> dict:
+    return {"row": row, "errors": {name: [message]}}
+
+
+def write_products(
+    valid: list[dict], existing: dict[str, Product], result: ImportResult
+):
+    """Writes one batch, inside the transaction that locked `existing`"""
+    now = timezone.now()
+    created: list[Product] = []
+    updated: list[Product] = []
+    category_ids: set[int] = set()
+    repriced: list[Product] = []
+    for validated_data in valid:
+        product: Product | None = existing.get(validated_data["name"])
+        if product is None:
+            product = Product(last_updated=now)
+            created.append(product)
+            repriced.append(product)
+        else:
+            category_ids.add(product.category_id)  # type: ignore[reportGeneralTypeIssues]
+            product.version = F("version") + 1  # type: ignore[reportGeneralTypeIssues]
+            product.last_updated = now
+            updated.append(product)
+            if validated_data["price"] != product.price:
+                repriced.append(product)
+        for attr in ("name", "description", "price", "category", "retired"):
+            if attr in validated_data:
+                setattr(product, attr, validated_data[attr])
+        category_ids.add(product.category_id)  # type: ignore[reportGeneralTypeIssues]
+
+    Product.objects.bulk_create(created)
+    Product.objects.bulk_update(
+        updated,
+        [
+            "description",
+            "price",
+            "category",
+            "retired",
+            "version",
+            "last_updated",
+        ],
+    )
+    product_ids: dict[str, int] = dict(
+        Product.objects.filter(
+            name__in=[validated_data["name"] for validated_data in valid]
+        ).values_list("name", "id")
+    )
+    tag_ids: set[int] = replace_tags(
+        {
+            product_ids[validated_data["name"]]: validated_data["tag_set"]
+            for validated_data in valid
+            if "tag_set" in validated_data
+        }
+    )
+    ProductPrice.record(
+        [(product_ids[product.name], product.price) for product in repriced],
+        now,
+    )
+    Category.touch(category_ids - {None})
+    Tag.touch(tag_ids)
+    # Bulk writes send no signals
+    ids: list[int] = list(product_ids.values())
+    transaction.on_commit(lambda: get_search_backend().refresh(ids))
+    transaction.on_commit(lambda: get_catalogue_cache().bump())
+    result.created += len(created)
+    result.updated += len(updated)
+
+
+def replace_tags(tags_by_product: dict[int, list[Tag]]) -> set[int]:
+    if not tags_by_product:
+        return set()
+    through = Tag.products.through
+    links = through.objects.filter(product_id__in=tags_by_product)
+    tag_ids: set[int] = set(links.values_list("tag_id", flat=True))
+    links.delete()
+    through.objects.bulk_create(
+        [
+            through(product_id=product_id, tag_id=tag.id)
+            for product_id, tags in tags_by_product.items()
+            for tag in tags
+        ]
+    )
+    return tag_ids | {
+        tag.id for tags in tags_by_product.values() for tag in tags
+    }
+
+
+def related_ids(batch: list[tuple[int, dict]], name: str) -> set[int]:
+    ids: set[int] = set()
+    for _, record in batch:
+        if not isinstance(record, dict):
+            continue
+        values = record.get(name)
+        for value in values if isinstance(values, list) else [values]:
+            try:
+                ids.add(int(value))
+            except (TypeError, ValueError):
+                continue
+    return ids
@@ -0,0 +1,29 @@
+from django.http import Http404
+from django.shortcuts import get_object_or_404
+from rest_framework import status
+from rest_framework.generics import GenericAPIView
+
+from answerking_app.models.models import (
+    ArchivedOrder,
+    Order,
+)
+from answerking_app.utils.mixins.ApiExceptions import ProblemDetails
+
+
+# Serves orders moved to the archive tables, read-only
+class ArchivedOrderMixin(GenericAPIView):
+    archived_queryset = ArchivedOrder.objects.prefetch_related("lineitem_set")
+
+    def get_object(self) -> Order | ArchivedOrder:
+        try:
+            return super().get_object()
+        except Http404:
+            archived: ArchivedOrder = get_object_or_404(
+                self.archived_queryset, pk=self.kwargs[self.lookup_url_kwarg]
+            )
+            if self.request.method != "GET":
+                raise ProblemDetails(
+                    status=status.HTTP_410_GONE,
+                    detail="This order has been archived and is read-only",
+                )
+            return archived
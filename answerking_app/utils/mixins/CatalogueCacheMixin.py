@@ -0,0 +1,62 @@
+from typing import Callable
+from urllib.parse import urlencode
+
+from rest_framework.generics import GenericAPIView
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from answerking_app.utils.catalogue_cache import (
+    CachedResponse,
+    get_catalogue_cache,
+)
+from answerking_app.utils.mixins.ConditionalGetMixin import not_modified
+
+CACHED_HEADERS: tuple[str, ...] = ("ETag", "Last-Modified")
+
+
+# Serves list and retrieve from the catalogue cache. Goes before
+# ConditionalGetMixin and VersionMixin so the validators they set are
+# cached with the body.
+class CatalogueCacheMixin(GenericAPIView):
+    catalogue_key: str | None = None
+
+    def list(self, request: Request, *args, **kwargs) -> Response:
+        return self.cached(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request: Request, *args, **kwargs) -> Response:
+        return self.cached(super().retrieve, request, *args, **kwargs)
+
+    def cached(
+        self, handler: Callable, request: Request, *args, **kwargs
+    ) -> Response:
+        query: str = urlencode(
+            sorted(request.query_params.lists()), doseq=True
+        )
+        key: str = get_catalogue_cache().make_key(f"{request.path}?{query}")
+        cached: CachedResponse | None = get_catalogue_cache().get(key)
+        if cached is not None:
+            return not_modified(request, cached.headers) or Response(
+                cached.data, headers=cached.headers
+            )
+        self.catalogue_key = key
+        return handler(request, *args, **kwargs)
+
+    def finalize_response(
+        self, request: Request, response: Response, *args, **kwargs
+    ) -> Response:
+        response = super().finalize_response(
+            request, response, *args, **kwargs
+        )
+        if self.catalogue_key is not None and response.status_code == 200:
+            get_catalogue_cache().set(
+                self.catalogue_key,
+                CachedResponse(
+                    response.data,
+                    {
+                        header: response[header]
+                        for header in CACHED_HEADERS
+                        if response.has_header(header)
+                    },
+                ),
+            )
+        return response
@@ -1,30 +1,39 @@
-from django.core.exceptions import ObjectDoesNotExist
 from django.db.models import QuerySet
 from rest_framework import status
 from rest_framework.request import Request
 from rest_framework.response import Response
 
 from answerking_app.models.models import Product, Category
-from answerking_app.models.serializers import ProductSerializer
 from answerking_app.utils.mixins.ApiExceptions import ProblemDetails
+from answerking_app.utils.mixins.EagerLoadingMixin import EagerLoadingMixin
 
 
-class CategoryProductListMixin:
-    def list(self, **kwargs) -> Response:
-        try:
-            Category.objects.get(pk=kwargs["pk"])
-        except ObjectDoesNotExist:
+class CategoryProductListMixin(EagerLoadingMixin):
+    def get_queryset(self) -> QuerySet[Product]:
+        return (
+            super()
+            .get_queryset()
+            .filter(category_id=self.kwargs["pk"])
+            .order_by("id")
+        )
+
+    def list(self, request: Request, *args, **kwargs) -> Response:
+        queryset: QuerySet[Product] = self.filter_queryset(self.get_queryset())
+        page: list[Product] | None = self.paginate_queryset(queryset)
+        products: list[Product] = page if page is not None else list(queryset)
+        # Only an empty result needs to tell an empty category from a
+        # missing one
+        if not products and not self.category_exists(kwargs["pk"]):
             raise ProblemDetails(
                 status=status.HTTP_404_NOT_FOUND,
                 detail="Not Found",
                 title="Resource not found",
             )
+        serializer = self.get_serializer(products, many=True)
+        if page is not None:
+            return self.get_paginated_response(serializer.data)
+        return Response(serializer.data, status=status.HTTP_200_OK)
 
-        products: QuerySet[Product] = Product.objects.filter(
-            category__id=kwargs["pk"]
-        )
-        if not products:
-            raise ProblemDetails(status=status.HTTP_404_NOT_FOUND)
-        response = ProductSerializer(products, many=True).data
-
-        return Response(response, status=status.HTTP_200_OK)
+    @staticmethod
+    def category_exists(pk: str) -> bool:
+        return Category.objects.filter(pk=pk).exists()
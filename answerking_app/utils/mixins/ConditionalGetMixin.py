@@ -0,0 +1,82 @@
+import hashlib
+from typing import Iterable
+
+from django.db.models import Model, QuerySet
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe, quote_etag
+from rest_framework.generics import GenericAPIView
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from answerking_app.models.models import VersionedModel
+from answerking_app.utils.mixins.VersionMixin import make_etag
+
+
+def not_modified(
+    request: Request, validators: dict[str, str]
+) -> HttpResponse | None:
+    last_modified: str | None = validators.get("Last-Modified")
+    response: HttpResponse | None = get_conditional_response(
+        request,
+        etag=validators.get("ETag"),
+        last_modified=last_modified and parse_http_date_safe(last_modified),
+    )
+    if response is not None:
+        for header, value in validators.items():
+            response[header] = value
+    return response
+
+
+# Answers If-None-Match and If-Modified-Since with 304 before the
+# response is serialized. Goes before VersionMixin.
+class ConditionalGetMixin(GenericAPIView):
+    def retrieve(self, request: Request, *args, **kwargs) -> Response:
+        instance: Model = self.get_object()
+        validators: dict[str, str] = {
+            "ETag": make_etag(instance),
+            "Last-Modified": http_date(instance.last_updated.timestamp()),  # type: ignore[reportGeneralTypeIssues]
+        }
+        response = not_modified(request, validators)
+        if response is not None:
+            return response  # type: ignore[reportGeneralTypeIssues]
+        serializer = self.get_serializer(instance)
+        return Response(serializer.data, headers=validators)
+
+    def list(self, request: Request, *args, **kwargs) -> Response:
+        queryset: QuerySet = self.filter_queryset(self.get_queryset())
+        page: list[VersionedModel] | None = self.paginate_queryset(queryset)
+        # The page is loaded anyway. Without one only the columns the
+        # validators need are read before deciding on a 304.
+        rows: Iterable[tuple[int, int]] = (
+            [(row.pk, row.version) for row in page]
+            if page is not None
+            else queryset.prefetch_related(None).values_list("pk", "version")
+        )
+        validators: dict[str, str] = self.list_validators(request, rows)
+        response = not_modified(request, validators)
+        if response is not None:
+            return response  # type: ignore[reportGeneralTypeIssues]
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            response = self.get_paginated_response(serializer.data)
+        else:
+            serializer = self.get_serializer(queryset, many=True)
+            response = Response(serializer.data)
+        for header, value in validators.items():
+            response[header] = value
+        return response
+
+    @staticmethod
+    def list_validators(
+        request: Request, rows: Iterable[tuple[int, int]]
+    ) -> dict[str, str]:
+        # Hashes the id and version of every row that is rendered, so an
+        # added, removed or changed row changes the ETag. Touching related
+        # rows keeps the version current for every field a list renders.
+        # Lists send no Last-Modified: the newest remaining row says nothing
+        # about rows that have left the list.
+        digest = hashlib.sha256(request.get_full_path().encode())
+        for pk, version in rows:
+            digest.update(f":{pk}.{version}".encode())
+        return {"ETag": quote_etag(digest.hexdigest())}
@@ -0,0 +1,26 @@
+from django.db.models import QuerySet
+from rest_framework.serializers import BaseSerializer
+
+from answerking_app.utils.mixins.SparseFieldsMixin import SparseFieldsMixin
+
+
+class EagerLoadingMixin(SparseFieldsMixin):
+    def get_queryset(self) -> QuerySet:
+        queryset: QuerySet = super().get_queryset()
+        # Fields left out by ?fields= or ?exclude= need no joins
+        return self.get_serializer_class().setup_eager_loading(
+            queryset, self.sparse_fields()
+        )
+
+    def perform_create(self, serializer: BaseSerializer):
+        serializer.save()
+        self.reload_instance(serializer)
+
+    def perform_update(self, serializer: BaseSerializer):
+        serializer.save()
+        self.reload_instance(serializer)
+
+    def reload_instance(self, serializer: BaseSerializer):
+        serializer.instance = self.get_queryset().get(
+            pk=serializer.instance.pk  # type: ignore[reportOptionalMemberAccess]
+        )
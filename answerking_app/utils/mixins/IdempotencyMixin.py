@@ -0,0 +1,61 @@
+from django.http import HttpResponse
+from rest_framework import status
+from rest_framework.generics import GenericAPIView
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from answerking_app.utils.idempotency import (
+    StoredResponse,
+    get_idempotency_store,
+    hash_request,
+)
+from answerking_app.utils.mixins.ApiExceptions import ProblemDetails
+
+IDEMPOTENCY_KEY_MAX_LENGTH = 255
+
+
+class IdempotencyMixin(GenericAPIView):
+    def create(
+        self, request: Request, *args, **kwargs
+    ) -> Response | HttpResponse:
+        key: str | None = request.headers.get("Idempotency-Key")
+        if key is None:
+            return super().create(request, *args, **kwargs)  # type: ignore[reportGeneralTypeIssues]
+        if not key or len(key) > IDEMPOTENCY_KEY_MAX_LENGTH:
+            raise ProblemDetails(
+                status=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid Idempotency-Key header",
+            )
+
+        store = get_idempotency_store()
+        scope = f"{request.method} {request.path}"
+        stored: StoredResponse | None = store.begin(
+            key, scope, hash_request(request.data)
+        )
+        if stored is not None:
+            replay = HttpResponse(
+                stored.body,
+                status=stored.status_code,
+                content_type="application/json",
+            )
+            replay["Idempotent-Replayed"] = "true"
+            return replay
+
+        try:
+            response: Response = super().create(request, *args, **kwargs)  # type: ignore[reportGeneralTypeIssues]
+        except Exception:
+            store.release(key, scope)
+            raise
+        if status.is_success(response.status_code):
+            store.save(
+                key,
+                scope,
+                StoredResponse(
+                    status_code=response.status_code,
+                    body=JSONRenderer().render(response.data).decode(),
+                ),
+            )
+        else:
+            store.release(key, scope)
+        return response
@@ -0,0 +1,107 @@
+from django.conf import settings
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.generics import GenericAPIView
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from answerking_app.models.models import Order, Product
+from answerking_app.models.serializers import OrderSerializer
+from answerking_app.utils.mixins.ApiExceptions import ProblemDetails
+
+
+class OrderBatchCreateMixin(GenericAPIView):
+    def create(self, request: Request, *args, **kwargs) -> Response:
+        orders_data = request.data
+        if not isinstance(orders_data, list):
+            raise ProblemDetails(
+                status=status.HTTP_400_BAD_REQUEST,
+                detail="Expected a list of orders",
+            )
+        if len(orders_data) > settings.ORDER_BATCH_MAX_SIZE:
+            raise ProblemDetails(
+                status=status.HTTP_400_BAD_REQUEST,
+                detail="A batch can contain at most "
+                f"{settings.ORDER_BATCH_MAX_SIZE} orders",
+            )
+
+        context: dict = self.get_serializer_context() | {
+            "related_lookups": {
+                Product: Product.objects.in_bulk(get_product_ids(orders_data))
+            }
+        }
+        results: list[dict] = []
+        valid_serializers: list[OrderSerializer] = []
+        for order_data in orders_data:
+            serializer = OrderSerializer(data=order_data, context=context)
+            try:
+                serializer.is_valid(raise_exception=True)
+            except ValidationError as exc:
+                results.append(
+                    problem_result(
+                        status.HTTP_400_BAD_REQUEST,
+                        detail="Validation Error",
+                        title="Invalid input.",
+                        errors=exc.detail,
+                    )
+                )
+                continue
+            except ProblemDetails as exc:
+                results.append(
+                    problem_result(exc.status_code, detail=str(exc.detail))
+                )
+                continue
+            results.append({"status": status.HTTP_201_CREATED})
+            valid_serializers.append(serializer)
+
+        orders: list[Order] = OrderSerializer.create_many(
+            [serializer.validated_data for serializer in valid_serializers]  # type: ignore[reportGeneralTypeIssues]
+        )
+        created: dict[int, Order] = {
+            order.id: order
+            for order in OrderSerializer.setup_eager_loading(
+                Order.objects.filter(id__in=[order.id for order in orders])
+            )
+        }
+        created_results = (
+            result for result in results if "problem" not in result
+        )
+        for result, order in zip(created_results, orders):
+            result["order"] = OrderSerializer(
+                created[order.id], context=context
+            ).data
+
+        all_created: bool = len(orders) == len(results)
+        return Response(
+            results,
+            status=status.HTTP_201_CREATED
+            if all_created
+            else status.HTTP_207_MULTI_STATUS,
+        )
+
+
+def get_product_ids(orders_data: list) -> set[int]:
+    product_ids: set[int] = set()
+    for order_data in orders_data:
+        if not isinstance(order_data, dict):
+            continue
+        line_items = order_data.get("lineItems", [])
+        if not isinstance(line_items, list):
+            continue
+        for line_item in line_items:
+            try:
+                product_ids.add(int(line_item["productId"]))
+            except (KeyError, TypeError, ValueError):
+                continue
+    return product_ids
+
+
+def problem_result(
+    status_code: int, detail: str, title: str | None = None, errors=None
+) -> dict:
+    problem: dict = {"status": status_code, "detail": detail}
+    if title is not None:
+        problem["title"] = title
+    if errors is not None:
+        problem["errors"] = errors
+    return {"status": status_code, "problem": problem}
@@ -0,0 +1,97 @@
+from django.db import transaction
+from django.shortcuts import get_object_or_404
+from rest_framework import status
+from rest_framework.generics import GenericAPIView
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from answerking_app.models.models import (
+    LineItem,
+    LineItemChange,
+    Order,
+    Product,
+)
+from answerking_app.models.serializers import OrderLineItemSerializer
+from answerking_app.utils.mixins.ApiExceptions import ProblemDetails
+from answerking_app.utils.mixins.VersionMixin import (
+    check_if_match,
+    make_etag,
+)
+from answerking_app.utils.serializer_data_functions import (
+    products_check_retired,
+)
+from answerking_app.utils.url_parameter_check import check_url_parameter
+
+
+# Changes one line of an order without rewriting the others
+class OrderLineItemMixin(GenericAPIView):
+    def get_order(self) -> Order:
+        check_url_parameter(self.kwargs["pk"])
+        check_url_parameter(self.kwargs["productId"])
+        order: Order = get_object_or_404(
+            Order.objects.select_for_update(), pk=self.kwargs["pk"]
+        )
+        check_if_match(self.request, order)
+        if order.order_status != Order.Status.CREATED:
+            raise ProblemDetails(
+                status=status.HTTP_400_BAD_REQUEST,
+                detail="Only orders with status Created can be changed",
+            )
+        return order
+
+    def get_product(self) -> Product:
+        product: Product = get_object_or_404(
+            Product, pk=self.kwargs["productId"]
+        )
+        products_check_retired({"product_set": [product]})
+        return product
+
+    def get_line_item(self, order: Order) -> LineItem:
+        line_item: LineItem = get_object_or_404(
+            LineItem.objects.select_for_update(),
+            order=order,
+            product_id=self.kwargs["productId"],
+        )
+        line_item.order = order
+        return line_item
+
+    @transaction.atomic
+    def add_line_item(self, request: Request, *args, **kwargs) -> Response:
+        order: Order = self.get_order()
+        product: Product = self.get_product()
+        if LineItem.objects.filter(order=order, product=product).exists():
+            raise ProblemDetails(
+                status=status.HTTP_400_BAD_REQUEST,
+                detail="This product is already in the order",
+            )
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        serializer.save(order=order, product=product)
+        return Response(
+            serializer.data,
+            status=status.HTTP_201_CREATED,
+            headers={"ETag": make_etag(order)},
+        )
+
+    @transaction.atomic
+    def update_line_item(self, request: Request, *args, **kwargs) -> Response:
+        order: Order = self.get_order()
+        self.get_product()
+        serializer = self.get_serializer(
+            self.get_line_item(order), data=request.data
+        )
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        return Response(serializer.data, headers={"ETag": make_etag(order)})
+
+    @transaction.atomic
+    def remove_line_item(self, request: Request, *args, **kwargs) -> Response:
+        order: Order = self.get_order()
+        line_item: LineItem = self.get_line_item(order)
+        change: LineItemChange = LineItemChange.removed(line_item)
+        line_item.delete()
+        OrderLineItemSerializer.apply_change(order, change)
+        return Response(
+            status=status.HTTP_204_NO_CONTENT,
+            headers={"ETag": make_etag(order)},
+        )
@@ -1,4 +1,8 @@
-from django.db.models import QuerySet
+from typing import Iterable
+
+from django.db import transaction
+from django.db.models import F, QuerySet
+from django.utils import timezone
 from rest_framework import status
 from rest_framework.exceptions import ParseError
 from rest_framework.generics import GenericAPIView
@@ -9,11 +13,16 @@ from rest_framework.response import Response
 from answerking_app.models.models import (
     Category,
     LineItem,
+    LineItemChange,
     Order,
     Product,
+    SalesRollup,
     Tag,
 )
+from answerking_app.models.serializers import BulkRetireSerializer
+from answerking_app.utils.catalogue_cache import get_catalogue_cache
 from answerking_app.utils.mixins.ApiExceptions import ProblemDetails
+from answerking_app.utils.search import get_search_backend
 
 
 class RetireMixin(GenericAPIView):
@@ -44,6 +53,53 @@ class RetireMixin(GenericAPIView):
             return super().update(request, *args, **kwargs)
 
 
+class BulkRetireMixin(GenericAPIView):
+    def bulk_retire(self, request: Request, *args, **kwargs) -> Response:
+        return self.bulk_set_retired(request, True)
+
+    def bulk_unretire(self, request: Request, *args, **kwargs) -> Response:
+        return self.bulk_set_retired(request, False)
+
+    def bulk_set_retired(self, request: Request, retired: bool) -> Response:
+        serializer = BulkRetireSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        ids: set[int] = set(serializer.validated_data["ids"])  # type: ignore[reportGeneralTypeIssues]
+        queryset: QuerySet = self.get_queryset()
+        with transaction.atomic():
+            current: dict[int, bool] = dict(
+                queryset.select_for_update()
+                .filter(id__in=ids)
+                .values_list("id", "retired")
+            )
+            missing: list[int] = sorted(ids - current.keys())
+            if missing:
+                raise ProblemDetails(
+                    status=status.HTTP_404_NOT_FOUND,
+                    detail="Some of the given ids do not exist",
+                    extensions={"errors": {"ids": missing}},
+                )
+            # Ids already in the requested state are skipped so a retry
+            # succeeds
+            changed: list[int] = sorted(
+                pk
+                for pk, is_retired in current.items()
+                if is_retired != retired
+            )
+            if retired and queryset.model is Product:
+                in_active_orders: list[int] = products_in_active_orders(
+                    changed
+                )
+                if in_active_orders:
+                    raise ProblemDetails(
+                        status=status.HTTP_400_BAD_REQUEST,
+                        detail="Some of the products are in an active order",
+                        extensions={"errors": {"ids": in_active_orders}},
+                    )
+            if changed:
+                set_retired(queryset, changed, retired)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
 class CancelOrderMixin(GenericAPIView):
     def cancel_order(self, request: Request, *args, **kwargs) -> Response:
         instance: Order = self.get_object()
@@ -52,18 +108,57 @@ class CancelOrderMixin(GenericAPIView):
                 status=status.HTTP_400_BAD_REQUEST,
                 detail="This order has already been cancelled",
             )
-        instance.order_status = "Cancelled"
-        instance.save()
+        with transaction.atomic():
+            previous_status: str = instance.order_status
+            instance.order_status = "Cancelled"
+            instance.save()
+            line_items: list[LineItem] = list(
+                LineItem.objects.filter(order=instance)
+            )
+            # Moves the line items from the old status to Cancelled
+            changes: list[tuple[Order, str, LineItemChange]] = [
+                (instance, previous_status, LineItemChange.removed(item))
+                for item in line_items
+            ]
+            changes.extend(
+                (instance, instance.order_status, LineItemChange.added(item))
+                for item in line_items
+            )
+            SalesRollup.record(changes)
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
 def product_active_order_check(instance: Product):
-    existing_order_products: QuerySet[LineItem] = LineItem.objects.filter(
-        product=instance.id
+    if active_order_items([instance.id]).exists():
+        raise ProblemDetails(
+            status=status.HTTP_400_BAD_REQUEST,
+            detail="This product is in an active order",
+        )
+
+
+def products_in_active_orders(product_ids: Iterable[int]) -> list[int]:
+    return list(
+        active_order_items(product_ids)
+        .values_list("product_id", flat=True)
+        .distinct()
+        .order_by("product_id")
     )
-    for order_product in existing_order_products:
-        if order_product.order.order_status == "Created":
-            raise ProblemDetails(
-                status=status.HTTP_400_BAD_REQUEST,
-                detail="This product is in an active order",
-            )
+
+
+def active_order_items(product_ids: Iterable[int]) -> QuerySet[LineItem]:
+    # Served by lineitem_product_order_idx and the order primary key
+    return LineItem.objects.filter(
+        product_id__in=product_ids, order__order_status=Order.Status.CREATED
+    )
+
+
+def set_retired(queryset: QuerySet, ids: list[int], retired: bool):
+    # One UPDATE for the whole batch, which sends no signals
+    queryset.filter(id__in=ids).update(
+        retired=retired,
+        version=F("version") + 1,
+        last_updated=timezone.now(),
+    )
+    if queryset.model is Product:
+        transaction.on_commit(lambda: get_search_backend().refresh(ids))
+    transaction.on_commit(lambda: get_catalogue_cache().bump())
@@ -0,0 +1,61 @@
+from rest_framework import status
+from rest_framework.generics import GenericAPIView
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.serializers import BaseSerializer, ListSerializer
+
+from answerking_app.utils.mixins.ApiExceptions import ProblemDetails
+
+
+def parse_field_names(value: str | None) -> set[str]:
+    if value is None:
+        return set()
+    return {name.strip() for name in value.split(",") if name.strip()}
+
+
+# Renders only the top level fields named by ?fields=, less any named by
+# ?exclude=. Writes always render every field.
+class SparseFieldsMixin(GenericAPIView):
+    def get_serializer(self, *args, **kwargs) -> BaseSerializer:
+        serializer = super().get_serializer(*args, **kwargs)
+        fields: set[str] | None = self.sparse_fields()
+        if fields is not None:
+            target = (
+                serializer.child
+                if isinstance(serializer, ListSerializer)
+                else serializer
+            )
+            for name in list(target.fields):  # type: ignore[reportGeneralTypeIssues]
+                if name not in fields:
+                    target.fields.pop(name)  # type: ignore[reportGeneralTypeIssues]
+        return serializer
+
+    def sparse_fields(self) -> set[str] | None:
+        # None when every field is rendered
+        if not hasattr(self, "_sparse_fields"):
+            self._sparse_fields = self.parse_sparse_fields()
+        return self._sparse_fields
+
+    def parse_sparse_fields(self) -> set[str] | None:
+        if self.request.method not in SAFE_METHODS:
+            return None
+        params = self.request.query_params
+        if "fields" not in params and "exclude" not in params:
+            return None
+        serializer_class = self.get_serializer_class()
+        readable: set[str] = {
+            name
+            for name, field in serializer_class(
+                context=self.get_serializer_context()
+            ).fields.items()
+            if not field.write_only
+        }
+        fields: set[str] = parse_field_names(params.get("fields"))
+        exclude: set[str] = parse_field_names(params.get("exclude"))
+        unknown: list[str] = sorted((fields | exclude) - readable)
+        if unknown:
+            raise ProblemDetails(
+                status=status.HTTP_400_BAD_REQUEST,
+                detail="Unknown fields: " + ", ".join(unknown),
+                title="Invalid input.",
+            )
+        return (fields or readable) - exclude
@@ -0,0 +1,47 @@
+from django.db.models import Model
+from django.utils.http import parse_etags, quote_etag
+from rest_framework import status
+from rest_framework.generics import GenericAPIView
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from answerking_app.utils.mixins.ApiExceptions import ProblemDetails
+
+UNSAFE_METHODS: tuple[str, ...] = ("PUT", "PATCH", "DELETE")
+
+
+def make_etag(instance: Model) -> str:
+    return quote_etag(str(instance.version))  # type: ignore[reportGeneralTypeIssues]
+
+
+def check_if_match(request: Request, instance: Model):
+    if_match: str | None = request.headers.get("If-Match")
+    if if_match is None:
+        return
+    etags: list[str] = parse_etags(if_match)
+    if "*" not in etags and make_etag(instance) not in etags:
+        raise ProblemDetails(
+            status=status.HTTP_412_PRECONDITION_FAILED,
+            detail="The resource has been modified since it was fetched",
+            title="Precondition failed",
+        )
+
+
+class VersionMixin(GenericAPIView):
+    def get_object(self) -> Model:
+        instance: Model = super().get_object()
+        if self.request.method in UNSAFE_METHODS:
+            check_if_match(self.request, instance)
+        self.versioned_instance = instance
+        return instance
+
+    def finalize_response(
+        self, request: Request, response: Response, *args, **kwargs
+    ) -> Response:
+        response = super().finalize_response(
+            request, response, *args, **kwargs
+        )
+        instance: Model | None = getattr(self, "versioned_instance", None)
+        if instance is not None and response.status_code == 200:
+            response["ETag"] = make_etag(instance)
+        return response
@@ -85,3 +85,19 @@ class ProblemDetails(TypedDict):
     errors: NotRequired["str | list[Any] | dict[Any, Any]"]
     status: NotRequired[int]
     traceID: NotRequired[str]
+
+
+class SalesRollupType(TypedDict):
+    granularity: str
+    periodStart: datetime.datetime | str
+    productId: int
+    orderStatus: str
+    quantity: int
+    revenue: str | float
+    lineCount: int
+
+
+class ProductPriceType(TypedDict):
+    productId: int
+    price: str | float
+    validFrom: datetime.datetime | str
@@ -0,0 +1,146 @@
+import json
+import operator
+from functools import reduce
+
+from django.conf import settings
+from django.db.models import Q, QuerySet
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination
+from rest_framework.request import Request
+
+PAGE_LINK_EXAMPLES: dict[str, str] = {
+    "next": "http://api.example.org/api/items?cursor=cD0xMjM%3D",
+    "previous": "http://api.example.org/api/items?cursor=cj0xJnA9NDU%3D",
+}
+
+
+class KeysetPagination(CursorPagination):
+    ordering = "id"
+    page_size = settings.PAGINATION_PAGE_SIZE
+    page_size_query_param = "pageSize"
+    max_page_size = 500
+
+    def paginate_queryset(
+        self, queryset: QuerySet, request: Request, view=None
+    ) -> list | None:
+        if not self.is_requested(request):
+            return None
+        self.page_size = self.get_page_size(request)
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+        offset, reverse, current_position = self.cursor or (0, False, None)
+
+        # CursorPagination seeks on the first ordering field only and falls
+        # back to an offset within ties. The position here holds every
+        # ordering field, which always ends with a unique one, so the seek
+        # alone finds the page.
+        ordering: tuple[str, ...] = (
+            reverse_ordering(self.ordering) if reverse else self.ordering
+        )
+        queryset = queryset.order_by(*ordering)
+        if current_position is not None:
+            queryset = queryset.filter(
+                after_position(
+                    ordering, self.decode_position(current_position)
+                )
+            )
+
+        # One extra row tells whether there is a following page
+        end: int = offset + self.page_size + 1
+        results: list = list(queryset[offset:end])
+        self.page = results[: self.page_size]
+        following_position: str | None = (
+            self._get_position_from_instance(results[-1], self.ordering)
+            if len(results) > len(self.page)
+            else None
+        )
+        if reverse:
+            self.page.reverse()
+            self.has_next = current_position is not None or offset > 0
+            self.has_previous = following_position is not None
+            self.next_position = current_position
+            self.previous_position = following_position
+        else:
+            self.has_next = following_position is not None
+            self.has_previous = current_position is not None or offset > 0
+            self.next_position = following_position
+            self.previous_position = current_position
+        return self.page
+
+    def is_requested(self, request: Request) -> bool:
+        return any(
+            param in request.query_params
+            for param in (self.cursor_query_param, self.page_size_query_param)
+        )
+
+    def get_ordering(
+        self, request: Request, queryset: QuerySet, view
+    ) -> tuple[str, ...]:
+        ordering: tuple[str, ...] = super().get_ordering(
+            request, queryset, view
+        )
+        # The seek needs a unique last field
+        if not any(field.lstrip("-") == "id" for field in ordering):
+            ordering += ("id",)
+        return ordering
+
+    def _get_position_from_instance(self, instance, ordering) -> str:
+        return json.dumps(
+            [
+                str(
+                    instance[name]
+                    if isinstance(instance, dict)
+                    else getattr(instance, name)
+                )
+                for name in (field.lstrip("-") for field in ordering)
+            ]
+        )
+
+    def decode_position(self, position: str) -> list[str]:
+        try:
+            values = json.loads(position)
+        except ValueError:
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(values, list) or len(values) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return values
+
+    def get_paginated_response_schema(self, schema: dict) -> dict:
+        paginated: dict = super().get_paginated_response_schema(schema)
+        for link, example in PAGE_LINK_EXAMPLES.items():
+            paginated["properties"][link].update(format="uri", example=example)
+        if not isinstance(schema, dict):
+            # drf_spectacular builds examples by passing a placeholder for
+            # the results, examples show the paginated form
+            return paginated
+        return {
+            "oneOf": [paginated, schema],
+            "description": (
+                "A page of results when `cursor` or `pageSize` is "
+                "provided, otherwise every result."
+            ),
+        }
+
+
+class SalesReportPagination(KeysetPagination):
+    ordering = ("period_start", "id")
+
+
+def reverse_ordering(ordering: tuple[str, ...]) -> tuple[str, ...]:
+    return tuple(
+        field[1:] if field.startswith("-") else f"-{field}"
+        for field in ordering
+    )
+
+
+def after_position(ordering: tuple[str, ...], position: list[str]) -> Q:
+    # Rows after the position when compared field by field in order
+    conditions: list[Q] = []
+    equal = Q()
+    for field, value in zip(ordering, position):
+        name: str = field.lstrip("-")
+        lookup: str = "lt" if field.startswith("-") else "gt"
+        conditions.append(equal & Q(**{f"{name}__{lookup}": value}))
+        equal &= Q(**{name: value})
+    return reduce(operator.or_, conditions)
@@ -0,0 +1,50 @@
+import csv
+import json
+from collections.abc import Iterable, Iterator
+
+from rest_framework.renderers import BaseRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+
+class NDJSONRenderer(BaseRenderer):
+    media_type = "application/x-ndjson"
+    format = "ndjson"
+    charset = "utf-8"
+
+    def render(
+        self, data, accepted_media_type=None, renderer_context=None
+    ) -> bytes:
+        records = [data] if isinstance(data, dict) else data
+        return b"".join(self.stream(records))
+
+    def stream(self, records: Iterable[dict]) -> Iterator[bytes]:
+        for record in records:
+            yield json.dumps(record, cls=JSONEncoder).encode() + b"\n"
+
+
+class _LineBuffer:
+    """File-like object handing back what csv.writer writes to it"""
+
+    def write(self, line: str) -> str:
+        return line
+
+
+class CSVRenderer(BaseRenderer):
+    media_type = "text/csv"
+    format = "csv"
+    charset = "utf-8"
+
+    def render(
+        self, data, accepted_media_type=None, renderer_context=None
+    ) -> bytes:
+        rows = [data] if isinstance(data, dict) else list(data)
+        header: list[str] = list(rows[0]) if rows else []
+        return b"".join(self.stream(rows, header))
+
+    def stream(
+        self, rows: Iterable[dict], header: list[str]
+    ) -> Iterator[bytes]:
+        writer = csv.DictWriter(_LineBuffer(), fieldnames=header)
+        yield writer.writeheader().encode()  # type: ignore[reportOptionalMemberAccess]
+        for row in rows:
+            yield writer.writerow(row).encode()
@@ -8,6 +8,8 @@ from answerking_app.utils.model_types import (
     OrderProductType,
     TagType,
     TagBodyType,
+    SalesRollupType,
+    ProductPriceType,
 )
 
 example_time = "2022-11-23T10:15:36.622Z"
@@ -115,6 +117,14 @@ order_example: OrderType = {
 
 order_body_example: dict = {"lineItems": [{"productId": 0, "quantity": 0}]}
 
+order_line_item_example: dict = {
+    "orderId": 0,
+    "orderTotal": 0,
+    **line_items_example,
+}
+
+order_line_item_body_example: dict = {"quantity": 1}
+
 problem_detail_example: ProblemDetails = {
     "errors": {"name": "The name field is required."},
     "type": "https://testserver/problems/error/",
@@ -124,3 +134,19 @@ problem_detail_example: ProblemDetails = {
     "detail": "string",
     "instance": "string",
 }
+
+sales_rollup_example: SalesRollupType = {
+    "granularity": "hour",
+    "periodStart": "2022-11-23T10:00:00.000000Z",
+    "productId": 0,
+    "orderStatus": "Created",
+    "quantity": 0,
+    "revenue": 0,
+    "lineCount": 0,
+}
+
+product_price_example: ProductPriceType = {
+    "productId": 0,
+    "price": 0,
+    "validFrom": example_time,
+}
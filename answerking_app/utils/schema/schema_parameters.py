@@ -0,0 +1,72 @@
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter
+
+idempotency_key_parameter = OpenApiParameter(
+    name="Idempotency-Key",
+    type=OpenApiTypes.STR,
+    location=OpenApiParameter.HEADER,
+    required=False,
+    description=(
+        "Unique key for this request. Retrying with the same key replays "
+        "the stored response instead of creating the resource again."
+    ),
+)
+
+if_match_parameter = OpenApiParameter(
+    name="If-Match",
+    type=OpenApiTypes.STR,
+    location=OpenApiParameter.HEADER,
+    required=False,
+    description=(
+        "ETag returned when the resource was fetched. The request fails "
+        "with 412 if the resource has been modified since."
+    ),
+)
+
+product_id_path_parameter = OpenApiParameter(
+    name="productId",
+    type=OpenApiTypes.INT,
+    location=OpenApiParameter.PATH,
+    description="Id of the product the line item is for.",
+)
+
+if_none_match_parameter = OpenApiParameter(
+    name="If-None-Match",
+    type=OpenApiTypes.STR,
+    location=OpenApiParameter.HEADER,
+    required=False,
+    description=(
+        "ETag returned by an earlier GET. The response is 304 with no "
+        "body if it still matches."
+    ),
+)
+
+if_modified_since_parameter = OpenApiParameter(
+    name="If-Modified-Since",
+    type=OpenApiTypes.STR,
+    location=OpenApiParameter.HEADER,
+    required=False,
+    description=(
+        "Last-Modified returned by an earlier GET. The response is 304 "
+        "with no body if nothing has changed since."
+    ),
+)
+
+fields_parameter = OpenApiParameter(
+    name="fields",
+    type=OpenApiTypes.STR,
+    location=OpenApiParameter.QUERY,
+    required=False,
+    description=(
+        "Comma separated top level fields to return, for example "
+        "`id,name,price`. Relations that are not returned are not loaded."
+    ),
+)
+
+exclude_parameter = OpenApiParameter(
+    name="exclude",
+    type=OpenApiTypes.STR,
+    location=OpenApiParameter.QUERY,
+    required=False,
+    description="Comma separated top level fields to leave out.",
+)
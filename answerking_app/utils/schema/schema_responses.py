@@ -0,0 +1,16 @@
+from drf_spectacular.utils import OpenApiExample, OpenApiResponse
+
+from answerking_app.models.serializers import ProblemDetailSerializer
+from answerking_app.utils.schema.schema_examples import problem_detail_example
+
+precondition_failed_response = OpenApiResponse(
+    response=ProblemDetailSerializer,
+    description="Precondition Failed.",
+    examples=[
+        OpenApiExample(
+            "Problem response",
+            value=problem_detail_example,
+            response_only=True,
+        )
+    ],
+)
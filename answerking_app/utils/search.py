@@ -0,0 +1,196 @@
+import math
+import re
+import threading
+import time
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from collections import defaultdict
+from functools import cache
+from typing import Iterable
+
+from django.conf import settings
+from django.db import connection
+from django.db.models.expressions import RawSQL
+from django.utils.module_loading import import_string
+
+from answerking_app.models.models import Product
+
+TOKEN_PATTERN = re.compile(r"\w+")
+NAME_WEIGHT = 3.0
+DESCRIPTION_WEIGHT = 1.0
+
+
+def tokenize(text: str | None) -> list[str]:
+    return TOKEN_PATTERN.findall(text.lower()) if text else []
+
+
+def term_weights(name: str, description: str | None) -> dict[str, float]:
+    weights: dict[str, float] = defaultdict(float)
+    for token in tokenize(name):
+        weights[token] += NAME_WEIGHT
+    for token in tokenize(description):
+        weights[token] += DESCRIPTION_WEIGHT
+    return weights
+
+
+class ProductSearchBackend(ABC):
+    """Ranks active products matching every term of a search query.
+
+    Each query term also matches words it is a prefix of, so results
+    update as a kiosk user types.
+    """
+
+    @abstractmethod
+    def search(self, query: str, limit: int) -> list[int]:
+        ...
+
+    def index(self, product: Product):
+        pass
+
+    def remove(self, product_id: int):
+        pass
+
+    def invalidate(self):
+        pass
+
+    def refresh(self, product_ids: Iterable[int]):
+        # For changes made with queryset.update(), which sends no signals
+        product_ids = list(product_ids)
+        products: dict[int, Product] = Product.objects.in_bulk(product_ids)
+        for product_id in product_ids:
+            if product_id in products:
+                self.index(products[product_id])
+            else:
+                self.remove(product_id)
+
+
+class MySQLFullTextSearch(ProductSearchBackend):
+    # MySQL maintains the FULLTEXT index itself, index() and remove() are
+    # no-ops
+    def search(self, query: str, limit: int) -> list[int]:
+        terms: list[str] = tokenize(query)
+        if not terms:
+            return []
+        table: str = Product._meta.db_table
+        score = RawSQL(
+            f"MATCH ({table}.name, {table}.description) "
+            "AGAINST (%s IN BOOLEAN MODE)",
+            (" ".join(f"+{term}*" for term in terms),),
+        )
+        return list(
+            Product.objects.filter(retired=False)
+            .annotate(score=score)
+            .filter(score__gt=0)
+            .order_by("-score", "id")
+            .values_list("id", flat=True)[:limit]
+        )
+
+
+class InvertedIndexSearch(ProductSearchBackend):
+    # Kept current in this process by the Product signals and rebuilt from
+    # the database every PRODUCT_SEARCH_INDEX_TTL seconds, so processes
+    # that did not make a change pick it up.
+    def __init__(self):
+        self.ttl: float = settings.PRODUCT_SEARCH_INDEX_TTL
+        self.lock = threading.Lock()
+        self.built_at: float | None = None
+        self.postings: dict[str, dict[int, float]] = defaultdict(dict)
+        self.product_terms: dict[int, set[str]] = {}
+        # Sorted lazily for prefix lookups, None when terms have changed
+        self.vocabulary: list[str] | None = None
+
+    def search(self, query: str, limit: int) -> list[int]:
+        terms: list[str] = tokenize(query)
+        if not terms:
+            return []
+        self.ensure_built()
+        with self.lock:
+            num_products: int = len(self.product_terms)
+            scores: dict[int, float] | None = None
+            for term in terms:
+                term_scores: dict[int, float] = defaultdict(float)
+                for word in self.expand(term):
+                    postings: dict[int, float] = self.postings[word]
+                    idf: float = math.log(1 + num_products / len(postings))
+                    for product_id, weight in postings.items():
+                        term_scores[product_id] += weight * idf
+                scores = (
+                    term_scores
+                    if scores is None
+                    else {
+                        product_id: score + term_scores[product_id]
+                        for product_id, score in scores.items()
+                        if product_id in term_scores
+                    }
+                )
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        return [product_id for product_id, _ in ranked[:limit]]
+
+    def expand(self, term: str) -> list[str]:
+        if self.vocabulary is None:
+            self.vocabulary = sorted(self.postings)
+        words: list[str] = []
+        start: int = bisect_left(self.vocabulary, term)
+        for word in self.vocabulary[start:]:
+            if not word.startswith(term):
+                break
+            words.append(word)
+        return words
+
+    def index(self, product: Product):
+        if product.retired:
+            self.remove(product.id)
+            return
+        weights = term_weights(product.name, product.description)
+        with self.lock:
+            self._remove(product.id)
+            self._add(product.id, weights)
+
+    def remove(self, product_id: int):
+        with self.lock:
+            self._remove(product_id)
+
+    def invalidate(self):
+        with self.lock:
+            self.built_at = None
+
+    def ensure_built(self):
+        with self.lock:
+            if self.is_fresh():
+                return
+            self.postings = defaultdict(dict)
+            self.product_terms = {}
+            products = Product.objects.filter(retired=False).values_list(
+                "id", "name", "description"
+            )
+            for product_id, name, description in products.iterator():
+                self._add(product_id, term_weights(name, description))
+            self.built_at = time.monotonic()
+
+    def is_fresh(self) -> bool:
+        if self.built_at is None:
+            return False
+        return time.monotonic() - self.built_at < self.ttl
+
+    def _add(self, product_id: int, weights: dict[str, float]):
+        self.vocabulary = None
+        for token, weight in weights.items():
+            self.postings[token][product_id] = weight
+        self.product_terms[product_id] = set(weights)
+
+    def _remove(self, product_id: int):
+        for token in self.product_terms.pop(product_id, ()):
+            self.postings[token].pop(product_id, None)
+            if not self.postings[token]:
+                del self.postings[token]
+                self.vocabulary = None
+
+
+@cache
+def get_search_backend() -> ProductSearchBackend:
+    backend: str = settings.PRODUCT_SEARCH_BACKEND or (
+        "answerking_app.utils.search.MySQLFullTextSearch"
+        if connection.vendor == "mysql"
+        else "answerking_app.utils.search.InvertedIndexSearch"
+    )
+    return import_string(backend)()
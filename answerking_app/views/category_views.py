@@ -3,15 +3,31 @@ from rest_framework import generics, mixins
 from rest_framework.request import Request
 from rest_framework.response import Response
 
-from answerking_app.models.models import Category
+from answerking_app.models.models import Category, Product
 from answerking_app.models.serializers import (
+    BulkRetireSerializer,
     CategorySerializer,
     ProblemDetailSerializer,
+    ProductSerializer,
+)
+from answerking_app.utils.filters import CategoryProductFilter
+from answerking_app.utils.mixins.CatalogueCacheMixin import (
+    CatalogueCacheMixin,
 )
 from answerking_app.utils.mixins.CategoryProductMixins import (
     CategoryProductListMixin,
 )
-from answerking_app.utils.mixins.RetireMixin import RetireMixin
+from answerking_app.utils.mixins.ConditionalGetMixin import (
+    ConditionalGetMixin,
+)
+from answerking_app.utils.mixins.IdempotencyMixin import IdempotencyMixin
+from answerking_app.utils.mixins.RetireMixin import (
+    BulkRetireMixin,
+    RetireMixin,
+)
+from answerking_app.utils.mixins.SparseFieldsMixin import SparseFieldsMixin
+from answerking_app.utils.mixins.VersionMixin import VersionMixin
+from answerking_app.utils.pagination import KeysetPagination
 from answerking_app.utils.url_parameter_check import check_url_parameter
 
 from drf_spectacular.utils import (
@@ -26,19 +42,41 @@ from answerking_app.utils.schema.schema_examples import (
     category_products_body_example,
     product_example,
 )
+from answerking_app.utils.schema.schema_parameters import (
+    exclude_parameter,
+    fields_parameter,
+    idempotency_key_parameter,
+    if_match_parameter,
+    if_modified_since_parameter,
+    if_none_match_parameter,
+)
+from answerking_app.utils.schema.schema_responses import (
+    precondition_failed_response,
+)
 
 
 class CategoryListView(
+    CatalogueCacheMixin,
+    ConditionalGetMixin,
+    IdempotencyMixin,
+    SparseFieldsMixin,
     mixins.ListModelMixin,
     mixins.CreateModelMixin,
     generics.GenericAPIView,
 ):
     queryset: QuerySet = Category.objects.all()
     serializer_class: CategorySerializer = CategorySerializer
+    pagination_class = KeysetPagination
 
     @extend_schema(
         tags=["Inventory"],
         summary="Get all categories.",
+        parameters=[
+            fields_parameter,
+            exclude_parameter,
+            if_none_match_parameter,
+            if_modified_since_parameter,
+        ],
         responses={
             200: OpenApiResponse(
                 response=CategorySerializer,
@@ -50,7 +88,8 @@ class CategoryListView(
                         response_only=True,
                     )
                 ],
-            )
+            ),
+            304: OpenApiResponse(description="Not Modified."),
         },
     )
     def get(self, request: Request, *args, **kwargs) -> Response:
@@ -59,6 +98,7 @@ class CategoryListView(
     @extend_schema(
         tags=["Inventory"],
         summary="Create a new category.",
+        parameters=[idempotency_key_parameter],
         examples=[
             OpenApiExample(
                 "Request body", value=category_body_example, request_only=True
@@ -93,7 +133,109 @@ class CategoryListView(
         return self.create(request, *args, **kwargs)
 
 
+class CategoryRetireView(BulkRetireMixin, generics.GenericAPIView):
+    queryset: QuerySet = Category.objects.all()
+    serializer_class = BulkRetireSerializer
+
+    @extend_schema(
+        tags=["Inventory"],
+        summary="Retire several categories at once.",
+        description=(
+            "Either every category is retired or none is. Categories "
+            "that are already retired are left as they are."
+        ),
+        request=BulkRetireSerializer,
+        examples=[
+            OpenApiExample(
+                "Request body",
+                value={"ids": [1, 2, 3]},
+                request_only=True,
+            )
+        ],
+        responses={
+            204: OpenApiResponse(description="No Content."),
+            400: OpenApiResponse(
+                response=ProblemDetailSerializer,
+                description="Invalid ids are provided.",
+                examples=[
+                    OpenApiExample(
+                        "Problem response",
+                        value=problem_detail_example,
+                        response_only=True,
+                    )
+                ],
+            ),
+            404: OpenApiResponse(
+                response=ProblemDetailSerializer,
+                description="Some of the given ids do not exist.",
+                examples=[
+                    OpenApiExample(
+                        "Problem response",
+                        value=problem_detail_example,
+                        response_only=True,
+                    )
+                ],
+            ),
+        },
+    )
+    def post(self, request: Request, *args, **kwargs) -> Response:
+        return self.bulk_retire(request, *args, **kwargs)
+
+
+class CategoryUnretireView(BulkRetireMixin, generics.GenericAPIView):
+    queryset: QuerySet = Category.objects.all()
+    serializer_class = BulkRetireSerializer
+
+    @extend_schema(
+        tags=["Inventory"],
+        summary="Unretire several categories at once.",
+        description=(
+            "Either every category is unretired or none is. Categories "
+            "that are not retired are left as they are."
+        ),
+        request=BulkRetireSerializer,
+        examples=[
+            OpenApiExample(
+                "Request body",
+                value={"ids": [1, 2, 3]},
+                request_only=True,
+            )
+        ],
+        responses={
+            204: OpenApiResponse(description="No Content."),
+            400: OpenApiResponse(
+                response=ProblemDetailSerializer,
+                description="Invalid ids are provided.",
+                examples=[
+                    OpenApiExample(
+                        "Problem response",
+                        value=problem_detail_example,
+                        response_only=True,
+                    )
+                ],
+            ),
+            404: OpenApiResponse(
+                response=ProblemDetailSerializer,
+                description="Some of the given ids do not exist.",
+                examples=[
+                    OpenApiExample(
+                        "Problem response",
+                        value=problem_detail_example,
+                        response_only=True,
+                    )
+                ],
+            ),
+        },
+    )
+    def post(self, request: Request, *args, **kwargs) -> Response:
+        return self.bulk_unretire(request, *args, **kwargs)
+
+
 class CategoryDetailView(
+    CatalogueCacheMixin,
+    ConditionalGetMixin,
+    VersionMixin,
+    SparseFieldsMixin,
     mixins.RetrieveModelMixin,
     mixins.UpdateModelMixin,
     RetireMixin,
@@ -106,6 +248,12 @@ class CategoryDetailView(
     @extend_schema(
         tags=["Inventory"],
         summary="Get a single category.",
+        parameters=[
+            fields_parameter,
+            exclude_parameter,
+            if_none_match_parameter,
+            if_modified_since_parameter,
+        ],
         responses={
             200: OpenApiResponse(
                 response=CategorySerializer,
@@ -140,6 +288,7 @@ class CategoryDetailView(
                     )
                 ],
             ),
+            304: OpenApiResponse(description="Not Modified."),
         },
     )
     def get(self, request: Request, *args, **kwargs) -> Response:
@@ -149,6 +298,7 @@ class CategoryDetailView(
     @extend_schema(
         tags=["Inventory"],
         summary="Update an existing category",
+        parameters=[if_match_parameter],
         examples=[
             OpenApiExample(
                 "Request body",
@@ -190,6 +340,7 @@ class CategoryDetailView(
                     )
                 ],
             ),
+            412: precondition_failed_response,
         },
     )
     def put(self, request: Request, *args, **kwargs) -> Response:
@@ -199,6 +350,7 @@ class CategoryDetailView(
     @extend_schema(
         tags=["Inventory"],
         summary="Retire an existing category",
+        parameters=[if_match_parameter],
         responses={
             204: OpenApiResponse(description="No Content."),
             400: OpenApiResponse(
@@ -234,6 +386,7 @@ class CategoryDetailView(
                     )
                 ],
             ),
+            412: precondition_failed_response,
         },
     )
     def delete(self, request: Request, *args, **kwargs) -> Response:
@@ -242,22 +395,27 @@ class CategoryDetailView(
 
 
 class CategoryProductListView(
+    CatalogueCacheMixin,
     CategoryProductListMixin,
+    mixins.ListModelMixin,
     generics.GenericAPIView,
 ):
-    queryset: QuerySet = Category.objects.all()
-    serializer_class: CategorySerializer = CategorySerializer
+    queryset: QuerySet = Product.objects.all()
+    serializer_class: ProductSerializer = ProductSerializer
+    pagination_class = KeysetPagination
+    filter_backends = [CategoryProductFilter]
 
     @extend_schema(
         tags=["Inventory"],
         summary="Get all products in a category.",
+        parameters=[fields_parameter, exclude_parameter],
         responses={
             200: OpenApiResponse(
-                response=CategorySerializer,
+                response=ProductSerializer,
                 description="When all the products have been returned.",
                 examples=[
                     OpenApiExample(
-                        "Category response",
+                        "Product example",
                         value=product_example,
                         response_only=True,
                     )
@@ -289,4 +447,4 @@ class CategoryProductListView(
     )
     def get(self, request: Request, **kwargs) -> Response:
         check_url_parameter(kwargs["pk"])
-        return self.list(**kwargs)
+        return self.list(request, **kwargs)
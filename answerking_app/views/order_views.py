@@ -1,18 +1,37 @@
 from typing import Literal
 
+from django.conf import settings
 from django.db.models import QuerySet
+from django.http import StreamingHttpResponse
 from rest_framework import generics, mixins
+from rest_framework.renderers import JSONRenderer
 from rest_framework.request import Request
 from rest_framework.response import Response
 
 from answerking_app.models.models import Order
 from answerking_app.models.serializers import (
+    OrderBatchResultSerializer,
+    OrderLineItemSerializer,
     OrderSerializer,
     ProblemDetailSerializer,
 )
+from answerking_app.utils.exports import stream_orders
+from answerking_app.utils.filters import OrderFilter
+from answerking_app.utils.mixins.ArchivedOrderMixin import ArchivedOrderMixin
+from answerking_app.utils.mixins.ConditionalGetMixin import (
+    ConditionalGetMixin,
+)
+from answerking_app.utils.mixins.EagerLoadingMixin import EagerLoadingMixin
+from answerking_app.utils.mixins.IdempotencyMixin import IdempotencyMixin
+from answerking_app.utils.mixins.OrderBatchMixin import OrderBatchCreateMixin
+from answerking_app.utils.mixins.OrderLineItemMixin import OrderLineItemMixin
 from answerking_app.utils.mixins.RetireMixin import CancelOrderMixin
+from answerking_app.utils.mixins.VersionMixin import VersionMixin
+from answerking_app.utils.pagination import KeysetPagination
+from answerking_app.utils.renderers import CSVRenderer, NDJSONRenderer
 from answerking_app.utils.url_parameter_check import check_url_parameter
 
+from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import (
     extend_schema,
     OpenApiExample,
@@ -21,22 +40,47 @@ from drf_spectacular.utils import (
 
 from answerking_app.utils.schema.schema_examples import (
     order_example,
+    order_line_item_body_example,
+    order_line_item_example,
     order_body_example,
     problem_detail_example,
 )
+from answerking_app.utils.schema.schema_parameters import (
+    exclude_parameter,
+    fields_parameter,
+    idempotency_key_parameter,
+    if_match_parameter,
+    if_modified_since_parameter,
+    if_none_match_parameter,
+    product_id_path_parameter,
+)
+from answerking_app.utils.schema.schema_responses import (
+    precondition_failed_response,
+)
 
 
 class OrderListView(
+    ConditionalGetMixin,
+    IdempotencyMixin,
+    EagerLoadingMixin,
     mixins.ListModelMixin,
     mixins.CreateModelMixin,
     generics.GenericAPIView,
 ):
     queryset: QuerySet = Order.objects.all()
     serializer_class: OrderSerializer = OrderSerializer
+    pagination_class = KeysetPagination
+    filter_backends = [OrderFilter]
 
     @extend_schema(
         tags=["Orders"],
         summary="Get all orders.",
+        parameters=[
+            fields_parameter,
+            exclude_parameter,
+            if_none_match_parameter,
+            if_modified_since_parameter,
+        ],
         responses={
             200: OpenApiResponse(
                 response=OrderSerializer,
@@ -44,7 +88,8 @@ class OrderListView(
                 examples=[
                     OpenApiExample("Category example", value=order_example)
                 ],
-            )
+            ),
+            304: OpenApiResponse(description="Not Modified."),
         },
     )
     def get(self, request: Request, *args, **kwargs) -> Response:
@@ -53,6 +98,7 @@ class OrderListView(
     @extend_schema(
         tags=["Orders"],
         summary="Create a new order.",
+        parameters=[idempotency_key_parameter],
         examples=[
             OpenApiExample(
                 "Request body", value=order_body_example, request_only=True
@@ -87,7 +133,113 @@ class OrderListView(
         return self.create(request)
 
 
+class OrderBatchView(
+    IdempotencyMixin,
+    OrderBatchCreateMixin,
+    generics.GenericAPIView,
+):
+    queryset: QuerySet = Order.objects.all()
+    serializer_class: OrderSerializer = OrderSerializer
+
+    @extend_schema(
+        tags=["Orders"],
+        summary="Create a batch of orders.",
+        parameters=[idempotency_key_parameter],
+        request=OrderSerializer(many=True),
+        examples=[
+            OpenApiExample(
+                "Request body",
+                value=[order_body_example],
+                request_only=True,
+            )
+        ],
+        responses={
+            201: OpenApiResponse(
+                response=OrderBatchResultSerializer(many=True),
+                description="Every order in the batch has been created.",
+            ),
+            207: OpenApiResponse(
+                response=OrderBatchResultSerializer(many=True),
+                description="Some orders in the batch were invalid. Each "
+                "result holds the created order or the problem details.",
+            ),
+            400: OpenApiResponse(
+                response=ProblemDetailSerializer,
+                description="The body is not a list or the batch is too big.",
+                examples=[
+                    OpenApiExample(
+                        "Problem response",
+                        value=problem_detail_example,
+                        response_only=True,
+                    )
+                ],
+            ),
+        },
+    )
+    def post(self, request: Request, *args, **kwargs) -> Response:
+        return self.create(request, *args, **kwargs)
+
+
+class OrderExportView(generics.GenericAPIView):
+    queryset: QuerySet = Order.objects.all()
+    renderer_classes = [NDJSONRenderer, CSVRenderer]
+    filter_backends = [OrderFilter]
+
+    @extend_schema(
+        tags=["Orders"],
+        summary="Stream all orders as NDJSON or CSV.",
+        description=(
+            "NDJSON has one order per line, CSV one row per line item. "
+            "Pick the format with the Accept header or `?format=`."
+        ),
+        responses={
+            200: OpenApiResponse(
+                response=OpenApiTypes.STR,
+                description="The orders are streamed as a file.",
+            ),
+            400: OpenApiResponse(
+                response=ProblemDetailSerializer,
+                description="The filter parameters are invalid.",
+                examples=[
+                    OpenApiExample(
+                        "Problem response",
+                        value=problem_detail_example,
+                        response_only=True,
+                    )
+                ],
+            ),
+        },
+    )
+    def get(self, request: Request, *args, **kwargs) -> StreamingHttpResponse:
+        renderer: CSVRenderer | NDJSONRenderer = request.accepted_renderer  # type: ignore[reportGeneralTypeIssues]
+        response = StreamingHttpResponse(
+            stream_orders(
+                self.filter_queryset(self.get_queryset()),
+                renderer,
+                settings.ORDER_EXPORT_CHUNK_SIZE,
+            ),
+            content_type=f"{renderer.media_type}; charset={renderer.charset}",
+        )
+        response[
+            "Content-Disposition"
+        ] = f'attachment; filename="orders.{renderer.format}"'
+        return response
+
+    def finalize_response(
+        self, request: Request, response, *args, **kwargs
+    ) -> Response:
+        # Problem responses are never rendered as NDJSON or CSV
+        if isinstance(response, Response):
+            request.accepted_renderer = JSONRenderer()
+            request.accepted_media_type = JSONRenderer.media_type
+        return super().finalize_response(request, response, *args, **kwargs)
+
+
 class OrderDetailView(
+    ConditionalGetMixin,
+    VersionMixin,
+    ArchivedOrderMixin,
+    EagerLoadingMixin,
     mixins.RetrieveModelMixin,
     mixins.UpdateModelMixin,
     CancelOrderMixin,
@@ -100,6 +252,12 @@ class OrderDetailView(
     @extend_schema(
         tags=["Orders"],
         summary="Get a single order.",
+        parameters=[
+            fields_parameter,
+            exclude_parameter,
+            if_none_match_parameter,
+            if_modified_since_parameter,
+        ],
         responses={
             200: OpenApiResponse(
                 response=OrderSerializer,
@@ -123,6 +281,7 @@ class OrderDetailView(
                     )
                 ],
             ),
+            304: OpenApiResponse(description="Not Modified."),
         },
     )
     def get(self, request: Request, *args, **kwargs) -> Response:
@@ -132,6 +291,7 @@ class OrderDetailView(
     @extend_schema(
         tags=["Orders"],
         summary="Update an existing order.",
+        parameters=[if_match_parameter],
         examples=[
             OpenApiExample(
                 "Request body",
@@ -173,6 +333,19 @@ class OrderDetailView(
                     )
                 ],
             ),
+            410: OpenApiResponse(
+                response=ProblemDetailSerializer,
+                description="The order has been archived or one of its "
+                "products has been retired.",
+                examples=[
+                    OpenApiExample(
+                        "Problem response",
+                        value=problem_detail_example,
+                        response_only=True,
+                    )
+                ],
+            ),
+            412: precondition_failed_response,
         },
     )
     def put(self, request: Request, *args, **kwargs) -> Response:
@@ -182,6 +355,7 @@ class OrderDetailView(
     @extend_schema(
         tags=["Orders"],
         summary="Cancel an existing order",
+        parameters=[if_match_parameter],
         responses={
             204: OpenApiResponse(description="No Content."),
             400: OpenApiResponse(
@@ -206,8 +380,183 @@ class OrderDetailView(
                     )
                 ],
             ),
+            410: OpenApiResponse(
+                response=ProblemDetailSerializer,
+                description="The order has been archived.",
+                examples=[
+                    OpenApiExample(
+                        "Problem response",
+                        value=problem_detail_example,
+                        response_only=True,
+                    )
+                ],
+            ),
+            412: precondition_failed_response,
         },
     )
     def delete(self, request: Request, *args, **kwargs) -> Response:
         check_url_parameter(kwargs["pk"])
         return self.cancel_order(request, *args, **kwargs)
+
+
+class OrderLineItemView(OrderLineItemMixin, generics.GenericAPIView):
+    queryset: QuerySet = Order.objects.all()
+    serializer_class: OrderLineItemSerializer = OrderLineItemSerializer
+
+    @extend_schema(
+        tags=["Orders"],
+        summary="Add a product to an order.",
+        parameters=[product_id_path_parameter, if_match_parameter],
+        examples=[
+            OpenApiExample(
+                "Request body",
+                value=order_line_item_body_example,
+                request_only=True,
+            )
+        ],
+        responses={
+            201: OpenApiResponse(
+                response=OrderLineItemSerializer,
+                description="The line item has been added to the order.",
+                examples=[
+                    OpenApiExample(
+                        "Line item response",
+                        value=order_line_item_example,
+                        response_only=True,
+                    )
+                ],
+            ),
+            400: OpenApiResponse(
+                response=ProblemDetailSerializer,
+                description="The request is invalid or the order can no longer be changed.",
+                examples=[
+                    OpenApiExample(
+                        "Problem response",
+                        value=problem_detail_example,
+                        response_only=True,
+                    )
+                ],
+            ),
+            404: OpenApiResponse(
+                response=ProblemDetailSerializer,
+                description="The order, product or line item does not exist.",
+                examples=[
+                    OpenApiExample(
+                        "Problem response",
+                        value=problem_detail_example,
+                        response_only=True,
+                    )
+                ],
+            ),
+            410: OpenApiResponse(
+                response=ProblemDetailSerializer,
+                description="The product has been retired.",
+                examples=[
+                    OpenApiExample(
+                        "Problem response",
+                        value=problem_detail_example,
+                        response_only=True,
+                    )
+                ],
+            ),
+            412: precondition_failed_response,
+        },
+    )
+    def post(self, request: Request, *args, **kwargs) -> Response:
+        return self.add_line_item(request, *args, **kwargs)
+
+    @extend_schema(
+        tags=["Orders"],
+        summary="Change the quantity of a product in an order.",
+        parameters=[product_id_path_parameter, if_match_parameter],
+        examples=[
+            OpenApiExample(
+                "Request body",
+                value=order_line_item_body_example,
+                request_only=True,
+            )
+        ],
+        responses={
+            200: OpenApiResponse(
+                response=OrderLineItemSerializer,
+                description="The line item has been updated.",
+                examples=[
+                    OpenApiExample(
+                        "Line item response",
+                        value=order_line_item_example,
+                        response_only=True,
+                    )
+                ],
+            ),
+            400: OpenApiResponse(
+                response=ProblemDetailSerializer,
+                description="The request is invalid or the order can no longer be changed.",
+                examples=[
+                    OpenApiExample(
+                        "Problem response",
+                        value=problem_detail_example,
+                        response_only=True,
+                    )
+                ],
+            ),
+            404: OpenApiResponse(
+                response=ProblemDetailSerializer,
+                description="The order, product or line item does not exist.",
+                examples=[
+                    OpenApiExample(
+                        "Problem response",
+                        value=problem_detail_example,
+                        response_only=True,
+                    )
+                ],
+            ),
+            410: OpenApiResponse(
+                response=ProblemDetailSerializer,
+                description="The product has been retired.",
+                examples=[
+                    OpenApiExample(
+                        "Problem response",
+                        value=problem_detail_example,
+                        response_only=True,
+                    )
+                ],
+            ),
+            412: precondition_failed_response,
+        },
+    )
+    def patch(self, request: Request, *args, **kwargs) -> Response:
+        return self.update_line_item(request, *args, **kwargs)
+
+    @extend_schema(
+        tags=["Orders"],
+        summary="Remove a product from an order.",
+        parameters=[product_id_path_parameter, if_match_parameter],
+        responses={
+            204: OpenApiResponse(description="No Content."),
+            400: OpenApiResponse(
+                response=ProblemDetailSerializer,
+                description="The request is invalid or the order can no longer be changed.",
+                examples=[
+                    OpenApiExample(
+                        "Problem response",
+                        value=problem_detail_example,
+                        response_only=True,
+                    )
+                ],
+            ),
+            404: OpenApiResponse(
+                response=ProblemDetailSerializer,
+                description="The order, product or line item does not exist.",
+                examples=[
+                    OpenApiExample(
+                        "Problem response",
+                        value=problem_detail_example,
+                        response_only=True,
+                    )
+                ],
+            ),
+            412: precondition_failed_response,
+        },
+    )
+    def delete(self, request: Request, *args, **kwargs) -> Response:
+        return self.remove_line_item(request, *args, **kwargs)
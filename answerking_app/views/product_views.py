@@ -1,39 +1,98 @@
+from django.conf import settings
 from django.db.models import QuerySet
+from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import (
     OpenApiExample,
     OpenApiResponse,
     extend_schema,
 )
-from rest_framework import generics, mixins
+from rest_framework import generics, mixins, status
+from rest_framework.exceptions import UnsupportedMediaType
 from rest_framework.request import Request
 from rest_framework.response import Response
 
-from answerking_app.models.models import Product
+from answerking_app.models.models import Product, ProductPrice
 from answerking_app.models.serializers import (
+    BulkRetireSerializer,
     ProblemDetailSerializer,
+    ProductImportResultSerializer,
+    ProductPriceSerializer,
     ProductSerializer,
 )
-from answerking_app.utils.mixins.RetireMixin import RetireMixin
+from answerking_app.utils.filters import (
+    PriceAsOfSerializer,
+    ProductFilter,
+    ProductOrdering,
+    ProductPricesSerializer,
+    ProductSearchSerializer,
+)
+from answerking_app.utils.imports import (
+    import_products,
+    iter_csv_records,
+    iter_json_records,
+    iter_text,
+)
+from answerking_app.utils.mixins.ApiExceptions import ProblemDetails
+from answerking_app.utils.mixins.CatalogueCacheMixin import (
+    CatalogueCacheMixin,
+)
+from answerking_app.utils.mixins.ConditionalGetMixin import (
+    ConditionalGetMixin,
+)
+from answerking_app.utils.mixins.EagerLoadingMixin import EagerLoadingMixin
+from answerking_app.utils.mixins.IdempotencyMixin import IdempotencyMixin
+from answerking_app.utils.mixins.RetireMixin import (
+    BulkRetireMixin,
+    RetireMixin,
+)
+from answerking_app.utils.mixins.SparseFieldsMixin import SparseFieldsMixin
+from answerking_app.utils.mixins.VersionMixin import VersionMixin
+from answerking_app.utils.pagination import KeysetPagination
 from answerking_app.utils.schema.schema_examples import (
     problem_detail_example,
     product_body_example,
     product_categories_body_example,
     product_example,
+    product_price_example,
+)
+from answerking_app.utils.schema.schema_parameters import (
+    exclude_parameter,
+    fields_parameter,
+    idempotency_key_parameter,
+    if_match_parameter,
+    if_modified_since_parameter,
+    if_none_match_parameter,
 )
+from answerking_app.utils.schema.schema_responses import (
+    precondition_failed_response,
+)
+from answerking_app.utils.search import get_search_backend
 from answerking_app.utils.url_parameter_check import check_url_parameter
 
 
 class ProductListView(
+    CatalogueCacheMixin,
+    ConditionalGetMixin,
+    IdempotencyMixin,
+    EagerLoadingMixin,
     mixins.ListModelMixin,
     mixins.CreateModelMixin,
     generics.GenericAPIView,
 ):
     queryset: QuerySet = Product.objects.all()
     serializer_class: ProductSerializer = ProductSerializer
+    pagination_class = KeysetPagination
+    filter_backends = [ProductFilter, ProductOrdering]
 
     @extend_schema(
         tags=["Inventory"],
         summary="Get all products.",
+        parameters=[
+            fields_parameter,
+            exclude_parameter,
+            if_none_match_parameter,
+            if_modified_since_parameter,
+        ],
         responses={
             200: OpenApiResponse(
                 response=ProductSerializer,
@@ -45,7 +104,8 @@ class ProductListView(
                         response_only=True,
                     )
                 ],
-            )
+            ),
+            304: OpenApiResponse(description="Not Modified."),
         },
     )
     def get(self, request: Request, *args, **kwargs) -> Response:
@@ -54,6 +114,7 @@ class ProductListView(
     @extend_schema(
         tags=["Inventory"],
         summary="Create a new product.",
+        parameters=[idempotency_key_parameter],
         examples=[
             OpenApiExample(
                 "Request body", value=product_body_example, request_only=True
@@ -88,8 +149,235 @@ class ProductListView(
         return self.create(request, *args, **kwargs)
 
 
+class ProductImportView(generics.GenericAPIView):
+    queryset: QuerySet = Product.objects.all()
+    serializer_class = ProductImportResultSerializer
+    parsers = {
+        "text/csv": iter_csv_records,
+        "application/json": iter_json_records,
+        "application/x-ndjson": iter_json_records,
+    }
+
+    @extend_schema(
+        tags=["Inventory"],
+        summary="Create or update products in bulk.",
+        description=(
+            "Products are matched by name. JSON bodies hold an array or one "
+            "object per line, CSV bodies list tag ids separated by ;. The "
+            "body is read as a stream and written in batches."
+        ),
+        request={
+            "application/json": ProductSerializer(many=True),
+            "application/x-ndjson": ProductSerializer,
+            "text/csv": OpenApiTypes.STR,
+        },
+        responses={
+            200: OpenApiResponse(
+                response=ProductImportResultSerializer,
+                description="Every row has been imported.",
+            ),
+            207: OpenApiResponse(
+                response=ProductImportResultSerializer,
+                description="Some rows were invalid and have been skipped. "
+                "Their errors are listed by row number. When the body stops "
+                "parsing, the rows before it are imported and the rest of "
+                "the body is not.",
+            ),
+            415: OpenApiResponse(
+                response=ProblemDetailSerializer,
+                description="The body is not CSV, JSON or NDJSON.",
+                examples=[
+                    OpenApiExample(
+                        "Problem response",
+                        value=problem_detail_example,
+                        response_only=True,
+                    )
+                ],
+            ),
+        },
+    )
+    def post(self, request: Request, *args, **kwargs) -> Response:
+        media_type: str = request.content_type.split(";")[0].strip()
+        if media_type not in self.parsers:
+            raise UnsupportedMediaType(media_type)
+        # Read straight from the stream, request.data would load it all
+        records = (
+            self.parsers[media_type](
+                iter_text(
+                    request.stream,
+                    request.content_params.get("charset", "utf-8"),  # type: ignore[reportGeneralTypeIssues]
+                )
+            )
+            if request.stream is not None
+            else []
+        )
+        result = import_products(records, settings.PRODUCT_IMPORT_BATCH_SIZE)
+        return Response(
+            self.get_serializer(result).data,
+            status=status.HTTP_207_MULTI_STATUS
+            if result.errors
+            else status.HTTP_200_OK,
+        )
+
+
+class ProductRetireView(BulkRetireMixin, generics.GenericAPIView):
+    queryset: QuerySet = Product.objects.all()
+    serializer_class = BulkRetireSerializer
+
+    @extend_schema(
+        tags=["Inventory"],
+        summary="Retire several products at once.",
+        description=(
+            "Either every product is retired or none is. Products "
+            "that are already retired are left as they are."
+        ),
+        request=BulkRetireSerializer,
+        examples=[
+            OpenApiExample(
+                "Request body",
+                value={"ids": [1, 2, 3]},
+                request_only=True,
+            )
+        ],
+        responses={
+            204: OpenApiResponse(description="No Content."),
+            400: OpenApiResponse(
+                response=ProblemDetailSerializer,
+                description="Invalid ids are provided or some of the "
+                "products are in an active order.",
+                examples=[
+                    OpenApiExample(
+                        "Problem response",
+                        value=problem_detail_example,
+                        response_only=True,
+                    )
+                ],
+            ),
+            404: OpenApiResponse(
+                response=ProblemDetailSerializer,
+                description="Some of the given ids do not exist.",
+                examples=[
+                    OpenApiExample(
+                        "Problem response",
+                        value=problem_detail_example,
+                        response_only=True,
+                    )
+                ],
+            ),
+        },
+    )
+    def post(self, request: Request, *args, **kwargs) -> Response:
+        return self.bulk_retire(request, *args, **kwargs)
+
+
+class ProductUnretireView(BulkRetireMixin, generics.GenericAPIView):
+    queryset: QuerySet = Product.objects.all()
+    serializer_class = BulkRetireSerializer
+
+    @extend_schema(
+        tags=["Inventory"],
+        summary="Unretire several products at once.",
+        description=(
+            "Either every product is unretired or none is. Products "
+            "that are not retired are left as they are."
+        ),
+        request=BulkRetireSerializer,
+        examples=[
+            OpenApiExample(
+                "Request body",
+                value={"ids": [1, 2, 3]},
+                request_only=True,
+            )
+        ],
+        responses={
+            204: OpenApiResponse(description="No Content."),
+            400: OpenApiResponse(
+                response=ProblemDetailSerializer,
+                description="Invalid ids are provided.",
+                examples=[
+                    OpenApiExample(
+                        "Problem response",
+                        value=problem_detail_example,
+                        response_only=True,
+                    )
+                ],
+            ),
+            404: OpenApiResponse(
+                response=ProblemDetailSerializer,
+                description="Some of the given ids do not exist.",
+                examples=[
+                    OpenApiExample(
+                        "Problem response",
+                        value=problem_detail_example,
+                        response_only=True,
+                    )
+                ],
+            ),
+        },
+    )
+    def post(self, request: Request, *args, **kwargs) -> Response:
+        return self.bulk_unretire(request, *args, **kwargs)
+
+
+class ProductSearchView(SparseFieldsMixin, generics.GenericAPIView):
+    queryset: QuerySet = Product.objects.filter(retired=False)
+    serializer_class: ProductSerializer = ProductSerializer
+
+    @extend_schema(
+        tags=["Inventory"],
+        summary="Search active products by name and description.",
+        parameters=[
+            ProductSearchSerializer,
+            fields_parameter,
+            exclude_parameter,
+        ],
+        responses={
+            200: OpenApiResponse(
+                response=ProductSerializer(many=True),
+                description="Matching products, best match first.",
+                examples=[
+                    OpenApiExample(
+                        "Product example",
+                        value=[product_example],
+                        response_only=True,
+                    )
+                ],
+            ),
+            400: OpenApiResponse(
+                response=ProblemDetailSerializer,
+                description="Invalid parameters are provided.",
+                examples=[
+                    OpenApiExample(
+                        "Problem response",
+                        value=problem_detail_example,
+                        response_only=True,
+                    )
+                ],
+            ),
+        },
+    )
+    def get(self, request: Request, *args, **kwargs) -> Response:
+        params = ProductSearchSerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        product_ids: list[int] = get_search_backend().search(
+            params.validated_data["q"], params.validated_data["limit"]
+        )
+        # The index may lag a retire made by another process
+        products: dict[int, Product] = ProductSerializer.setup_eager_loading(
+            self.get_queryset(), self.sparse_fields()
+        ).in_bulk(product_ids)
+        serializer = self.get_serializer(
+            [products[pk] for pk in product_ids if pk in products], many=True
+        )
+        return Response(serializer.data)
+
+
 class ProductDetailView(
+    CatalogueCacheMixin,
+    ConditionalGetMixin,
+    VersionMixin,
     RetireMixin,
+    EagerLoadingMixin,
     mixins.UpdateModelMixin,
     mixins.RetrieveModelMixin,
     generics.GenericAPIView,
@@ -100,6 +388,12 @@ class ProductDetailView(
     @extend_schema(
         tags=["Inventory"],
         summary="Get a single product.",
+        parameters=[
+            fields_parameter,
+            exclude_parameter,
+            if_none_match_parameter,
+            if_modified_since_parameter,
+        ],
         responses={
             200: OpenApiResponse(
                 response=ProductSerializer,
@@ -134,6 +428,7 @@ class ProductDetailView(
                     )
                 ],
             ),
+            304: OpenApiResponse(description="Not Modified."),
         },
     )
     def get(self, request: Request, *args, **kwargs) -> Response:
@@ -143,6 +438,7 @@ class ProductDetailView(
     @extend_schema(
         tags=["Inventory"],
         summary="Update an existing product",
+        parameters=[if_match_parameter],
         examples=[
             OpenApiExample(
                 "Request body",
@@ -184,6 +480,7 @@ class ProductDetailView(
                     )
                 ],
             ),
+            412: precondition_failed_response,
         },
     )
     def put(self, request: Request, *args, **kwargs) -> Response:
@@ -193,6 +490,7 @@ class ProductDetailView(
     @extend_schema(
         tags=["Inventory"],
         summary="Retire an existing product",
+        parameters=[if_match_parameter],
         responses={
             204: OpenApiResponse(description="No Content."),
             400: OpenApiResponse(
@@ -228,8 +526,122 @@ class ProductDetailView(
                     )
                 ],
             ),
+            412: precondition_failed_response,
         },
     )
     def delete(self, request: Request, *args, **kwargs) -> Response:
         check_url_parameter(kwargs["pk"])
         return self.retire(request, *args, **kwargs)
+
+
+class ProductPricesView(generics.GenericAPIView):
+    queryset: QuerySet = ProductPrice.objects.all()
+    serializer_class = ProductPriceSerializer
+
+    @extend_schema(
+        tags=["Inventory"],
+        summary="Get the prices of several products at a point in time.",
+        description=(
+            "Products that did not exist at that time are left out. "
+            "Without `at` the current prices are returned."
+        ),
+        parameters=[ProductPricesSerializer],
+        responses={
+            200: OpenApiResponse(
+                response=ProductPriceSerializer(many=True),
+                description="The prices have been returned.",
+                examples=[
+                    OpenApiExample(
+                        "Product price example",
+                        value=[product_price_example],
+                        response_only=True,
+                    )
+                ],
+            ),
+            400: OpenApiResponse(
+                response=ProblemDetailSerializer,
+                description="Invalid parameters are provided.",
+                examples=[
+                    OpenApiExample(
+                        "Problem response",
+                        value=problem_detail_example,
+                        response_only=True,
+                    )
+                ],
+            ),
+        },
+    )
+    def get(self, request: Request, *args, **kwargs) -> Response:
+        params = ProductPricesSerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        prices: QuerySet[ProductPrice] = ProductPrice.as_of_many(
+            params.validated_data["ids"], params.validated_data["at"]
+        )
+        return Response(self.get_serializer(prices, many=True).data)
+
+
+class ProductPriceView(generics.GenericAPIView):
+    queryset: QuerySet = ProductPrice.objects.all()
+    serializer_class = ProductPriceSerializer
+
+    @extend_schema(
+        tags=["Inventory"],
+        summary="Get the price of a product at a point in time.",
+        description="Without `at` the current price is returned.",
+        parameters=[PriceAsOfSerializer],
+        responses={
+            200: OpenApiResponse(
+                response=ProductPriceSerializer,
+                description="The price has been returned.",
+                examples=[
+                    OpenApiExample(
+                        "Product price example",
+                        value=product_price_example,
+                        response_only=True,
+                    )
+                ],
+            ),
+            400: OpenApiResponse(
+                response=ProblemDetailSerializer,
+                description="Invalid parameters are provided.",
+                examples=[
+                    OpenApiExample(
+                        "Problem response",
+                        value=problem_detail_example,
+                        response_only=True,
+                    )
+                ],
+            ),
+            404: OpenApiResponse(
+                response=ProblemDetailSerializer,
+                description="The product does not exist or had no price at "
+                "that time.",
+                examples=[
+                    OpenApiExample(
+                        "Problem response",
+                        value=problem_detail_example,
+                        response_only=True,
+                    )
+                ],
+            ),
+        },
+    )
+    def get(self, request: Request, *args, **kwargs) -> Response:
+        check_url_parameter(kwargs["pk"])
+        params = PriceAsOfSerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        price: ProductPrice | None = ProductPrice.as_of(
+            kwargs["pk"], params.validated_data["at"]
+        )
+        if price is None:
+            if not Product.objects.filter(pk=kwargs["pk"]).exists():
+                raise ProblemDetails(
+                    status=status.HTTP_404_NOT_FOUND,
+                    detail="Not Found",
+                    title="Resource not found",
+                )
+            raise ProblemDetails(
+                status=status.HTTP_404_NOT_FOUND,
+                detail="This product had no price at the given time",
+            )
+        return Response(self.get_serializer(price).data)
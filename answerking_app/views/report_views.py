@@ -0,0 +1,52 @@
+from django.db.models import QuerySet
+from rest_framework import generics, mixins
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from answerking_app.models.models import SalesRollup
+from answerking_app.models.serializers import SalesRollupSerializer
+from answerking_app.utils.filters import SalesReportFilter
+from answerking_app.utils.mixins.SparseFieldsMixin import SparseFieldsMixin
+from answerking_app.utils.pagination import SalesReportPagination
+
+from drf_spectacular.utils import (
+    extend_schema,
+    OpenApiExample,
+    OpenApiResponse,
+)
+
+from answerking_app.utils.schema.schema_examples import (
+    sales_rollup_example,
+)
+from answerking_app.utils.schema.schema_parameters import (
+    exclude_parameter,
+    fields_parameter,
+)
+
+
+class SalesReportView(
+    SparseFieldsMixin, mixins.ListModelMixin, generics.GenericAPIView
+):
+    queryset: QuerySet = SalesRollup.objects.order_by("period_start", "id")
+    serializer_class: SalesRollupSerializer = SalesRollupSerializer
+    pagination_class = SalesReportPagination
+    filter_backends = [SalesReportFilter]
+
+    @extend_schema(
+        tags=["Reports"],
+        summary="Get sales per product and order status per hour or day.",
+        parameters=[fields_parameter, exclude_parameter],
+        responses={
+            200: OpenApiResponse(
+                response=SalesRollupSerializer,
+                description="The sales rollups have been returned.",
+                examples=[
+                    OpenApiExample(
+                        "Sales rollup example", value=[sales_rollup_example]
+                    )
+                ],
+            )
+        },
+    )
+    def get(self, request: Request, *args, **kwargs) -> Response:
+        return self.list(request, *args, **kwargs)
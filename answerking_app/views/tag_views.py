@@ -10,27 +10,65 @@ from rest_framework.response import Response
 
 from answerking_app.models.models import Tag
 from answerking_app.models.serializers import (
+    BulkRetireSerializer,
     ProblemDetailSerializer,
     TagSerializer,
 )
-from answerking_app.utils.mixins.RetireMixin import RetireMixin
+from answerking_app.utils.mixins.CatalogueCacheMixin import (
+    CatalogueCacheMixin,
+)
+from answerking_app.utils.mixins.ConditionalGetMixin import (
+    ConditionalGetMixin,
+)
+from answerking_app.utils.mixins.IdempotencyMixin import IdempotencyMixin
+from answerking_app.utils.mixins.RetireMixin import (
+    BulkRetireMixin,
+    RetireMixin,
+)
+from answerking_app.utils.mixins.SparseFieldsMixin import SparseFieldsMixin
+from answerking_app.utils.mixins.VersionMixin import VersionMixin
+from answerking_app.utils.pagination import KeysetPagination
 from answerking_app.utils.schema.schema_examples import (
     problem_detail_example,
     tag_body_example,
     tag_example,
 )
+from answerking_app.utils.schema.schema_parameters import (
+    exclude_parameter,
+    fields_parameter,
+    idempotency_key_parameter,
+    if_match_parameter,
+    if_modified_since_parameter,
+    if_none_match_parameter,
+)
+from answerking_app.utils.schema.schema_responses import (
+    precondition_failed_response,
+)
 from answerking_app.utils.url_parameter_check import check_url_parameter
 
 
 class TagListView(
-    mixins.ListModelMixin, mixins.CreateModelMixin, generics.GenericAPIView
+    CatalogueCacheMixin,
+    ConditionalGetMixin,
+    IdempotencyMixin,
+    SparseFieldsMixin,
+    mixins.ListModelMixin,
+    mixins.CreateModelMixin,
+    generics.GenericAPIView,
 ):
     queryset: QuerySet = Tag.objects.all()
     serializer_class = TagSerializer
+    pagination_class = KeysetPagination
 
     @extend_schema(
         tags=["tags"],
         summary="Get all tags.",
+        parameters=[
+            fields_parameter,
+            exclude_parameter,
+            if_none_match_parameter,
+            if_modified_since_parameter,
+        ],
         responses={
             200: OpenApiResponse(
                 response=TagSerializer,
@@ -40,7 +78,8 @@ class TagListView(
                         "Tag example", value=tag_example, response_only=True
                     )
                 ],
-            )
+            ),
+            304: OpenApiResponse(description="Not Modified."),
         },
     )
     def get(self, request: Request, *args, **kwargs) -> Response:
@@ -49,6 +88,7 @@ class TagListView(
     @extend_schema(
         tags=["tags"],
         summary="Create an new tag.",
+        parameters=[idempotency_key_parameter],
         examples=[
             OpenApiExample(
                 "Request body", value=tag_body_example, request_only=True
@@ -83,7 +123,109 @@ class TagListView(
         return self.create(request, *args, **kwargs)
 
 
+class TagRetireView(BulkRetireMixin, generics.GenericAPIView):
+    queryset: QuerySet = Tag.objects.all()
+    serializer_class = BulkRetireSerializer
+
+    @extend_schema(
+        tags=["Inventory"],
+        summary="Retire several tags at once.",
+        description=(
+            "Either every tag is retired or none is. Tags "
+            "that are already retired are left as they are."
+        ),
+        request=BulkRetireSerializer,
+        examples=[
+            OpenApiExample(
+                "Request body",
+                value={"ids": [1, 2, 3]},
+                request_only=True,
+            )
+        ],
+        responses={
+            204: OpenApiResponse(description="No Content."),
+            400: OpenApiResponse(
+                response=ProblemDetailSerializer,
+                description="Invalid ids are provided.",
+                examples=[
+                    OpenApiExample(
+                        "Problem response",
+                        value=problem_detail_example,
+                        response_only=True,
+                    )
+                ],
+            ),
+            404: OpenApiResponse(
+                response=ProblemDetailSerializer,
+                description="Some of the given ids do not exist.",
+                examples=[
+                    OpenApiExample(
+                        "Problem response",
+                        value=problem_detail_example,
+                        response_only=True,
+                    )
+                ],
+            ),
+        },
+    )
+    def post(self, request: Request, *args, **kwargs) -> Response:
+        return self.bulk_retire(request, *args, **kwargs)
+
+
+class TagUnretireView(BulkRetireMixin, generics.GenericAPIView):
+    queryset: QuerySet = Tag.objects.all()
+    serializer_class = BulkRetireSerializer
+
+    @extend_schema(
+        tags=["Inventory"],
+        summary="Unretire several tags at once.",
+        description=(
+            "Either every tag is unretired or none is. Tags "
+            "that are not retired are left as they are."
+        ),
+        request=BulkRetireSerializer,
+        examples=[
+            OpenApiExample(
+                "Request body",
+                value={"ids": [1, 2, 3]},
+                request_only=True,
+            )
+        ],
+        responses={
+            204: OpenApiResponse(description="No Content."),
+            400: OpenApiResponse(
+                response=ProblemDetailSerializer,
+                description="Invalid ids are provided.",
+                examples=[
+                    OpenApiExample(
+                        "Problem response",
+                        value=problem_detail_example,
+                        response_only=True,
+                    )
+                ],
+            ),
+            404: OpenApiResponse(
+                response=ProblemDetailSerializer,
+                description="Some of the given ids do not exist.",
+                examples=[
+                    OpenApiExample(
+                        "Problem response",
+                        value=problem_detail_example,
+                        response_only=True,
+                    )
+                ],
+            ),
+        },
+    )
+    def post(self, request: Request, *args, **kwargs) -> Response:
+        return self.bulk_unretire(request, *args, **kwargs)
+
+
 class TagDetailView(
+    CatalogueCacheMixin,
+    ConditionalGetMixin,
+    VersionMixin,
+    SparseFieldsMixin,
     RetireMixin,
     mixins.UpdateModelMixin,
     mixins.RetrieveModelMixin,
@@ -95,6 +237,12 @@ class TagDetailView(
     @extend_schema(
         tags=["tags"],
         summary="Get a single tag.",
+        parameters=[
+            fields_parameter,
+            exclude_parameter,
+            if_none_match_parameter,
+            if_modified_since_parameter,
+        ],
         responses={
             200: OpenApiResponse(
                 response=TagSerializer,
@@ -127,6 +275,7 @@ class TagDetailView(
                     )
                 ],
             ),
+            304: OpenApiResponse(description="Not Modified."),
         },
     )
     def get(self, request: Request, *args, **kwargs) -> Response:
@@ -136,6 +285,7 @@ class TagDetailView(
     @extend_schema(
         tags=["tags"],
         summary="Update an existing tag",
+        parameters=[if_match_parameter],
         examples=[
             OpenApiExample(
                 "Request body",
@@ -177,6 +327,7 @@ class TagDetailView(
                     )
                 ],
             ),
+            412: precondition_failed_response,
         },
     )
     def put(self, request: Request, *args, **kwargs) -> Response:
@@ -186,6 +337,7 @@ class TagDetailView(
     @extend_schema(
         tags=["tags"],
         summary="Retire an existing tag",
+        parameters=[if_match_parameter],
         responses={
             204: OpenApiResponse(description="No Content."),
             400: OpenApiResponse(
@@ -221,6 +373,7 @@ class TagDetailView(
                     )
                 ],
             ),
+            412: precondition_failed_response,
         },
     )
     def delete(self, request: Request, *args, **kwargs) -> Response: